@@ -5,11 +5,13 @@ from modules.manager.views.user import UserViewSet
 from modules.movies.views.actors import ActorViewSet
 from modules.movies.views.movie_category import MovieCategoryViewSet
 from modules.movies.views.movie import MovieViewSet
+from modules.movies.views.autocomplete import AutocompleteView
 from modules.cinema.views.cinema import CinemaViewSet
 from modules.cinema.views.screening_room import ScreeningRoomViewSet
 from modules.services.views.showtime import ShowtimeViewSet
 from modules.services.views.reservation import ReservationViewSet
 from modules.services.views.map import SeatMapView
+from modules.services.views.now_playing import NowPlayingView
 
 router = routers.DefaultRouter()
 
@@ -23,4 +25,8 @@ router.register(r'showtimes', ShowtimeViewSet, basename='showtimes')
 router.register( r'reservations', ReservationViewSet, basename='reservations')
 
 
-urlpatterns = router.urls + [ path('map/', SeatMapView.as_view(), name='map')]
+urlpatterns = router.urls + [
+    path('map/', SeatMapView.as_view(), name='map'),
+    path('now-playing/', NowPlayingView.as_view(), name='now-playing'),
+    path('autocomplete/', AutocompleteView.as_view(), name='autocomplete'),
+]
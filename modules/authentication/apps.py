@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class AuthenticationConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'modules.authentication'
+
+    def ready(self):
+        from modules.authentication import signals  # noqa: F401
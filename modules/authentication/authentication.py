@@ -1,12 +1,18 @@
 import jwt
 from rest_framework.authentication import BaseAuthentication
 from rest_framework.exceptions import AuthenticationFailed
-from django.conf import settings
-from modules.authentication.models import BlacklistedToken, AuthToken
+from modules.authentication.principals import auth_state
+from modules.authentication.signing import decode_token
 from modules.manager.models import User
 
 
 class JWTAuthentication(BaseAuthentication):
+    """
+    Valida el JWT sin consultar la base de datos en el caso habitual: las
+    revocaciones se comprueban contra el conjunto en memoria del proceso y el
+    usuario sale de la caché de principales (ver principals.py).
+    """
+
     def authenticate(self, request):
         auth_header = request.headers.get("Authorization")
 
@@ -15,17 +21,22 @@ class JWTAuthentication(BaseAuthentication):
 
         token = auth_header.split(" ")[1]
 
-        if BlacklistedToken.is_blacklisted(token):
-            raise AuthenticationFailed("Token inválido o revocado.")
-
         try:
-            payload = jwt.decode(
-                token, settings.SECRET_KEY, algorithms=["HS256"])
-            user = User.objects.get(id=payload["user_id"])
-            return (user, token)
+            payload = decode_token(token)
         except jwt.ExpiredSignatureError:
             raise AuthenticationFailed("Token expirado.")
         except jwt.InvalidTokenError:
             raise AuthenticationFailed("Token inválido.")
-        except User.DoesNotExist:
+
+        state = auth_state()
+        state.sync()
+        if state.is_revoked(payload.get("jti")):
+            raise AuthenticationFailed("Token inválido o revocado.")
+
+        try:
+            user = state.get_user(payload["user_id"])
+        except (KeyError, ValueError, User.DoesNotExist):
             raise AuthenticationFailed("Usuario no encontrado.")
+        if not user.is_active:
+            raise AuthenticationFailed("Usuario inactivo.")
+        return (user, token)
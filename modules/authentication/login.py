@@ -0,0 +1,242 @@
+import ipaddress
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password, verify_password
+from django.core.cache import cache
+
+from modules.manager.models import User
+
+
+class LoginBlocked(Exception):
+    def __init__(self, wait):
+        super().__init__("Demasiados intentos de inicio de sesión.")
+        self.wait = wait
+
+
+class HasherBusy(Exception):
+    pass
+
+
+class LoginThrottle:
+    """
+    Espera exponencial por cuenta y por IP, comprobada antes de calcular el
+    hash. Tras `threshold` fallos seguidos cada fallo bloquea la clave
+    base * 2^(fallos - threshold) segundos, hasta `max_wait`. Un login
+    correcto limpia el contador de la cuenta; el de la IP caduca solo.
+
+    El contador se incrementa con cache.add + cache.incr, atómicos en los
+    backends compartidos, para que los fallos simultáneos no se pisen; el
+    bloqueo va en su propia clave y caduca cuando termina la espera.
+    """
+    prefix = 'login-throttle'
+
+    def __init__(self, scope, threshold):
+        self.scope = scope
+        self.threshold = threshold
+        self.base = getattr(settings, 'AUTH_LOGIN_BACKOFF', 1)
+        self.max_wait = getattr(settings, 'AUTH_LOGIN_MAX_BACKOFF', 15 * 60)
+        self.window = getattr(settings, 'AUTH_LOGIN_FAILURE_WINDOW', 60 * 60)
+
+    def key(self, ident):
+        return f"{self.prefix}:{self.scope}:{ident}"
+
+    def blocked_key(self, ident):
+        return f"{self.key(ident)}:blocked-until"
+
+    def wait(self, ident):
+        blocked_until = cache.get(self.blocked_key(ident))
+        if not blocked_until:
+            return 0
+        return max(blocked_until - time.time(), 0)
+
+    def failure(self, ident):
+        key = self.key(ident)
+        # El contador dura `window` desde el primer fallo
+        cache.add(key, 0, self.window)
+        try:
+            failures = cache.incr(key)
+        except ValueError:
+            # Caducó entre add e incr
+            cache.set(key, 1, self.window)
+            failures = 1
+
+        excess = failures - self.threshold
+        if excess >= 0:
+            wait = min(self.base * 2 ** excess, self.max_wait)
+            cache.set(self.blocked_key(ident), time.time() + wait, wait + 1)
+
+    def reset(self, ident):
+        cache.delete_many([self.key(ident), self.blocked_key(ident)])
+
+
+def account_throttle():
+    return LoginThrottle('account', getattr(settings, 'AUTH_LOGIN_ACCOUNT_THRESHOLD', 5))
+
+
+def ip_throttle():
+    return LoginThrottle('ip', getattr(settings, 'AUTH_LOGIN_IP_THRESHOLD', 20))
+
+
+class HasherPool:
+    """
+    Pool acotado para los hashes de contraseña. Limita cuántos se calculan a
+    la vez y, si la cola pasa de `queue_size`, rechaza en lugar de acumular
+    peticiones esperando (HasherBusy). Lleva métricas de profundidad de cola.
+    """
+
+    def __init__(self, workers, queue_size):
+        self.workers = workers
+        self.queue_size = queue_size
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='hasher')
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._stats = {
+            'submitted': 0, 'rejected': 0, 'completed': 0,
+            'max_queue_depth': 0, 'wait_seconds': 0.0, 'hash_seconds': 0.0,
+        }
+
+    def run(self, func, *args):
+        with self._lock:
+            if self._pending >= self.workers + self.queue_size:
+                self._stats['rejected'] += 1
+                raise HasherBusy("Servicio de autenticación saturado, inténtalo de nuevo.")
+            self._pending += 1
+            self._stats['submitted'] += 1
+            self._stats['max_queue_depth'] = max(
+                self._stats['max_queue_depth'], max(self._pending - self.workers, 0)
+            )
+
+        queued = time.perf_counter()
+
+        def task():
+            started = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                with self._lock:
+                    self._stats['wait_seconds'] += started - queued
+                    self._stats['hash_seconds'] += time.perf_counter() - started
+
+        try:
+            return self._executor.submit(task).result()
+        finally:
+            with self._lock:
+                self._pending -= 1
+                self._stats['completed'] += 1
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            pending = self._pending
+        completed = stats['completed'] or 1
+        return {
+            'workers': self.workers,
+            'queue_size': self.queue_size,
+            'in_flight': pending,
+            'queue_depth': max(pending - self.workers, 0),
+            'submitted': stats['submitted'],
+            'completed': stats['completed'],
+            'rejected': stats['rejected'],
+            'max_queue_depth': stats['max_queue_depth'],
+            'avg_wait_ms': round(stats['wait_seconds'] / completed * 1000, 2),
+            'avg_hash_ms': round(stats['hash_seconds'] / completed * 1000, 2),
+        }
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def hasher_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = HasherPool(
+                    workers=getattr(settings, 'AUTH_HASHER_WORKERS', None) or os.cpu_count() or 1,
+                    queue_size=getattr(settings, 'AUTH_HASHER_QUEUE_SIZE', 64),
+                )
+    return _pool
+
+
+def _verify(password, encoded):
+    """(correcta, nuevo hash o None). Rehace el hash si cambió el hasher o su coste."""
+    is_correct, must_update = verify_password(password, encoded)
+    if is_correct and must_update:
+        return True, make_password(password)
+    return is_correct, None
+
+
+def _trusted_proxies():
+    return [
+        ipaddress.ip_network(proxy, strict=False)
+        for proxy in getattr(settings, 'AUTH_TRUSTED_PROXIES', [])
+    ]
+
+
+def _parse_ip(value):
+    try:
+        return ipaddress.ip_address(value.strip())
+    except ValueError:
+        return None
+
+
+def client_ip(request):
+    """
+    IP del cliente. X-Forwarded-For sólo se tiene en cuenta si la conexión
+    llega de un proxy de AUTH_TRUSTED_PROXIES; entonces se recorre de derecha
+    a izquierda mientras el salto anterior sea de confianza, porque las
+    entradas de la izquierda las pone el propio cliente y se pueden falsificar.
+    """
+    if request is None:
+        return ''
+    client = request.META.get('REMOTE_ADDR', '')
+    proxies = _trusted_proxies()
+    if not proxies:
+        return client
+
+    address = _parse_ip(client)
+    for hop in reversed(request.META.get('HTTP_X_FORWARDED_FOR', '').split(',')):
+        if address is None or not any(address in proxy for proxy in proxies):
+            break
+        address = _parse_ip(hop)
+        if address is not None:
+            client = str(address)
+    return client
+
+
+def authenticate_credentials(request, email, password):
+    """
+    Login completo: comprueba los bloqueos antes de tocar el hash, verifica la
+    contraseña en el pool y guarda el hash nuevo si los parámetros cambiaron.
+    Devuelve el usuario o None; lanza LoginBlocked o HasherBusy.
+    """
+    account = User.objects.normalize_email(email)
+    ip = client_ip(request)
+    accounts, ips = account_throttle(), ip_throttle()
+
+    wait = max(accounts.wait(account), ips.wait(ip) if ip else 0)
+    if wait:
+        raise LoginBlocked(wait)
+
+    user = User.objects.filter_by_email(email).first()
+    # Sin usuario se calcula igualmente un hash (verify_password lo hace con
+    # una contraseña inutilizable) para no delatar qué cuentas existen
+    encoded = user.password if user else make_password(None)
+    is_correct, new_hash = hasher_pool().run(_verify, password, encoded)
+
+    if not is_correct:
+        accounts.failure(account)
+        if ip:
+            ips.failure(ip)
+        return None
+
+    accounts.reset(account)
+    if new_hash:
+        user.password = new_hash
+        user.save(update_fields=['password'])
+    return user
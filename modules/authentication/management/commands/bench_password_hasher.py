@@ -0,0 +1,118 @@
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher
+from django.core.management.base import BaseCommand, CommandError
+
+
+# Atributo de coste de cada hasher de Django y cómo se escala
+COST_ATTRIBUTES = {
+    'pbkdf2_sha256': ('iterations', 'linear'),
+    'pbkdf2_sha1': ('iterations', 'linear'),
+    'argon2': ('time_cost', 'linear'),
+    'bcrypt_sha256': ('rounds', 'log2'),
+    'bcrypt': ('rounds', 'log2'),
+    'scrypt': ('work_factor', 'log2'),
+}
+
+
+def measure(hasher, password, samples):
+    salt = hasher.salt()
+    times = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        hasher.encode(password, salt)
+        times.append(time.perf_counter() - started)
+    return statistics.median(times)
+
+
+def throughput(hasher, password, workers, total):
+    salt = hasher.salt()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(lambda _: hasher.encode(password, salt), range(total)))
+    return total / (time.perf_counter() - started)
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide el coste del hasher de contraseñas en esta máquina y propone el "
+        "mayor factor de coste que cabe en el tiempo objetivo por login."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--algorithm', default='default',
+                            help="Algoritmo a medir (por defecto, el primero de PASSWORD_HASHERS).")
+        parser.add_argument('--target-ms', type=float, default=250,
+                            help="Tiempo máximo deseado por hash.")
+        parser.add_argument('--samples', type=int, default=3)
+        parser.add_argument('--workers', type=int, default=None,
+                            help="Hilos para medir el rendimiento en paralelo "
+                                 "(por defecto AUTH_HASHER_WORKERS o una CPU).")
+
+    def try_cost(self, hasher, attribute, cost, samples):
+        setattr(hasher, attribute, cost)
+        elapsed = measure(hasher, 'benchmark-password', samples)
+        self.stdout.write(f"  {attribute}={cost}: {elapsed * 1000:.1f} ms")
+        return elapsed
+
+    def search(self, hasher, attribute, scale, cost, target, samples):
+        """(coste, segundos) del mayor coste que no supera el objetivo."""
+        elapsed = self.try_cost(hasher, attribute, cost, samples)
+        # Por encima del objetivo: se baja hasta entrar
+        while elapsed > target and cost > 1:
+            if scale == 'log2':
+                cost -= 1
+            else:
+                cost = max(int(cost * target / elapsed * 0.9), 1)
+            elapsed = self.try_cost(hasher, attribute, cost, samples)
+        best = (cost, elapsed)
+
+        # Por debajo: se sube mientras quepa
+        for _ in range(10):
+            if scale == 'log2':
+                cost += 1
+            else:
+                # Crece en proporción al margen que queda hasta el objetivo
+                cost = int(cost * min(max(target / elapsed * 0.95, 1.1), 4))
+            elapsed = self.try_cost(hasher, attribute, cost, samples)
+            if elapsed > target:
+                break
+            best = (cost, elapsed)
+        return best
+
+    def handle(self, *args, **options):
+        try:
+            hasher = get_hasher(options['algorithm'])
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        if hasher.algorithm not in COST_ATTRIBUTES:
+            raise CommandError(f"No se sabe ajustar el coste de '{hasher.algorithm}'.")
+
+        attribute, scale = COST_ATTRIBUTES[hasher.algorithm]
+        current = getattr(hasher, attribute)
+        target = options['target_ms'] / 1000
+        password = 'benchmark-password'
+
+        self.stdout.write(f"{hasher.algorithm}: {attribute} actual = {current}")
+        try:
+            best = self.search(hasher, attribute, scale, current, target, options['samples'])
+        finally:
+            setattr(hasher, attribute, current)
+
+        workers = options['workers'] or getattr(settings, 'AUTH_HASHER_WORKERS', None) or 1
+        setattr(hasher, attribute, best[0])
+        try:
+            rate = throughput(hasher, password, workers, total=workers * 4)
+        finally:
+            setattr(hasher, attribute, current)
+        self.stdout.write(self.style.SUCCESS(
+            f"Propuesta: {attribute}={best[0]} ({best[1] * 1000:.1f} ms por hash, "
+            f"{rate:.1f} logins/s con {workers} hilos)."
+        ))
+        self.stdout.write(
+            "Para aplicarlo, define un hasher propio con ese atributo y ponlo "
+            "el primero en PASSWORD_HASHERS; los usuarios se rehashean al entrar."
+        )
@@ -0,0 +1,110 @@
+import time
+from contextlib import contextmanager
+
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+
+from modules.authentication.models import AuthToken, BlacklistedToken
+from modules.authentication.principals import revoke_access_token
+from modules.authentication.signing import unverified_claims
+from modules.authentication.utils import (
+    ACCESS_TOKEN_LIFETIME,
+    REFRESH_TOKEN_LIFETIME,
+    encode_access_token,
+    generate_jti,
+    generate_refresh_token,
+    token_digest,
+)
+from modules.manager.models import User
+
+
+WRITES = ('INSERT', 'UPDATE', 'DELETE')
+
+
+@contextmanager
+def count_statements():
+    counts = {'queries': 0, 'writes': 0}
+
+    def wrapper(execute, sql, params, many, context):
+        counts['queries'] += 1
+        if sql.lstrip().upper().startswith(WRITES):
+            counts['writes'] += 1
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(wrapper):
+        yield counts
+
+
+def legacy_refresh(refresh_token):
+    """Flujo anterior: comprobar lista negra, buscar, revocar (alta + baja) y crear."""
+    digest = token_digest(refresh_token)
+    if BlacklistedToken.is_blacklisted(digest):
+        raise ValueError("revocado")
+    session = AuthToken.objects.filter(refresh_digest=digest).first()
+    BlacklistedToken.objects.create(token=digest, expires_at=session.expires_at)
+    revoke_access_token(session.access_jti, session.issued_at + ACCESS_TOKEN_LIFETIME)
+    session.delete()
+
+    jti = generate_jti()
+    family = generate_jti()
+    new_refresh_token = generate_refresh_token(family)
+    AuthToken.objects.create(
+        user_id=session.user_id,
+        family=family,
+        access_jti=jti,
+        refresh_digest=token_digest(new_refresh_token),
+        expires_at=timezone.now() + REFRESH_TOKEN_LIFETIME,
+    )
+    return encode_access_token(session.user_id, jti=jti), new_refresh_token
+
+
+def rotate_refresh(refresh_token):
+    return AuthToken.rotate(refresh_token)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara el rendimiento del refresco de tokens: flujo anterior "
+        "(revocar y crear) frente a la rotación con un único UPDATE."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=500)
+
+    def run(self, label, refresh, user, iterations):
+        access_token, refresh_token = AuthToken.issue(user)
+        with count_statements() as counts:
+            started = time.perf_counter()
+            for _ in range(iterations):
+                self.issued.append((access_token, refresh_token))
+                access_token, refresh_token = refresh(refresh_token)
+            elapsed = time.perf_counter() - started
+        self.issued.append((access_token, refresh_token))
+        self.stdout.write(
+            f"{label}: {iterations / elapsed:.0f} refrescos/s, "
+            f"{counts['queries'] / iterations:.1f} consultas y "
+            f"{counts['writes'] / iterations:.1f} escrituras por refresco"
+        )
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        user = User.objects.create_user(
+            email=f"bench-{generate_jti()}@example.com", password=generate_jti()
+        )
+        self.issued = []
+        try:
+            self.run("anterior", legacy_refresh, user, iterations)
+            self.run("rotación", rotate_refresh, user, iterations)
+        finally:
+            # Sólo se borran las filas de lista negra generadas por la prueba
+            keys = set()
+            for access_token, refresh_token in self.issued:
+                keys.add(token_digest(refresh_token))
+                keys.add(unverified_claims(access_token)["jti"])
+            keys = list(keys)
+            for start in range(0, len(keys), 500):
+                BlacklistedToken.objects.filter(token__in=keys[start:start + 500]).delete()
+            AuthToken.objects.filter(user=user).delete()
+            user.delete()
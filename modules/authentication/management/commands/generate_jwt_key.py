@@ -0,0 +1,119 @@
+import os
+import tempfile
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from jwt.algorithms import has_crypto
+
+from modules.authentication.signing import (
+    ACTIVE_FILE,
+    PRIVATE_SUFFIX,
+    PUBLIC_SUFFIX,
+    active_kid,
+    signing_settings,
+)
+
+
+def write_atomic(path, data):
+    """
+    Escribe a un temporal del mismo directorio (0600, sin sufijo .pem) y lo
+    renombra: los procesos recargan al cambiar el mtime del directorio y no
+    deben ver nunca un fichero a medias.
+    """
+    directory, name = os.path.split(path)
+    descriptor, temp_path = tempfile.mkstemp(dir=directory, prefix=f'.{name}.', suffix='.tmp')
+    try:
+        with os.fdopen(descriptor, 'wb') as handle:
+            handle.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+class Command(BaseCommand):
+    help = (
+        "Genera una clave de firma JWT en KEYS_DIR. Para rotar sin reiniciar: "
+        "generar la nueva (se publica en el JWKS pero aún no firma), activarla "
+        "con --activate cuando los clientes hayan refrescado el JWKS y, pasada "
+        "la vida de los tokens, retirar la anterior con --retire."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--kid', default=None,
+                            help="Identificador de la clave (por defecto, la fecha).")
+        parser.add_argument('--algorithm', choices=['RS256', 'EdDSA'], default=None)
+        parser.add_argument('--activate', metavar='KID', default=None,
+                            help="Firma con la clave KID a partir de la próxima recarga.")
+        parser.add_argument('--retire', metavar='KID', default=None,
+                            help="Borra la clave privada KID y deja sólo su pública.")
+
+    def handle(self, *args, **options):
+        if not has_crypto:
+            raise CommandError("Hace falta el paquete 'cryptography' (pip install cryptography).")
+        from cryptography.hazmat.primitives import serialization
+        from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+
+        config = signing_settings()
+        keys_dir = config['KEYS_DIR']
+        if not keys_dir:
+            raise CommandError("JWT_SIGNING KEYS_DIR no está configurado.")
+        os.makedirs(keys_dir, exist_ok=True)
+
+        if options['activate']:
+            return self.activate(keys_dir, options['activate'])
+        if options['retire']:
+            return self.retire(keys_dir, options['retire'], serialization)
+
+        algorithm = options['algorithm'] or config['ALGORITHM']
+        if algorithm == 'RS256':
+            key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        elif algorithm == 'EdDSA':
+            key = ed25519.Ed25519PrivateKey.generate()
+        else:
+            raise CommandError("Indica --algorithm RS256 o EdDSA.")
+
+        kid = options['kid'] or timezone.now().strftime('%Y%m%d%H%M%S')
+        path = os.path.join(keys_dir, f"{kid}{PRIVATE_SUFFIX}")
+        if os.path.exists(path):
+            raise CommandError(f"Ya existe {path}.")
+        pem = key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+        write_atomic(path, pem)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Clave {algorithm} '{kid}' creada en {path}. Se publica en el JWKS; "
+            f"actívala con --activate {kid}."
+        ))
+
+    def activate(self, keys_dir, kid):
+        if not os.path.exists(os.path.join(keys_dir, f"{kid}{PRIVATE_SUFFIX}")):
+            raise CommandError(f"No existe la clave privada {kid}{PRIVATE_SUFFIX}.")
+
+        write_atomic(os.path.join(keys_dir, ACTIVE_FILE), f"{kid}\n".encode())
+        self.stdout.write(self.style.SUCCESS(
+            f"Clave '{kid}' activa: los procesos firmarán con ella en la próxima recarga."
+        ))
+
+    def retire(self, keys_dir, kid, serialization):
+        private_path = os.path.join(keys_dir, f"{kid}{PRIVATE_SUFFIX}")
+        if not os.path.exists(private_path):
+            raise CommandError(f"No existe {private_path}.")
+        if kid == active_kid(keys_dir, signing_settings()['ACTIVE_KID']):
+            raise CommandError("No se puede retirar la clave activa.")
+
+        with open(private_path, 'rb') as handle:
+            key = serialization.load_pem_private_key(handle.read(), password=None)
+        public_pem = key.public_key().public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        write_atomic(os.path.join(keys_dir, f"{kid}{PUBLIC_SUFFIX}"), public_pem)
+        os.remove(private_path)
+        self.stdout.write(self.style.SUCCESS(
+            f"Clave '{kid}' retirada: sólo queda la pública, para verificar. "
+            f"Borra {kid}{PUBLIC_SUFFIX} cuando ya no haya tokens firmados con ella."
+        ))
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+
+from modules.authentication.retention import purge_auth_tables
+
+
+def _size(value):
+    rows, size = value
+    if size is None:
+        return f"{rows} filas"
+    return f"{rows} filas, {size / 1024:.1f} KiB"
+
+
+class Command(BaseCommand):
+    help = (
+        "Borra por lotes los tokens, sesiones y enlaces de correo caducados, y los "
+        "correos ya enviados o fallidos del outbox (EMAIL_OUTBOX_RETENTION). "
+        "Pensado para ejecutarse periódicamente (cron)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--max-batches', type=int, default=None,
+                            help="Máximo de lotes por tabla en cada ejecución.")
+        parser.add_argument('--pause', type=float, default=0,
+                            help="Segundos de espera entre lotes.")
+
+    def handle(self, *args, **options):
+        report = purge_auth_tables(
+            batch_size=options['batch_size'],
+            max_batches=options['max_batches'],
+            pause=options['pause'],
+        )
+        for model, result in report.items():
+            self.stdout.write(
+                f"{model._meta.label}: {result['deleted']} filas borradas en "
+                f"{result['batches']} lotes ({_size(result['before'])} -> "
+                f"{_size(result['after'])})"
+            )
@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from modules.authentication.outbox import process_outbox
+
+
+class Command(BaseCommand):
+    help = (
+        "Envía los correos pendientes de EmailOutbox por lotes, con reintentos. "
+        "Con --loop se queda en marcha como worker."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=50)
+        parser.add_argument('--loop', action='store_true',
+                            help="No termina: vuelve a mirar cada --interval segundos.")
+        parser.add_argument('--interval', type=float, default=5)
+
+    def handle(self, *args, **options):
+        while True:
+            result = process_outbox(batch_size=options['batch_size'])
+            if result['batches']:
+                self.stdout.write(
+                    f"{result['sent']} enviados, {result['failed']} fallidos "
+                    f"en {result['batches']} lotes."
+                )
+            if not options['loop']:
+                break
+            if not result['batches']:
+                time.sleep(options['interval'])
@@ -4,48 +4,193 @@ from django.utils import timezone
 import datetime
 import uuid
 
+from modules.authentication.utils import (
+    ACCESS_TOKEN_LIFETIME,
+    REFRESH_TOKEN_LIFETIME,
+    encode_access_token,
+    generate_jti,
+    generate_refresh_token,
+    refresh_token_family,
+    token_digest,
+)
+
+
+EMAIL_VERIFICATION_LIFETIME = datetime.timedelta(days=1)
+PASSWORD_RESET_LIFETIME = datetime.timedelta(hours=24)
+
+
+class RefreshTokenError(Exception):
+    pass
+
 
 class AuthToken(models.Model):
+    """
+    Sesión emitida en el login: una familia de refresh tokens. Cada refresco
+    rota el token con un único UPDATE condicionado al digest vigente; si se
+    presenta un token de la familia ya rotado, se da por robado y se revoca
+    la sesión entera.
+
+    No se guardan los tokens en claro: el de acceso se identifica por su jti
+    y el de refresco por su SHA-256.
+
+    Cada dispositivo tiene su propia sesión; un usuario conserva como mucho
+    AUTH_MAX_SESSIONS y al superarlas se reutiliza la menos usada.
+    """
     user = models.ForeignKey(settings.AUTH_USER_MODEL,
                              on_delete=models.CASCADE)
-    access_token = models.TextField(unique=True)
-    refresh_token = models.TextField(unique=True)
-    expires_at = models.DateTimeField()
+    family = models.CharField(max_length=32, unique=True)
+    generation = models.PositiveIntegerField(default=0)
+    access_jti = models.CharField(max_length=32, unique=True)
+    refresh_digest = models.CharField(max_length=64, unique=True)
+    device = models.CharField(max_length=255, blank=True, default='')
+    issued_at = models.DateTimeField(default=timezone.now)
+    last_used_at = models.DateTimeField(default=timezone.now)
+    expires_at = models.DateTimeField(db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'expires_at'], name='auth_token_user_exp_idx'),
+        ]
+
     def is_valid(self):
         return timezone.now() < self.expires_at
 
+    @staticmethod
+    def _credentials(user_id, family=None):
+        """Valores de una nueva generación y los tokens que se entregan."""
+        family = family or generate_jti()
+        jti = generate_jti()
+        refresh_token = generate_refresh_token(family)
+        now = timezone.now()
+        values = {
+            'family': family,
+            'access_jti': jti,
+            'refresh_digest': token_digest(refresh_token),
+            'issued_at': now,
+            'last_used_at': now,
+            'expires_at': now + REFRESH_TOKEN_LIFETIME,
+        }
+        return values, encode_access_token(user_id, jti=jti), refresh_token
+
     @classmethod
-    def get_active_token(cls, user):
-        return cls.objects.filter(user=user, expires_at__gt=timezone.now()).first()
+    def _reusable_session(cls, sessions, device):
+        """
+        Fila que ocupará la nueva sesión: la del mismo dispositivo, una
+        caducada o, si se ha llegado al máximo, la usada hace más tiempo.
+        """
+        for session in sessions:
+            if session.device == device:
+                return session
+        for session in sessions:
+            if not session.is_valid():
+                return session
+        if len(sessions) >= getattr(settings, 'AUTH_MAX_SESSIONS', 5):
+            return min(sessions, key=lambda session: session.last_used_at)
+        return None
 
-    def revoke(self):
-        BlacklistedToken.objects.create(
-            token=self.refresh_token, expires_at=self.expires_at
+    @classmethod
+    def issue(cls, user, device=''):
+        """
+        Abre una sesión para el dispositivo y devuelve (access_token,
+        refresh_token). Las sesiones de otros dispositivos no se tocan. Si se
+        reutiliza una fila se hace con un UPDATE; al cambiar la familia, los
+        refresh tokens anteriores de esa fila dejan de valer.
+        """
+        device = (device or '')[:255]
+        values, access_token, refresh_token = cls._credentials(user.id)
+        sessions = list(cls.objects.filter(user=user).only(
+            'id', 'device', 'access_jti', 'issued_at', 'last_used_at', 'expires_at'
+        ))
+        previous = cls._reusable_session(sessions, device)
+
+        if previous is None:
+            cls.objects.create(user=user, device=device, **values)
+        else:
+            cls.objects.filter(pk=previous.pk).update(generation=0, device=device, **values)
+            # Sólo hace falta revocar el acceso anterior si aún no ha caducado
+            previous.revoke_access()
+        return access_token, refresh_token
+
+    @classmethod
+    def rotate(cls, refresh_token):
+        """
+        Canjea un refresh token por un par nuevo con una sola escritura.
+        Lanza RefreshTokenError si no es válido o si ya se había usado.
+        """
+        family = refresh_token_family(refresh_token)
+        session = family and cls.objects.filter(family=family).only(
+            'id', 'user_id', 'family', 'generation', 'access_jti',
+            'refresh_digest', 'issued_at', 'expires_at',
+        ).first()
+        if not session:
+            raise RefreshTokenError("Refresh token inválido o expirado")
+
+        digest = token_digest(refresh_token)
+        if session.refresh_digest != digest:
+            session.revoke()
+            raise RefreshTokenError("Refresh token reutilizado: sesión revocada")
+        if not session.is_valid():
+            raise RefreshTokenError("Refresh token inválido o expirado")
+
+        values, access_token, new_refresh_token = cls._credentials(
+            session.user_id, family=session.family)
+        del values['family']
+
+        # Condicionado al digest leído: de dos refrescos simultáneos con el
+        # mismo token sólo uno actualiza la fila; el otro es una reutilización
+        updated = cls.objects.filter(pk=session.pk, refresh_digest=digest).update(
+            generation=models.F('generation') + 1, **values
         )
-        self.delete()
+        if not updated:
+            session.revoke()
+            raise RefreshTokenError("Refresh token reutilizado: sesión revocada")
+        return access_token, new_refresh_token
+
+    def revoke_access(self):
+        from modules.authentication.principals import revoke_access_token
+
+        # El token de acceso sigue siendo válido hasta su exp: se revoca su jti
+        access_expires_at = self.issued_at + ACCESS_TOKEN_LIFETIME
+        if access_expires_at > timezone.now():
+            revoke_access_token(self.access_jti, access_expires_at)
+
+    def revoke(self):
+        # Sin fila no hay familia: sus refresh tokens dejan de valer
+        self.revoke_access()
+        type(self).objects.filter(pk=self.pk).delete()
 
 
 class BlacklistedToken(models.Model):
-    token = models.TextField(unique=True)
-    expires_at = models.DateTimeField()
+    # jti de un token de acceso revocado antes de caducar
+    token = models.CharField(max_length=64, unique=True)
+    expires_at = models.DateTimeField(db_index=True)
+    # Marca de agua de la carga incremental de revocaciones (principals.py)
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
 
     @classmethod
     def is_blacklisted(cls, token):
         return cls.objects.filter(token=token, expires_at__gt=timezone.now()).exists()
 
 
+def email_verification_expiry():
+    return timezone.now() + EMAIL_VERIFICATION_LIFETIME
+
+
+def password_reset_expiry():
+    return timezone.now() + PASSWORD_RESET_LIFETIME
+
+
 class EmailVerification(models.Model):
     user = models.OneToOneField(
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     token = models.CharField(max_length=255, default=uuid.uuid4)
     created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(default=email_verification_expiry, db_index=True)
     is_verified = models.BooleanField(default=False)
 
     def is_valid(self):
-
-        return (timezone.now() - self.created_at).days < 1
+        return timezone.now() < self.expires_at
 
 
 class PasswordResetToken(models.Model):
@@ -53,7 +198,39 @@ class PasswordResetToken(models.Model):
                              on_delete=models.CASCADE)
     token = models.CharField(max_length=255, default=uuid.uuid4)
     created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(default=password_reset_expiry, db_index=True)
 
     def is_valid(self):
+        return timezone.now() < self.expires_at
+
+
+class EmailOutbox(models.Model):
+    """
+    Correo pendiente de envío. Se guarda en la misma transacción que el
+    token que lo origina y lo envía el worker send_outbox_emails, fuera de la
+    petición, reintentando con espera exponencial.
+    """
+    PENDING = 'pending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pendiente'),
+        (SENT, 'Enviado'),
+        (FAILED, 'Fallido'),
+    ]
+
+    to = models.EmailField()
+    subject = models.CharField(max_length=255)
+    template = models.CharField(max_length=255)
+    context = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
 
-        return (timezone.now() - self.created_at).hours < 24
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='email_outbox_due_idx'),
+        ]
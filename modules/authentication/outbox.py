@@ -0,0 +1,109 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.html import strip_tags
+
+from modules.authentication.models import EmailOutbox
+
+
+def enqueue_email(to, subject, template, context):
+    """Guarda el correo para el worker; no renderiza ni contacta con el servidor SMTP."""
+    return EmailOutbox.objects.create(
+        to=to, subject=subject, template=template, context=context
+    )
+
+
+def backoff(attempts):
+    base = getattr(settings, 'EMAIL_OUTBOX_RETRY_DELAY', 30)
+    limit = getattr(settings, 'EMAIL_OUTBOX_MAX_RETRY_DELAY', 60 * 60)
+    return timedelta(seconds=min(base * 2 ** (attempts - 1), limit))
+
+
+def claim_batch(batch_size):
+    """
+    Reserva un lote de correos vencidos moviendo su próximo intento al final
+    del plazo de envío. Si el worker muere a mitad, vuelven a estar
+    disponibles al vencer ese plazo (entrega al menos una vez).
+    """
+    now = timezone.now()
+    lease = timedelta(seconds=getattr(settings, 'EMAIL_OUTBOX_LEASE', 300))
+    with transaction.atomic():
+        batch = list(
+            EmailOutbox.objects.select_for_update(skip_locked=True).filter(
+                status=EmailOutbox.PENDING, next_attempt_at__lte=now
+            ).order_by('next_attempt_at', 'id')[:batch_size]
+        )
+        EmailOutbox.objects.filter(pk__in=[email.pk for email in batch]).update(
+            next_attempt_at=now + lease
+        )
+    return batch
+
+
+def build_message(email, connection):
+    html_message = render_to_string(email.template, email.context)
+    message = EmailMultiAlternatives(
+        subject=email.subject,
+        body=strip_tags(html_message),
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[email.to],
+        connection=connection,
+    )
+    message.attach_alternative(html_message, "text/html")
+    return message
+
+
+def send_batch(batch):
+    """Envía el lote por una sola conexión y registra el resultado de cada correo."""
+    max_attempts = getattr(settings, 'EMAIL_OUTBOX_MAX_ATTEMPTS', 8)
+    sent = failed = 0
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as exc:
+        # Sin servidor no se intenta ninguno: cada correo se reprograma por separado
+        error = exc
+    else:
+        error = None
+
+    for email in batch:
+        email.attempts += 1
+        try:
+            if error:
+                raise error
+            build_message(email, connection).send()
+        except Exception as exc:
+            email.last_error = f"{type(exc).__name__}: {exc}"
+            if email.attempts >= max_attempts:
+                email.status = EmailOutbox.FAILED
+            email.next_attempt_at = timezone.now() + backoff(email.attempts)
+            failed += 1
+        else:
+            email.status = EmailOutbox.SENT
+            email.sent_at = timezone.now()
+            email.last_error = ''
+            sent += 1
+        email.save(update_fields=[
+            'attempts', 'status', 'sent_at', 'last_error', 'next_attempt_at'
+        ])
+
+    if not error:
+        connection.close()
+    return sent, failed
+
+
+def process_outbox(batch_size=50, max_batches=None):
+    batches = sent = failed = 0
+    while max_batches is None or batches < max_batches:
+        batch = claim_batch(batch_size)
+        if not batch:
+            break
+        batch_sent, batch_failed = send_batch(batch)
+        sent += batch_sent
+        failed += batch_failed
+        batches += 1
+    return {'batches': batches, 'sent': sent, 'failed': failed}
+
@@ -0,0 +1,234 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from modules.authentication.utils import ACCESS_TOKEN_LIFETIME
+from modules.common.cache import bump_version, get_version
+
+
+PRINCIPALS_NAMESPACE = 'auth:principals'
+REVOCATIONS_NAMESPACE = 'auth:revocations'
+
+
+# Campos que, si cambian, obligan a descartar el usuario cacheado
+PRINCIPAL_FIELDS = ('is_active', 'is_staff', 'is_superuser', 'password', 'email')
+CHUNK_SIZE = 500
+
+
+class PrincipalCache:
+    """
+    LRU acotado de usuarios autenticados, con caducidad por entrada. Se
+    guardan los valores de las columnas y cada get() construye una instancia
+    nueva con from_db: las peticiones no comparten estado (_state incluido).
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            model, db, names, values, expires = entry
+            if expires < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+        return model.from_db(db, names, values)
+
+    def set(self, user_id, user):
+        fields = user._meta.concrete_fields
+        entry = (
+            type(user),
+            user._state.db,
+            [field.attname for field in fields],
+            [getattr(user, field.attname) for field in fields],
+            time.monotonic() + self.ttl,
+        )
+        with self._lock:
+            self._entries[user_id] = entry
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def snapshot(self):
+        """{user_id: {campo: valor}} de PRINCIPAL_FIELDS para revalidar."""
+        with self._lock:
+            entries = list(self._entries.items())
+        return {
+            user_id: {
+                name: value for name, value in zip(names, values) if name in PRINCIPAL_FIELDS
+            }
+            for user_id, (_model, _db, names, values, _expires) in entries
+        }
+
+    def discard(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class RevocationSet:
+    """
+    Identificadores (jti) de tokens de acceso revocados que aún no han
+    caducado. Se carga de BlacklistedToken de forma incremental por fecha de
+    creación: cada carga vuelve a leer AUTH_REVOCATION_OVERLAP segundos antes
+    de la última fila vista, para no perder filas de transacciones que se
+    confirmaron tarde o de relojes algo desfasados.
+    """
+
+    def __init__(self):
+        self._revoked = {}
+        self._watermark = None
+        self._lock = threading.Lock()
+        self.overlap = timedelta(seconds=getattr(settings, 'AUTH_REVOCATION_OVERLAP', 60))
+
+    def add(self, jti, expires_at):
+        with self._lock:
+            self._revoked[jti] = expires_at
+
+    def __contains__(self, jti):
+        expires_at = self._revoked.get(jti)
+        return expires_at is not None and expires_at > timezone.now()
+
+    def load(self):
+        from modules.authentication.models import BlacklistedToken
+
+        now = timezone.now()
+        # Las revocaciones de acceso caducan con el token (minutos); filas con
+        # caducidad más lejana no son jti de acceso y quedan fuera
+        rows = BlacklistedToken.objects.filter(
+            expires_at__gt=now,
+            expires_at__lte=now + ACCESS_TOKEN_LIFETIME,
+        )
+        if self._watermark is not None:
+            rows = rows.filter(created_at__gte=self._watermark - self.overlap)
+
+        with self._lock:
+            for jti, expires_at, created_at in rows.values_list(
+                'token', 'expires_at', 'created_at'
+            ):
+                self._revoked[jti] = expires_at
+                if self._watermark is None or created_at > self._watermark:
+                    self._watermark = created_at
+            if self._watermark is None:
+                self._watermark = now
+            for jti in [jti for jti, expires_at in self._revoked.items() if expires_at <= now]:
+                del self._revoked[jti]
+
+    def __len__(self):
+        return len(self._revoked)
+
+
+class AuthState:
+    """
+    Estado de autenticación del proceso. Cada AUTH_SYNC_INTERVAL segundos
+    carga de la base de datos las revocaciones nuevas y, si el contador de
+    versión compartido cambió, vacía los usuarios cacheados. Cada
+    AUTH_PRINCIPAL_CHECK_INTERVAL segundos, además, compara los usuarios
+    cacheados con la base de datos, lo que cubre una caché no compartida
+    (LocMem) y los cambios hechos con update(), que no emiten señales.
+    Una revocación hecha en otro proceso tarda como mucho AUTH_SYNC_INTERVAL
+    en aplicarse; en el propio proceso, es inmediata.
+    """
+
+    def __init__(self):
+        self.principals = PrincipalCache(
+            maxsize=getattr(settings, 'AUTH_PRINCIPAL_CACHE_SIZE', 10000),
+            ttl=getattr(settings, 'AUTH_PRINCIPAL_CACHE_TTL', 300),
+        )
+        self.revocations = RevocationSet()
+        self.interval = getattr(settings, 'AUTH_SYNC_INTERVAL', 5)
+        self.check_interval = getattr(settings, 'AUTH_PRINCIPAL_CHECK_INTERVAL', 30)
+        self._principals_version = None
+        self._next_sync = 0.0
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+
+    def sync(self, force=False):
+        if not force and time.monotonic() < self._next_sync:
+            return
+        with self._lock:
+            now = time.monotonic()
+            if not force and now < self._next_sync:
+                return
+            version = get_version(PRINCIPALS_NAMESPACE)
+            if self._principals_version not in (None, version):
+                self.principals.clear()
+            self._principals_version = version
+            if force or now >= self._next_check:
+                self.check_principals()
+                self._next_check = now + self.check_interval
+            self.revocations.load()
+            self._next_sync = time.monotonic() + self.interval
+
+    def check_principals(self):
+        """Descarta los usuarios cacheados que cambiaron o ya no existen."""
+        from modules.manager.models import User
+
+        cached = self.principals.snapshot()
+        ids = sorted(cached)
+        current = {}
+        for start in range(0, len(ids), CHUNK_SIZE):
+            for row in User._base_manager.filter(pk__in=ids[start:start + CHUNK_SIZE]).values(
+                'pk', *PRINCIPAL_FIELDS
+            ):
+                current[str(row.pop('pk'))] = row
+        for user_id, fields in cached.items():
+            if current.get(str(user_id)) != fields:
+                self.principals.discard(user_id)
+
+    def get_user(self, user_id):
+        from modules.manager.models import User
+
+        user = self.principals.get(user_id)
+        if user is None:
+            user = User.objects.get(id=user_id)
+            self.principals.set(user_id, user)
+        return user
+
+    def is_revoked(self, jti):
+        return jti in self.revocations
+
+
+_state = None
+_state_lock = threading.Lock()
+
+
+def auth_state():
+    global _state
+    if _state is None:
+        with _state_lock:
+            if _state is None:
+                _state = AuthState()
+    return _state
+
+
+def revoke_access_token(jti, expires_at):
+    """Revoca un token de acceso por su jti, en este proceso y en el resto."""
+    from modules.authentication.models import BlacklistedToken
+
+    BlacklistedToken.objects.bulk_create(
+        [BlacklistedToken(token=jti, expires_at=expires_at)], ignore_conflicts=True
+    )
+    auth_state().revocations.add(jti, expires_at)
+    bump_version(REVOCATIONS_NAMESPACE)
+
+
+def invalidate_principal(user_id):
+    auth_state().principals.discard(str(user_id))
+    bump_version(PRINCIPALS_NAMESPACE)
@@ -0,0 +1,99 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, connection
+from django.db.models import Q
+from django.utils import timezone
+
+from modules.authentication.models import (
+    AuthToken,
+    BlacklistedToken,
+    EmailOutbox,
+    EmailVerification,
+    PasswordResetToken,
+)
+from modules.common.utils import delete_in_chunks
+
+
+def expired_querysets(now=None):
+    """
+    Filas caducadas de cada tabla de autenticación. Las verificaciones de
+    correo ya confirmadas se conservan: hay una por usuario y no crecen. Del
+    outbox se borran los correos enviados o fallidos con más antigüedad que
+    EMAIL_OUTBOX_RETENTION; los pendientes nunca.
+    """
+    now = now or timezone.now()
+    outbox_cutoff = now - timedelta(seconds=settings.EMAIL_OUTBOX_RETENTION)
+    return {
+        BlacklistedToken: BlacklistedToken.objects.filter(expires_at__lte=now),
+        AuthToken: AuthToken.objects.filter(expires_at__lte=now),
+        EmailVerification: EmailVerification.objects.filter(
+            expires_at__lte=now, is_verified=False
+        ),
+        PasswordResetToken: PasswordResetToken.objects.filter(expires_at__lte=now),
+        EmailOutbox: EmailOutbox.objects.filter(
+            Q(status=EmailOutbox.SENT, sent_at__lte=outbox_cutoff)
+            | Q(status=EmailOutbox.FAILED, created_at__lte=outbox_cutoff)
+        ),
+    }
+
+
+def table_size(model):
+    """(filas, bytes) de la tabla del modelo; bytes es None si el motor no lo expone."""
+    table = model._meta.db_table
+    rows = model.objects.count()
+    size = None
+    with connection.cursor() as cursor:
+        try:
+            if connection.vendor == 'postgresql':
+                cursor.execute("SELECT pg_total_relation_size(%s)", [table])
+                size = cursor.fetchone()[0]
+            elif connection.vendor == 'sqlite':
+                # dbstat sólo está disponible si SQLite se compiló con él
+                cursor.execute(
+                    "SELECT SUM(pgsize) FROM dbstat WHERE name IN "
+                    "(SELECT name FROM sqlite_master WHERE tbl_name = %s)", [table]
+                )
+                size = cursor.fetchone()[0]
+            elif connection.vendor == 'mysql':
+                cursor.execute(
+                    "SELECT data_length + index_length FROM information_schema.tables "
+                    "WHERE table_schema = DATABASE() AND table_name = %s", [table]
+                )
+                size = cursor.fetchone()[0]
+        except DatabaseError:
+            size = None
+    return rows, size
+
+
+def purge_expired(queryset, batch_size=1000, max_batches=None, pause=0):
+    """
+    Borra las filas del queryset por lotes de ids acotados, cada uno en su
+    propia sentencia, para no bloquear la tabla mientras se usa. Se usa el
+    delete() público, así que se respetan señales y cascadas.
+    """
+    batches = deleted = 0
+    while max_batches is None or batches < max_batches:
+        count = delete_in_chunks(queryset.order_by('id')[:batch_size], chunk_size=batch_size)
+        if not count:
+            break
+        deleted += count
+        batches += 1
+        if pause:
+            time.sleep(pause)
+    return {'batches': batches, 'deleted': deleted}
+
+
+def purge_auth_tables(batch_size=1000, max_batches=None, pause=0):
+    """Purga las tablas de autenticación y el outbox; devuelve {modelo: resultado} con tamaños antes y después."""
+    report = {}
+    for model, queryset in expired_querysets().items():
+        before = table_size(model)
+        result = purge_expired(
+            queryset, batch_size=batch_size, max_batches=max_batches, pause=pause
+        )
+        result['before'] = before
+        result['after'] = table_size(model)
+        report[model] = result
+    return report
@@ -1,7 +1,14 @@
 from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
+from rest_framework.exceptions import APIException, Throttled
 from modules.manager.models import User
-from django.contrib.auth import authenticate
+from modules.authentication.models import AuthToken
+from modules.authentication.login import HasherBusy, LoginBlocked, authenticate_credentials
+
+
+class ServiceUnavailable(APIException):
+    status_code = 503
+    default_detail = _("Servicio no disponible, inténtalo de nuevo.")
 
 
 class LoginSerializer(serializers.Serializer):
@@ -13,7 +20,13 @@ class LoginSerializer(serializers.Serializer):
         password = data.get("password")
 
         if email and password:
-            user = authenticate(email=email, password=password)
+            try:
+                user = authenticate_credentials(
+                    self.context.get("request"), email, password)
+            except LoginBlocked as e:
+                raise Throttled(wait=e.wait, detail=str(e))
+            except HasherBusy as e:
+                raise ServiceUnavailable(str(e))
 
             if user:
                 if not user.is_active:
@@ -32,6 +45,17 @@ class RefreshTokenSerializer(serializers.Serializer):
     refresh_token = serializers.CharField()
 
 
+class SessionSerializer(serializers.ModelSerializer):
+    current = serializers.SerializerMethodField()
+
+    class Meta:
+        model = AuthToken
+        fields = ["id", "device", "created_at", "last_used_at", "expires_at", "current"]
+
+    def get_current(self, obj):
+        return obj.access_jti == self.context.get("jti")
+
+
 class RegisterSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True)
 
@@ -39,6 +63,13 @@ class RegisterSerializer(serializers.ModelSerializer):
         model = User
         fields = ["email", "password", "first_name", "last_name"]
 
+    def validate_email(self, value):
+        email = User.objects.normalize_email(value)
+        if User.objects.filter_by_email(email).exists():
+            raise serializers.ValidationError(
+                _(" A user with that email already exists."))
+        return email
+
     def create(self, validated_data):
         user = User.objects.create_user(**validated_data)
         return user
@@ -0,0 +1,29 @@
+from django.core.signals import setting_changed
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from modules.authentication.principals import invalidate_principal
+from modules.common.models import bulk_active_changed
+from modules.manager.models import User
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_principal(sender, instance, **kwargs):
+    # Cambios de permisos, is_active o borrado: el resto de procesos vacían su
+    # caché de principales en la siguiente sincronización
+    invalidate_principal(instance.pk)
+
+
+@receiver(bulk_active_changed, sender=User)
+def invalidate_bulk_principals(sender, pks, **kwargs):
+    for pk in pks:
+        invalidate_principal(pk)
+
+
+@receiver(setting_changed)
+def reset_signer(sender, setting, **kwargs):
+    if setting in ('JWT_SIGNING', 'SECRET_KEY'):
+        from modules.authentication import signing
+
+        signing._signer = None
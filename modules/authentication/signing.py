@@ -0,0 +1,207 @@
+import os
+import threading
+import time
+
+import jwt
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from jwt.algorithms import has_crypto
+
+
+ASYMMETRIC_ALGORITHMS = ('RS256', 'EdDSA')
+PRIVATE_SUFFIX = '.pem'
+PUBLIC_SUFFIX = '.pub.pem'
+# Fichero de KEYS_DIR con el kid activo; si existe, manda sobre ACTIVE_KID
+ACTIVE_FILE = 'active'
+
+
+def signing_settings():
+    config = getattr(settings, 'JWT_SIGNING', {})
+    return {
+        'ALGORITHM': config.get('ALGORITHM') or 'HS256',
+        'KEYS_DIR': config.get('KEYS_DIR') or '',
+        'ACTIVE_KID': config.get('ACTIVE_KID') or '',
+        'RELOAD_INTERVAL': config.get('RELOAD_INTERVAL', 30),
+    }
+
+
+def active_kid(keys_dir, default=''):
+    """kid del fichero `active` de keys_dir o, si no existe, default."""
+    try:
+        with open(os.path.join(keys_dir, ACTIVE_FILE)) as handle:
+            return handle.read().strip() or default
+    except FileNotFoundError:
+        return default
+
+
+class KeyRing:
+    """
+    Claves de firma leídas de KEYS_DIR: `<kid>.pem` es una clave privada y
+    `<kid>.pub.pem` una pública. Firma con la clave activa y verifica con
+    todas, de modo que al rotar la clave anterior sigue validando los tokens
+    en vuelo hasta que se retira su fichero. La activa es la del fichero
+    `active` o, sin él, ACTIVE_KID. El directorio se relee si cambia, como
+    mucho cada RELOAD_INTERVAL segundos: una clave nueva se publica en el
+    JWKS en cuanto se crea y se empieza a usar al escribir `active`, sin
+    reiniciar.
+    """
+
+    def __init__(self, algorithm, keys_dir, active_kid, reload_interval=30):
+        self.algorithm = algorithm
+        self.keys_dir = keys_dir
+        self.default_kid = active_kid
+        self.reload_interval = reload_interval
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._next_check = 0.0
+        self.active = None
+        self.public_keys = {}
+        self.reload()
+
+    def _read(self, name):
+        with open(os.path.join(self.keys_dir, name), 'rb') as handle:
+            return handle.read()
+
+    def reload(self):
+        from cryptography.hazmat.primitives.serialization import (
+            load_pem_private_key,
+            load_pem_public_key,
+        )
+
+        private_keys, public_keys = {}, {}
+        for name in sorted(os.listdir(self.keys_dir)):
+            if name.endswith(PUBLIC_SUFFIX):
+                kid = name[:-len(PUBLIC_SUFFIX)]
+                public_keys.setdefault(kid, load_pem_public_key(self._read(name)))
+            elif name.endswith(PRIVATE_SUFFIX):
+                kid = name[:-len(PRIVATE_SUFFIX)]
+                private_keys[kid] = load_pem_private_key(self._read(name), password=None)
+                public_keys[kid] = private_keys[kid].public_key()
+
+        kid = active_kid(self.keys_dir, self.default_kid)
+        if kid not in private_keys:
+            raise ImproperlyConfigured(
+                f"No hay clave privada '{kid}{PRIVATE_SUFFIX}' en {self.keys_dir}"
+            )
+        # Primero las públicas, para que lo firmado con la nueva ya verifique;
+        # (kid, clave) en una sola asignación: nunca se mezclan las dos
+        self.public_keys = public_keys
+        self.active = (kid, private_keys[kid])
+        self._mtime = os.stat(self.keys_dir).st_mtime
+
+    def refresh(self):
+        now = time.monotonic()
+        if now < self._next_check:
+            return
+        with self._lock:
+            if now < self._next_check:
+                return
+            self._next_check = now + self.reload_interval
+            if os.stat(self.keys_dir).st_mtime != self._mtime:
+                self.reload()
+
+    def signing_key(self):
+        self.refresh()
+        return self.active
+
+    def verification_key(self, kid):
+        self.refresh()
+        key = self.public_keys.get(kid)
+        if key is None:
+            raise jwt.InvalidTokenError("Clave de firma desconocida.")
+        return key
+
+    def jwks(self):
+        self.refresh()
+        algorithm = jwt.get_algorithm_by_name(self.algorithm)
+        keys = []
+        for kid, key in self.public_keys.items():
+            jwk = algorithm.to_jwk(key, as_dict=True)
+            jwk.update({'kid': kid, 'use': 'sig', 'alg': self.algorithm})
+            keys.append(jwk)
+        return {'keys': keys}
+
+
+class SecretKeySigner:
+    """HS256 con SECRET_KEY: el comportamiento de siempre, sin kid ni JWKS."""
+
+    algorithm = 'HS256'
+
+    def encode(self, payload):
+        return jwt.encode(payload, settings.SECRET_KEY, algorithm=self.algorithm)
+
+    def decode(self, token, verify_exp=True):
+        return jwt.decode(
+            token, settings.SECRET_KEY, algorithms=[self.algorithm],
+            options={'verify_exp': verify_exp},
+        )
+
+    def jwks(self):
+        # Un secreto compartido no se publica
+        return {'keys': []}
+
+
+class KeyRingSigner:
+    def __init__(self, keyring):
+        self.keyring = keyring
+        self.algorithm = keyring.algorithm
+
+    def encode(self, payload):
+        kid, key = self.keyring.signing_key()
+        return jwt.encode(payload, key, algorithm=self.algorithm, headers={'kid': kid})
+
+    def decode(self, token, verify_exp=True):
+        kid = jwt.get_unverified_header(token).get('kid')
+        # Sólo se acepta el algoritmo configurado: evita la confusión RS256/HS256
+        return jwt.decode(
+            token, self.keyring.verification_key(kid), algorithms=[self.algorithm],
+            options={'verify_exp': verify_exp},
+        )
+
+    def jwks(self):
+        return self.keyring.jwks()
+
+
+def build_signer():
+    config = signing_settings()
+    algorithm = config['ALGORITHM']
+    if algorithm == 'HS256':
+        return SecretKeySigner()
+    if algorithm not in ASYMMETRIC_ALGORITHMS:
+        raise ImproperlyConfigured(f"Algoritmo JWT no soportado: {algorithm}")
+    if not has_crypto:
+        raise ImproperlyConfigured(
+            f"{algorithm} necesita el paquete 'cryptography' (pip install cryptography)."
+        )
+    if not config['KEYS_DIR']:
+        raise ImproperlyConfigured(f"{algorithm} necesita JWT_SIGNING KEYS_DIR.")
+    return KeyRingSigner(KeyRing(
+        algorithm, config['KEYS_DIR'], config['ACTIVE_KID'], config['RELOAD_INTERVAL']
+    ))
+
+
+_signer = None
+_signer_lock = threading.Lock()
+
+
+def get_signer():
+    global _signer
+    if _signer is None:
+        with _signer_lock:
+            if _signer is None:
+                _signer = build_signer()
+    return _signer
+
+
+def encode_token(payload):
+    return get_signer().encode(payload)
+
+
+def decode_token(token, verify_exp=True):
+    """Único punto de verificación de JWT del proyecto."""
+    return get_signer().decode(token, verify_exp=verify_exp)
+
+
+def unverified_claims(token):
+    """Claims sin verificar, para tokens que ya validó JWTAuthentication."""
+    return jwt.decode(token, options={'verify_signature': False})
@@ -1,3 +1,382 @@
-from django.test import TestCase
+import io
+import os
+import tempfile
+from unittest import mock, skipUnless
 
-# Create your tests here.
+import jwt
+from django.core import mail
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from jwt.algorithms import has_crypto
+from rest_framework.test import APIClient
+
+from modules.authentication import signing
+from modules.authentication.login import client_ip
+from modules.authentication.models import AuthToken, EmailOutbox, RefreshTokenError
+from modules.authentication.outbox import process_outbox
+from modules.authentication.signing import decode_token, encode_token
+from modules.manager.models import User
+
+
+class EmailOutboxTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email='user@example.com', password='secret-pass', first_name='Ana'
+        )
+
+    def forgot_password(self):
+        return APIClient().post(
+            '/api/auth/forgot-password/', {'email': self.user.email}, format='json'
+        )
+
+    def test_forgot_password_enqueues_without_sending(self):
+        response = self.forgot_password()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(mail.outbox, [])
+        email = EmailOutbox.objects.get()
+        self.assertEqual(email.to, self.user.email)
+        self.assertEqual(email.status, EmailOutbox.PENDING)
+
+    def test_worker_sends_pending_emails(self):
+        self.forgot_password()
+
+        result = process_outbox()
+
+        self.assertEqual(result['sent'], 1)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn('reset-password/?token=', mail.outbox[0].body)
+        self.assertEqual(EmailOutbox.objects.get().status, EmailOutbox.SENT)
+
+    def test_failed_delivery_is_retried_later(self):
+        self.forgot_password()
+
+        with mock.patch(
+            'django.core.mail.EmailMultiAlternatives.send', side_effect=OSError('smtp down')
+        ):
+            result = process_outbox()
+
+        self.assertEqual(result['failed'], 1)
+        email = EmailOutbox.objects.get()
+        self.assertEqual(email.status, EmailOutbox.PENDING)
+        self.assertEqual(email.attempts, 1)
+        self.assertGreater(email.next_attempt_at, timezone.now())
+        self.assertIn('smtp down', email.last_error)
+        # No vuelve a intentarse hasta que vence la espera
+        self.assertEqual(process_outbox()['batches'], 0)
+
+
+@override_settings(AUTH_LOGIN_ACCOUNT_THRESHOLD=2)
+class LoginThrottleTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='user@example.com', password='secret-pass')
+
+    def setUp(self):
+        cache.clear()
+
+    def login(self, password):
+        return APIClient().post(
+            '/api/auth/login/',
+            {'email': self.user.email, 'password': password},
+            format='json',
+        )
+
+    def test_blocked_account_is_refused_before_hashing(self):
+        self.login('wrong')
+        self.login('wrong')
+
+        with mock.patch(
+            'modules.authentication.login.verify_password'
+        ) as verify:
+            response = self.login('secret-pass')
+
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+        verify.assert_not_called()
+
+    def test_successful_login_resets_account_failures(self):
+        self.login('wrong')
+        self.assertEqual(self.login('secret-pass').status_code, 200)
+        self.login('wrong')
+
+        self.assertEqual(self.login('secret-pass').status_code, 200)
+
+    def test_ip_is_blocked_from_the_forwarded_address_behind_trusted_proxy(self):
+        def login(forwarded_for):
+            return APIClient().post(
+                '/api/auth/login/',
+                {'email': 'nobody@example.com', 'password': 'wrong'},
+                format='json',
+                REMOTE_ADDR='10.0.0.1',
+                HTTP_X_FORWARDED_FOR=forwarded_for,
+            )
+
+        with self.settings(AUTH_TRUSTED_PROXIES=['10.0.0.0/8'], AUTH_LOGIN_IP_THRESHOLD=1):
+            login('203.0.113.7')
+            self.assertEqual(login('203.0.113.7').status_code, 429)
+            # Otro cliente detrás del mismo proxy no queda bloqueado
+            self.assertEqual(login('198.51.100.2').status_code, 400)
+
+
+class ClientIpTests(SimpleTestCase):
+    def client_ip(self, remote_addr, forwarded_for=None):
+        meta = {'REMOTE_ADDR': remote_addr}
+        if forwarded_for is not None:
+            meta['HTTP_X_FORWARDED_FOR'] = forwarded_for
+        return client_ip(RequestFactory().get('/', **meta))
+
+    def test_forwarded_for_ignored_without_trusted_proxies(self):
+        self.assertEqual(self.client_ip('203.0.113.7', '198.51.100.2'), '203.0.113.7')
+
+    @override_settings(AUTH_TRUSTED_PROXIES=['10.0.0.0/8'])
+    def test_forwarded_for_ignored_from_untrusted_peer(self):
+        self.assertEqual(self.client_ip('203.0.113.7', '198.51.100.2'), '203.0.113.7')
+
+    @override_settings(AUTH_TRUSTED_PROXIES=['10.0.0.0/8'])
+    def test_rightmost_untrusted_hop_is_the_client(self):
+        # La entrada de la izquierda la puso el cliente: no se cree
+        self.assertEqual(
+            self.client_ip('10.0.0.1', '192.0.2.1, 198.51.100.2, 10.0.0.2'), '198.51.100.2'
+        )
+        self.assertEqual(self.client_ip('10.0.0.1', 'junk, 10.0.0.2'), '10.0.0.2')
+
+
+class RefreshRotationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='user@example.com', password='secret-pass')
+
+    def setUp(self):
+        _, self.refresh_token = AuthToken.issue(self.user, device='phone')
+
+    def test_rotation_issues_new_pair(self):
+        session = AuthToken.objects.get()
+
+        access_token, refresh_token = AuthToken.rotate(self.refresh_token)
+
+        rotated = AuthToken.objects.get()
+        self.assertNotEqual(refresh_token, self.refresh_token)
+        self.assertEqual(rotated.family, session.family)
+        self.assertEqual(rotated.generation, session.generation + 1)
+        self.assertNotEqual(rotated.access_jti, session.access_jti)
+        # El nuevo refresh token vuelve a valer
+        AuthToken.rotate(refresh_token)
+
+    def test_replayed_refresh_token_revokes_family(self):
+        _, refresh_token = AuthToken.rotate(self.refresh_token)
+
+        with self.assertRaisesMessage(RefreshTokenError, 'Refresh token reutilizado'):
+            AuthToken.rotate(self.refresh_token)
+
+        self.assertFalse(AuthToken.objects.exists())
+        # Tampoco vale el token legítimo de la familia revocada
+        with self.assertRaises(RefreshTokenError):
+            AuthToken.rotate(refresh_token)
+
+    def test_concurrent_rotation_only_one_succeeds(self):
+        credentials = AuthToken._credentials
+        calls = []
+        results = []
+
+        def competing_rotation(*args, **kwargs):
+            # Otra petición con el mismo token rota la fila entre la lectura
+            # y el UPDATE de ésta
+            calls.append(args)
+            if len(calls) == 1:
+                results.append(AuthToken.rotate(self.refresh_token))
+            return credentials(*args, **kwargs)
+
+        with mock.patch.object(AuthToken, '_credentials', side_effect=competing_rotation):
+            with self.assertRaisesMessage(RefreshTokenError, 'Refresh token reutilizado'):
+                AuthToken.rotate(self.refresh_token)
+
+        self.assertEqual(len(results), 1)
+        self.assertFalse(AuthToken.objects.exists())
+
+
+class SessionViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='user@example.com', password='secret-pass')
+
+    def setUp(self):
+        cache.clear()
+
+    def login(self, **data):
+        return APIClient().post(
+            '/api/auth/login/',
+            {'email': self.user.email, 'password': 'secret-pass', **data},
+            format='json',
+        )
+
+    def client_for(self, response):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access_token']}")
+        return client
+
+    def test_first_login_receives_device_id(self):
+        first = self.login()
+        second = self.login()
+
+        self.assertTrue(first.data['device'])
+        self.assertNotEqual(first.data['device'], second.data['device'])
+        self.assertEqual(AuthToken.objects.filter(user=self.user).count(), 2)
+
+    def test_login_with_device_id_reuses_its_session(self):
+        device = self.login().data['device']
+
+        response = self.login(device=device)
+
+        self.assertEqual(response.data['device'], device)
+        self.assertEqual(AuthToken.objects.get(user=self.user).device, device)
+
+    def test_list_sessions_marks_current(self):
+        phone = self.login()
+        self.login()
+
+        response = self.client_for(phone).get('/api/auth/sessions/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 2)
+        current = [session for session in response.data if session['current']]
+        self.assertEqual([session['device'] for session in current], [phone.data['device']])
+
+    def test_revoke_other_session(self):
+        phone = self.login()
+        laptop = self.login()
+        laptop_session = AuthToken.objects.get(device=laptop.data['device'])
+
+        response = self.client_for(phone).delete(f'/api/auth/sessions/{laptop_session.pk}/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(AuthToken.objects.filter(pk=laptop_session.pk).exists())
+        # JWTAuthentication no define authenticate_header: DRF responde 403
+        self.assertEqual(
+            self.client_for(laptop).get('/api/auth/sessions/').status_code, 403
+        )
+        self.assertEqual(self.client_for(phone).get('/api/auth/sessions/').status_code, 200)
+
+    def test_revoke_foreign_session_is_not_found(self):
+        other = User.objects.create_user(email='other@example.com', password='secret-pass')
+        AuthToken.issue(other, device='tablet')
+        foreign = AuthToken.objects.get(user=other)
+
+        response = self.client_for(self.login()).delete(f'/api/auth/sessions/{foreign.pk}/')
+
+        self.assertEqual(response.status_code, 404)
+        self.assertTrue(AuthToken.objects.filter(pk=foreign.pk).exists())
+
+
+@skipUnless(has_crypto, "requiere el paquete opcional cryptography")
+class AsymmetricSigningTests(TestCase):
+    algorithm = 'RS256'
+
+    def setUp(self):
+        keys_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(keys_dir.cleanup)
+        self.keys_dir = keys_dir.name
+
+        self.generate('k1')
+        config = {
+            'ALGORITHM': self.algorithm,
+            'KEYS_DIR': self.keys_dir,
+            'ACTIVE_KID': 'k1',
+            'RELOAD_INTERVAL': 0,
+        }
+        settings_override = override_settings(JWT_SIGNING=config)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.reset_signer()
+        self.addCleanup(self.reset_signer)
+
+    def reset_signer(self):
+        signing._signer = None
+
+    def command(self, *args):
+        with override_settings(JWT_SIGNING={'ALGORITHM': self.algorithm, 'KEYS_DIR': self.keys_dir}):
+            call_command('generate_jwt_key', *args, stdout=io.StringIO())
+
+    def generate(self, kid):
+        self.command('--kid', kid, '--algorithm', self.algorithm)
+
+    def test_keys_are_written_atomically_and_private(self):
+        self.command('--activate', 'k1')
+
+        # Sin temporales a medias que pudiera leer una recarga
+        self.assertEqual(sorted(os.listdir(self.keys_dir)), ['active', 'k1.pem'])
+        self.assertEqual(os.stat(os.path.join(self.keys_dir, 'k1.pem')).st_mode & 0o777, 0o600)
+
+    def test_tokens_are_signed_with_active_kid(self):
+        token = encode_token({'user_id': '1'})
+
+        header = jwt.get_unverified_header(token)
+        self.assertEqual(header['alg'], self.algorithm)
+        self.assertEqual(header['kid'], 'k1')
+        self.assertEqual(decode_token(token)['user_id'], '1')
+
+    def test_token_with_unknown_kid_is_rejected(self):
+        token = encode_token({'user_id': '1'})
+        other = tempfile.TemporaryDirectory()
+        self.addCleanup(other.cleanup)
+        with override_settings(JWT_SIGNING={
+            'ALGORITHM': self.algorithm, 'KEYS_DIR': other.name, 'ACTIVE_KID': 'k9',
+        }):
+            call_command('generate_jwt_key', '--kid', 'k9', '--algorithm', self.algorithm,
+                         stdout=io.StringIO())
+            self.reset_signer()
+            with self.assertRaises(jwt.InvalidTokenError):
+                decode_token(token)
+
+    def test_jwks_publishes_public_keys(self):
+        self.generate('k2')
+
+        response = APIClient().get('/api/auth/jwks.json')
+
+        self.assertEqual(response.status_code, 200)
+        keys = {key['kid']: key for key in response.json()['keys']}
+        self.assertEqual(set(keys), {'k1', 'k2'})
+        for key in keys.values():
+            self.assertEqual(key['alg'], self.algorithm)
+            self.assertEqual(key['use'], 'sig')
+            self.assertNotIn('d', key)
+
+    def test_publish_then_activate_without_restart(self):
+        old_token = encode_token({'user_id': '1'})
+
+        self.generate('k2')
+        # Publicada pero todavía sin firmar con ella
+        self.assertEqual(jwt.get_unverified_header(encode_token({}))['kid'], 'k1')
+
+        self.command('--activate', 'k2')
+        new_token = encode_token({'user_id': '2'})
+
+        self.assertEqual(jwt.get_unverified_header(new_token)['kid'], 'k2')
+        self.assertEqual(decode_token(old_token)['user_id'], '1')
+        self.assertEqual(decode_token(new_token)['user_id'], '2')
+
+    def test_retired_key_only_verifies(self):
+        old_token = encode_token({'user_id': '1'})
+        self.generate('k2')
+        self.command('--activate', 'k2')
+
+        self.command('--retire', 'k1')
+
+        self.assertFalse(os.path.exists(os.path.join(self.keys_dir, 'k1.pem')))
+        self.assertTrue(os.path.exists(os.path.join(self.keys_dir, 'k1.pub.pem')))
+        self.assertEqual(decode_token(old_token)['user_id'], '1')
+        self.assertEqual(jwt.get_unverified_header(encode_token({}))['kid'], 'k2')
+
+    def test_active_key_cannot_be_retired(self):
+        self.generate('k2')
+        self.command('--activate', 'k2')
+
+        with self.assertRaises(CommandError):
+            self.command('--retire', 'k2')
+
+
+class EdDSASigningTests(AsymmetricSigningTests):
+    algorithm = 'EdDSA'
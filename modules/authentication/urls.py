@@ -7,6 +7,10 @@ from modules.authentication.views import (
     VerifyEmailView,
     ForgotPasswordView,
     ResetPasswordView,
+    SessionListView,
+    SessionDetailView,
+    HasherStatsView,
+    JWKSView,
 )
 
 urlpatterns = [
@@ -16,6 +20,14 @@ urlpatterns = [
     path("refresh/", RefreshTokenView.as_view(), name="auth-refresh"),
     # Cerrar sesión
     path("logout/", LogoutView.as_view(), name="auth-logout"),
+    # Sesiones abiertas por dispositivo
+    path("sessions/", SessionListView.as_view(), name="auth-sessions"),
+    path("sessions/<int:pk>/", SessionDetailView.as_view(),
+         name="auth-session-detail"),
+    # Métricas del pool de hashing (admin)
+    path("hasher-stats/", HasherStatsView.as_view(), name="auth-hasher-stats"),
+    # Claves públicas para verificar los JWT fuera de la API
+    path("jwks.json", JWKSView.as_view(), name="auth-jwks"),
     # Registrarse
     path("register/", RegisterView.as_view(), name="auth-register"),
     # email para verificar
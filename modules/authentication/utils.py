@@ -1,61 +1,78 @@
-import jwt
+import hashlib
+import secrets
 import uuid
 from django.conf import settings
 from django.utils.timezone import now, timedelta
 
-from django.core.mail import send_mail
-from django.template.loader import render_to_string
-from django.utils.html import strip_tags
+from modules.authentication.signing import encode_token
 
 
-def generate_access_token(user):
+ACCESS_TOKEN_LIFETIME = timedelta(minutes=15)
+REFRESH_TOKEN_LIFETIME = timedelta(days=7)
+
+
+def generate_jti():
+    return uuid.uuid4().hex
+
+
+def generate_access_token(user, jti=None):
+    return encode_access_token(user.id, jti=jti)
+
+
+def encode_access_token(user_id, jti=None):
     payload = {
-        "user_id": str(user.id),
-        "exp": now() + timedelta(minutes=15),
+        "user_id": str(user_id),
+        "exp": now() + ACCESS_TOKEN_LIFETIME,
         "iat": now(),
+        # Identificador del token para poder revocarlo antes de que caduque
+        "jti": jti or generate_jti(),
     }
-    return jwt.encode(payload, settings.SECRET_KEY, algorithm="HS256")
+    return encode_token(payload)
 
 
-def generate_refresh_token():
-    return str(uuid.uuid4())
+def generate_refresh_token(family):
+    """<familia>.<secreto>: la familia localiza la sesión sin índice sobre el secreto."""
+    return f"{family}.{secrets.token_urlsafe(32)}"
 
 
-# apps/authentication/utils.py
+def refresh_token_family(refresh_token):
+    family, _sep, secret = refresh_token.partition(".")
+    if not secret or len(family) != 32:
+        return None
+    return family
+
+
+def token_digest(token):
+    """SHA-256 del token: lo que se guarda y se busca en lugar del valor en claro."""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+# Los correos se encolan en EmailOutbox y los envía el worker send_outbox_emails
 
 
 def send_verification_email(user, token):
-    subject = "Confirma tu correo electrónico"
-    verification_url = f"{settings.FRONTEND_URL}/verify-email/?token={token}"
+    from modules.authentication.outbox import enqueue_email
 
-    html_message = render_to_string(
-        "emails/verify_email.html", {"user": user,
-                                     "verification_url": verification_url}
-    )
-    plain_message = strip_tags(html_message)
-
-    send_mail(
-        subject=subject,
-        message=plain_message,
-        from_email=settings.DEFAULT_FROM_EMAIL,
-        recipient_list=[user.email],
-        html_message=html_message,
+    return enqueue_email(
+        to=user.email,
+        subject="Confirma tu correo electrónico",
+        template="emails/verify_email.html",
+        context={
+            "first_name": user.first_name,
+            "verification_url": f"{settings.FRONTEND_URL}/verify-email/?token={token}",
+        },
     )
 
 
 def send_password_reset_email(user, token):
-    subject = "Restablece tu contraseña"
-    reset_url = f"{settings.FRONTEND_URL}/reset-password/?token={token}"
+    from modules.authentication.outbox import enqueue_email
 
-    html_message = render_to_string(
-        "emails/reset_password.html", {"user": user, "reset_url": reset_url}
-    )
-    plain_message = strip_tags(html_message)
-
-    send_mail(
-        subject=subject,
-        message=plain_message,
-        from_email=settings.DEFAULT_FROM_EMAIL,
-        recipient_list=[user.email],
-        html_message=html_message,
+    return enqueue_email(
+        to=user.email,
+        subject="Restablece tu contraseña",
+        template="emails/reset_password.html",
+        context={
+            "first_name": user.first_name,
+            "reset_url": f"{settings.FRONTEND_URL}/reset-password/?token={token}",
+        },
     )
@@ -1,9 +1,9 @@
 import jwt
-from django.conf import settings
 from modules.manager.models import User
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from .serializers import (
     LoginSerializer,
     RefreshTokenSerializer,
@@ -11,16 +11,18 @@ from .serializers import (
     VerifyEmailSerializer,
     ForgotPasswordSerializer,
     ResetPasswordSerializer,
+    SessionSerializer,
 )
 from .utils import (
-    generate_access_token,
-    generate_refresh_token,
+    generate_jti,
     send_verification_email,
     send_password_reset_email,
 )
-from .models import AuthToken, BlacklistedToken, EmailVerification, PasswordResetToken
+from .login import hasher_pool
+from .signing import decode_token, get_signer, unverified_claims
+from .models import AuthToken, EmailVerification, PasswordResetToken, RefreshTokenError
+from django.db import transaction
 from django.utils import timezone
-from datetime import timedelta
 
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
@@ -35,6 +37,13 @@ login_request_body = openapi.Schema(
         "password": openapi.Schema(
             type=openapi.TYPE_STRING, description="Contraseña del usuario"
         ),
+        "device": openapi.Schema(
+            type=openapi.TYPE_STRING,
+            description=(
+                "Identificador del dispositivo devuelto en un login anterior; "
+                "si no se envía se genera uno nuevo"
+            ),
+        ),
     },
     required=["email", "password"],
 )
@@ -47,6 +56,10 @@ login_responses = {
             properties={
                 "access_token": openapi.Schema(type=openapi.TYPE_STRING),
                 "refresh_token": openapi.Schema(type=openapi.TYPE_STRING),
+                "device": openapi.Schema(
+                    type=openapi.TYPE_STRING,
+                    description="Identificador a reenviar en los próximos logins",
+                ),
             },
         ),
     ),
@@ -57,28 +70,23 @@ login_responses = {
 @swagger_auto_schema(request_body=login_request_body, responses=login_responses)
 class LoginView(APIView):
     def post(self, request):
-        serializer = LoginSerializer(data=request.data)
+        serializer = LoginSerializer(
+            data=request.data, context={"request": request})
         if serializer.is_valid():
             user = serializer.validated_data
 
-            # Revocar cualquier sesión activa
-            active_token = AuthToken.get_active_token(user)
-            if active_token:
-                active_token.revoke()
-
-            access_token = generate_access_token(user)
-            refresh_token = generate_refresh_token()
-            expires_at = timezone.now() + timedelta(days=7)
-
-            AuthToken.objects.create(
-                user=user,
-                access_token=access_token,
-                refresh_token=refresh_token,
-                expires_at=expires_at,
-            )
+            # Una sesión por dispositivo: no cierra las de los demás. El
+            # User-Agent no sirve de identificador (dos navegadores iguales
+            # compartirían sesión), así que el primer login recibe uno aleatorio
+            device = str(request.data.get("device") or generate_jti())[:255]
+            access_token, refresh_token = AuthToken.issue(user, device=device)
 
             return Response(
-                {"access_token": access_token, "refresh_token": refresh_token},
+                {
+                    "access_token": access_token,
+                    "refresh_token": refresh_token,
+                    "device": device,
+                },
                 status=status.HTTP_200_OK,
             )
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -116,32 +124,14 @@ class RefreshTokenView(APIView):
         if serializer.is_valid():
             refresh_token = serializer.validated_data["refresh_token"]
 
-            if BlacklistedToken.is_blacklisted(refresh_token):
-                return Response(
-                    {"error": "Refresh token revocado"},
-                    status=status.HTTP_401_UNAUTHORIZED,
-                )
-
-            token_obj = AuthToken.objects.filter(
-                refresh_token=refresh_token).first()
-            if not token_obj or not token_obj.is_valid():
+            try:
+                new_access_token, new_refresh_token = AuthToken.rotate(
+                    refresh_token)
+            except RefreshTokenError as e:
                 return Response(
-                    {"error": "Refresh token inválido o expirado"},
-                    status=status.HTTP_401_UNAUTHORIZED,
+                    {"error": str(e)}, status=status.HTTP_401_UNAUTHORIZED
                 )
 
-            new_access_token = generate_access_token(token_obj.user)
-            new_refresh_token = generate_refresh_token()
-            new_expires_at = timezone.now() + timedelta(days=7)
-
-            token_obj.revoke()
-            AuthToken.objects.create(
-                user=token_obj.user,
-                access_token=new_access_token,
-                refresh_token=new_refresh_token,
-                expires_at=new_expires_at,
-            )
-
             return Response(
                 {"access_token": new_access_token,
                     "refresh_token": new_refresh_token},
@@ -171,12 +161,10 @@ class LogoutView(APIView):
 
         token = auth_header.split(" ")[1]
         try:
-            payload = jwt.decode(
-                token, settings.SECRET_KEY, algorithms=["HS256"])
-            user = User.objects.get(id=payload["user_id"])
+            payload = decode_token(token)
 
             token_obj = AuthToken.objects.filter(
-                access_token=token, user=user).first()
+                access_jti=payload.get("jti"), user_id=payload["user_id"]).first()
             if token_obj:
                 token_obj.revoke()
 
@@ -187,6 +175,84 @@ class LogoutView(APIView):
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 
+def current_jti(request):
+    # El token ya fue validado por JWTAuthentication
+    try:
+        return unverified_claims(request.auth).get("jti")
+    except jwt.InvalidTokenError:
+        return None
+
+
+class SessionListView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_description="Lista las sesiones abiertas del usuario, una por dispositivo",
+        responses={200: SessionSerializer(many=True)},
+    )
+    def get(self, request):
+        sessions = AuthToken.objects.filter(
+            user=request.user, expires_at__gt=timezone.now()
+        ).order_by("-last_used_at")
+        serializer = SessionSerializer(
+            sessions, many=True, context={"jti": current_jti(request)})
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class SessionDetailView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_description="Cierra una sesión concreta del usuario",
+        responses={
+            200: openapi.Response("Sesión revocada"),
+            404: openapi.Response("Sesión no encontrada"),
+        },
+    )
+    def delete(self, request, pk):
+        session = AuthToken.objects.filter(user=request.user, pk=pk).first()
+        if not session:
+            return Response(
+                {"error": "Sesión no encontrada"}, status=status.HTTP_404_NOT_FOUND
+            )
+        session.revoke()
+        return Response(
+            {"detail": "Sesión revocada."}, status=status.HTTP_200_OK
+        )
+
+
+class HasherStatsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    @swagger_auto_schema(
+        operation_description=(
+            "Métricas del pool de hashing de contraseñas de este proceso: "
+            "profundidad de cola, rechazos y tiempos medios"
+        ),
+        responses={200: openapi.Response("Métricas del pool")},
+    )
+    def get(self, request):
+        return Response(hasher_pool().stats(), status=status.HTTP_200_OK)
+
+
+class JWKSView(APIView):
+    authentication_classes = []
+    permission_classes = []
+
+    @swagger_auto_schema(
+        operation_description=(
+            "Claves públicas (JWKS) para verificar los tokens de acceso sin "
+            "llamar a la API. Vacío si se firma con HS256."
+        ),
+        responses={200: openapi.Response("JSON Web Key Set")},
+    )
+    def get(self, request):
+        response = Response(get_signer().jwks(), status=status.HTTP_200_OK)
+        # Tras rotar, la clave nueva aparece aquí antes de que los clientes la necesiten
+        response["Cache-Control"] = "public, max-age=300"
+        return response
+
+
 register_request_body = openapi.Schema(
     type=openapi.TYPE_OBJECT,
     properties={
@@ -297,11 +363,14 @@ class ForgotPasswordView(APIView):
         if serializer.is_valid():
             email = serializer.validated_data["email"]
             try:
-                user = User.objects.get(email=email)
-                reset_token, created = PasswordResetToken.objects.get_or_create(
-                    user=user
-                )
-                send_password_reset_email(user, reset_token.token)
+                user = User.objects.get_by_natural_key(email)
+                # El token y su correo se guardan juntos; el envío lo hace el worker
+                with transaction.atomic():
+                    # Un token caducado no se reenvía: se emite uno nuevo
+                    reset_token, created = PasswordResetToken.objects.get_or_create(
+                        user=user, expires_at__gt=timezone.now()
+                    )
+                    send_password_reset_email(user, reset_token.token)
                 return Response(
                     {"detail": "Se ha enviado un enlace a tu correo."},
                     status=status.HTTP_200_OK,
@@ -1,8 +1,9 @@
 from django.contrib import admin
+from modules.common.admin import SoftDeleteAdmin
 from modules.cinema.models.cinema import Cinema
 from modules.cinema.models.screening_room import ScreeningRoom
 
 # Register your models here.
 
-admin.site.register(Cinema)
-admin.site.register(ScreeningRoom)  
\ No newline at end of file
+admin.site.register(Cinema, SoftDeleteAdmin)
+admin.site.register(ScreeningRoom, SoftDeleteAdmin)  
\ No newline at end of file
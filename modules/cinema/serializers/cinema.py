@@ -48,7 +48,7 @@ class CinemaCreateSerializer(AuditableSerializerMixin):
         fields = ['name', 'address', 'total_seats', 'is_active']
 
     def validate_name(self, value):
-        if Cinema.objects.filter(name=value).exists():
+        if Cinema.all_objects.filter(name=value).exists():
             raise ValidationError(_('A cinema with this name already exists.'))
         return value
 
@@ -94,7 +94,7 @@ class CinemaUpdateSerializer(AuditableSerializerMixin):
         fields = ['name', 'address', 'total_seats', 'is_active']
 
     def validate_name(self, value):
-        if value and Cinema.objects.filter(name=value).exclude(pk=self.instance.pk).exists():
+        if value and Cinema.all_objects.filter(name=value).exclude(pk=self.instance.pk).exists():
             raise ValidationError(_('A cinema with this name already exists.'))
         return value
 
@@ -111,7 +111,7 @@ class CinemaUpdateSerializer(AuditableSerializerMixin):
     def validate(self, data):
         # Si se actualiza el nombre, validar unicidad
         name = data.get('name')
-        if name and Cinema.objects.filter(name=name).exclude(pk=self.instance.pk).exists():
+        if name and Cinema.all_objects.filter(name=name).exclude(pk=self.instance.pk).exists():
             raise ValidationError({
                 'name': _('A cinema with this name already exists.')
             })
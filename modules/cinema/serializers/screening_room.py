@@ -2,12 +2,12 @@ from django.utils.translation import gettext_lazy as _
 from django.db.models import Sum
 from rest_framework import serializers
 from rest_framework.validators import ValidationError
-from modules.common.serializer import AuditableSerializerMixin
+from modules.common.serializer import AuditableSerializerMixin, EagerLoadingMixin
 from modules.cinema.models.screening_room import ScreeningRoom
 from modules.cinema.models.cinema import Cinema
 
 
-class ScreeningRoomListSerializer(AuditableSerializerMixin):
+class ScreeningRoomListSerializer(EagerLoadingMixin, AuditableSerializerMixin):
 
     cinema = serializers.CharField(source='cinema.name')
     class Meta:
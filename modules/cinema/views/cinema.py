@@ -13,6 +13,8 @@ from modules.cinema.serializers.cinema import (
     CinemaUpdateSerializer
 )
 from modules.cinema.filters.cinema import CinemaFilter  # Si tienes filtros personalizados
+from modules.common.response_cache import CachedResponseMixin
+from modules.common.views import EagerLoadingViewMixin
 
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi as oa
@@ -26,12 +28,13 @@ def get_user_fullname(user):
 
 
 @swagger_auto_schema(tags=['Cinemas'])
-class CinemaViewSet(ModelViewSet):
+class CinemaViewSet(CachedResponseMixin, EagerLoadingViewMixin, ModelViewSet):
     """
     API endpoint that allows cinemas to be viewed or edited.
     """
 
-    queryset = Cinema.objects.filter(is_active=True)
+    queryset = Cinema.objects.all()
+    cache_models = (Cinema,)
     serializer_class = CinemaListSerializer
     permission_classes = [IsAuthenticated]
     filterset_class = CinemaFilter  # Opcional, si usas filtros
@@ -78,20 +81,11 @@ class CinemaViewSet(ModelViewSet):
             raise PermissionDenied(_("Usuario no autenticado"))
 
     def perform_destroy(self, instance):
-        request = self.request
-        user = request.user
-
+        user = self.request.user
         if user.is_authenticated:
-            full_name = get_user_fullname(user)
-            instance.deleted_by = full_name
-            instance.deleted_date = timezone.now()
-            instance.is_active = False
-            instance.save()
+            instance.soft_delete(deleted_by=get_user_fullname(user))
         else:
-            instance.deleted_by = _("Desconocido")
-            instance.deleted_date = timezone.now()
-            instance.is_active = False
-            instance.save()
+            instance.soft_delete(deleted_by=_("Desconocido"))
 
     @swagger_auto_schema(operation_summary=_("List all cinemas"))
     def list(self, request, *args, **kwargs):
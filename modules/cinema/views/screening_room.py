@@ -12,6 +12,9 @@ from modules.cinema.serializers.screening_room import (
     ScreeningRoomCreateSerializer,
     ScreeningRoomUpdateSerializer
 )
+from modules.cinema.models.cinema import Cinema
+from modules.common.response_cache import CachedResponseMixin
+from modules.common.views import EagerLoadingViewMixin
 
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi as oa
@@ -25,12 +28,13 @@ def get_user_fullname(user):
 
 
 @swagger_auto_schema(tags=['Screening Rooms'])
-class ScreeningRoomViewSet(ModelViewSet):
+class ScreeningRoomViewSet(CachedResponseMixin, EagerLoadingViewMixin, ModelViewSet):
     """
     API endpoint that allows screening rooms to be viewed or edited.
     """
 
     queryset = ScreeningRoom.objects.all()
+    cache_models = (ScreeningRoom, Cinema)
     serializer_class = ScreeningRoomListSerializer
     permission_classes = [IsAuthenticated]
     # filterset_class = ScreeningRoomFilter  # Puedes omitir si no usas filtros personalizados
@@ -77,20 +81,11 @@ class ScreeningRoomViewSet(ModelViewSet):
             raise PermissionDenied(_("Usuario no autenticado"))
 
     def perform_destroy(self, instance):
-        request = self.request
-        user = request.user
-
+        user = self.request.user
         if user.is_authenticated:
-            full_name = get_user_fullname(user)
-            instance.deleted_by = full_name
-            instance.deleted_date = timezone.now()
-            instance.is_active = False
-            instance.save()
+            instance.soft_delete(deleted_by=get_user_fullname(user))
         else:
-            instance.deleted_by = _("Desconocido")
-            instance.deleted_date = timezone.now()
-            instance.is_active = False
-            instance.save()
+            instance.soft_delete(deleted_by=_("Desconocido"))
 
     @swagger_auto_schema(operation_summary=_("List all screening rooms"))
     def list(self, request, *args, **kwargs):
@@ -1,3 +1,28 @@
 from django.contrib import admin
+from django.utils.translation import gettext_lazy as _
 
-# Register your models here.
+from modules.common.utils import get_user_fullname
+
+
+class SoftDeleteAdmin(admin.ModelAdmin):
+    """
+    Admin para modelos con borrado lógico: muestra también las filas borradas
+    y ofrece acciones en bloque para borrarlas o restaurarlas.
+    """
+    list_filter = ('is_active',)
+    actions = ['soft_delete_selected', 'restore_selected']
+
+    def get_queryset(self, request):
+        queryset = self.model.all_objects.get_queryset()
+        ordering = self.get_ordering(request)
+        if ordering:
+            queryset = queryset.order_by(*ordering)
+        return queryset
+
+    @admin.action(description=_("Soft delete selected"))
+    def soft_delete_selected(self, request, queryset):
+        queryset.soft_delete(deleted_by=get_user_fullname(request.user))
+
+    @admin.action(description=_("Restore selected"))
+    def restore_selected(self, request, queryset):
+        queryset.restore(restored_by=get_user_fullname(request.user))
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class CommonConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "modules.common"
+
+    def ready(self):
+        from modules.common import checks, signals  # noqa: F401
@@ -1,20 +1,25 @@
-from django.contrib.auth import get_user_model
 from django.contrib.auth.backends import ModelBackend
+from django.core.exceptions import PermissionDenied
+
+from modules.authentication.login import HasherBusy, LoginBlocked, authenticate_credentials
 
 
 class EmailAdminAuthBackend(ModelBackend):
     """
     Backend para permitir login en el admin usando email y contraseña.
+    Usa el mismo flujo que la API: bloqueo por intentos, pool de hashing y
+    rehash al cambiar los parámetros del hasher.
     """
 
     def authenticate(self, request, username=None, password=None, **kwargs):
-        UserModel = get_user_model()
-
+        if username is None:
+            username = kwargs.get("email")
         try:
-            user = UserModel.objects.get(email=username)
-            if user.check_password(password):
-                return user
-        except UserModel.DoesNotExist:
-            return None
+            user = authenticate_credentials(request, username, password)
+        except (LoginBlocked, HasherBusy):
+            # Corta la cadena de backends: ninguno debe calcular el hash
+            raise PermissionDenied
 
+        if user and self.user_can_authenticate(user):
+            return user
         return None
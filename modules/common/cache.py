@@ -0,0 +1,53 @@
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+
+
+VERSION_KEY = 'version:{}'
+
+
+def get_version(namespace):
+    """
+    Devuelve el contador de versión de un espacio de nombres. Las claves de
+    caché incluyen la versión, así que incrementarla invalida todo lo anterior.
+    """
+    key = VERSION_KEY.format(namespace)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, 1, timeout=None)
+        version = cache.get(key, 1)
+    return version
+
+
+def bump_version(namespace):
+    key = VERSION_KEY.format(namespace)
+    cache.add(key, 1, timeout=None)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # La clave expiró o fue desalojada entre add() e incr()
+        cache.set(key, 2, timeout=None)
+        return 2
+
+
+def get_versions(namespaces):
+    """Como get_version para varios espacios de nombres con un solo get_many."""
+    keys = {VERSION_KEY.format(namespace): namespace for namespace in namespaces}
+    found = cache.get_many(list(keys))
+    versions = {}
+    for key, namespace in keys.items():
+        versions[namespace] = found[key] if key in found else get_version(namespace)
+    return versions
+
+
+def model_namespace(model):
+    return f"response:{model._meta.label_lower}"
+
+
+def bump_model_version(model):
+    """Invalida las respuestas cacheadas que dependen del modelo."""
+    return bump_version(model_namespace(model))
+
+
+def is_process_local():
+    """True si la caché por defecto vive en la memoria de cada proceso."""
+    return isinstance(caches['default'], LocMemCache)
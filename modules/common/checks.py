@@ -0,0 +1,16 @@
+from django.core.checks import Tags, Warning, register
+
+from modules.common.cache import is_process_local
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    if not is_process_local():
+        return []
+    return [Warning(
+        "La caché por defecto es LocMemCache: cada worker tiene la suya, así que "
+        "las versiones de modelo, las revocaciones y los contadores no se "
+        "comparten y las respuestas cacheadas pueden quedar obsoletas.",
+        hint="Configura un backend compartido (CACHE_BACKEND=redis o file).",
+        id='common.W001',
+    )]
@@ -0,0 +1,41 @@
+import django_filters
+from django import forms
+from django.core.exceptions import ValidationError
+from django.db.models import Count
+from django.utils.translation import gettext_lazy as _
+
+
+class IdListField(forms.Field):
+    # SelectMultiple lee todos los valores repetidos del parámetro (?x=1&x=2)
+    widget = forms.SelectMultiple
+    default_error_messages = {
+        'invalid': _('Enter a list of valid IDs.'),
+    }
+
+    def to_python(self, value):
+        if not value:
+            return []
+        if isinstance(value, str):
+            value = [value]
+        try:
+            return list(dict.fromkeys(int(item) for item in value))
+        except (TypeError, ValueError):
+            raise ValidationError(self.error_messages['invalid'], code='invalid')
+
+
+class IdListFilter(django_filters.Filter):
+    """Lista de IDs validada sólo por formato, sin consultar la base de datos."""
+    field_class = IdListField
+
+
+def filter_having_all(queryset, through, owner_column, related_column, ids):
+    """
+    Filtra las filas relacionadas con TODOS los ids mediante una única
+    subconsulta agrupada sobre la tabla intermedia, sin JOINs ni DISTINCT.
+    """
+    matching = through.objects.filter(
+        **{f'{related_column}__in': ids}
+    ).values(owner_column).annotate(
+        matches=Count(related_column, distinct=True)
+    ).filter(matches=len(ids)).values(owner_column)
+    return queryset.filter(pk__in=matching)
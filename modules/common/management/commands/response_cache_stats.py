@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import get_resolver
+
+from modules.common.cache import is_process_local
+from modules.common.response_cache import CachedResponseMixin, get_stats, reset_stats
+
+
+def cached_views(cls=CachedResponseMixin):
+    for subclass in cls.__subclasses__():
+        yield subclass
+        yield from cached_views(subclass)
+
+
+class Command(BaseCommand):
+    help = (
+        "Muestra la tasa de aciertos de la caché de respuestas por vista. Lee los "
+        "contadores que los workers vuelcan en la caché compartida cada "
+        "RESPONSE_CACHE_STATS_INTERVAL segundos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help="Pone los contadores a cero")
+
+    def handle(self, *args, **options):
+        if is_process_local():
+            # Este comando tendría su propia LocMemCache, vacía
+            raise CommandError(
+                "La caché por defecto es local a cada proceso; los contadores de los "
+                "workers no son visibles desde aquí. Usa CACHE_BACKEND=redis o file."
+            )
+
+        # Cargar las URLs importa las vistas que usan la caché
+        get_resolver().url_patterns
+
+        names = sorted({view.response_cache_name() for view in cached_views()})
+        for name in names:
+            stats = get_stats(name)
+            self.stdout.write(
+                f"{name}: {stats['hits']} aciertos, {stats['misses']} fallos "
+                f"({stats['hit_ratio']:.1%})"
+            )
+            if options['reset']:
+                reset_stats(name)
@@ -1,6 +1,73 @@
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.contrib.auth.models import AbstractUser
+from django.dispatch import Signal
+
+from modules.common.cache import bump_model_version
+
+
+# update() no emite post_save: las proyecciones que dependen de is_active
+# escuchan esta señal (sender=modelo, pks=ids afectados, is_active=nuevo valor)
+bulk_active_changed = Signal()
+
+
+class SoftDeleteQuerySet(models.QuerySet):
+    def active(self):
+        return self.filter(is_active=True)
+
+    def deleted(self):
+        return self.filter(is_active=False)
+
+    def _set_active(self, is_active, **fields):
+        # Los ids se leen antes del UPDATE sólo si alguien escucha la señal
+        pks = None
+        if bulk_active_changed.has_listeners(self.model):
+            pks = list(self.values_list('pk', flat=True))
+        updated = self.update(is_active=is_active, **fields)
+        # update() no emite señales: se invalida aquí la caché de respuestas
+        bump_model_version(self.model)
+        if pks:
+            bulk_active_changed.send(sender=self.model, pks=pks, is_active=is_active)
+        return updated
+
+    def soft_delete(self, deleted_by=None):
+        """Borrado lógico en bloque con un único UPDATE."""
+        return self._set_active(
+            False,
+            deleted_date=timezone.now(),
+            deleted_by=deleted_by,
+        )
+
+    def restore(self, restored_by=None):
+        return self._set_active(
+            True,
+            deleted_date=None,
+            deleted_by=None,
+            updated_by=restored_by,
+            updated_date=timezone.now(),
+        )
+
+
+class SoftDeleteManager(models.Manager.from_queryset(SoftDeleteQuerySet)):
+    """
+    Gestor por defecto: excluye las filas borradas lógicamente.
+
+    Al ser el primero declarado es el `_default_manager`, así que el filtro
+    también se aplica a los gestores inversos (`cinema.rooms`,
+    `category.movies`...), a la validación de claves foráneas de ModelForm
+    y del admin, a `get_object_or_404` y a `dumpdata`. Para ver o referenciar
+    filas borradas hay que usar `all_objects`, que además es el
+    `base_manager_name` de AuditableMixins: el acceso directo `showtime.movie`
+    sigue resolviendo aunque la película esté borrada.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().filter(is_active=True)
+
+
+class AllObjectsManager(models.Manager.from_queryset(SoftDeleteQuerySet)):
+    """Incluye las filas borradas (admin, restauración, validaciones de unicidad)."""
 
 
 class AuditableMixins(models.Model):
@@ -23,5 +90,26 @@ class AuditableMixins(models.Model):
         verbose_name=_("deleted by"), max_length=255, null=True, blank=True
     )
 
+    is_active = models.BooleanField(verbose_name=_("Is Active"), default=True)
+
+    objects = SoftDeleteManager()
+    all_objects = AllObjectsManager()
+
     class Meta:
         abstract = True
+        base_manager_name = 'all_objects'
+
+    def soft_delete(self, deleted_by=None):
+        self.is_active = False
+        self.deleted_date = timezone.now()
+        self.deleted_by = deleted_by
+        self.save(update_fields=['is_active', 'deleted_date', 'deleted_by'])
+
+    def restore(self, restored_by=None):
+        self.is_active = True
+        self.deleted_date = None
+        self.deleted_by = None
+        self.updated_by = restored_by
+        self.save(update_fields=[
+            'is_active', 'deleted_date', 'deleted_by', 'updated_by', 'updated_date'
+        ])
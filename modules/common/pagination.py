@@ -0,0 +1,187 @@
+import hashlib
+import json
+from base64 import b64decode, b64encode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Paginación por keyset sobre una ordenación compuesta y estable, p. ej.
+    (release_date, id). Cada página filtra con una comparación de tuplas a
+    partir de la última fila vista: no usa OFFSET ni ejecuta COUNT(*), así que
+    la página N cuesta lo mismo que la primera.
+
+    Cada viewset elige su ordenación con el atributo `ordering`; la clave
+    primaria se añade siempre como desempate. Con `?with_count=true` se añade
+    un total aproximado, cacheado durante KEYSET_COUNT_CACHE_TIMEOUT segundos.
+    """
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-id',)
+    count_query_param = 'with_count'
+    invalid_cursor_message = 'Cursor inválido'
+
+    def _sortable(self, model, name):
+        name = name.lstrip('-')
+        if name == 'pk':
+            return True
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return False
+        # La comparación de tuplas no funciona con NULL ni con relaciones
+        return field.concrete and not field.null and not field.is_relation
+
+    def get_ordering(self, request, queryset, view):
+        model = queryset.model
+        ordering = [
+            field for field in super().get_ordering(request, queryset, view)
+            if self._sortable(model, field)
+        ] or ['-pk']
+        pk_name = model._meta.pk.name
+        names = [field.lstrip('-') for field in ordering]
+        if pk_name not in names and 'pk' not in names:
+            descending = ordering[-1].startswith('-')
+            ordering.append(f"-{pk_name}" if descending else pk_name)
+        return tuple(ordering)
+
+    def _field(self, model, name):
+        name = name.lstrip('-')
+        if name == 'pk':
+            return model._meta.pk
+        try:
+            return model._meta.get_field(name)
+        except FieldDoesNotExist:
+            raise NotFound(self.invalid_cursor_message)
+
+    def _seek(self, model, ordering, values):
+        """
+        (f1, f2, ...) > (v1, v2, ...) expresado como
+        f1 > v1 OR (f1 = v1 AND f2 > v2) OR ...
+        respetando la dirección de cada campo.
+        """
+        condition = Q()
+        equal = Q()
+        for field_name, value in zip(ordering, values):
+            field = self._field(model, field_name)
+            lookup = 'lt' if field_name.startswith('-') else 'gt'
+            condition |= equal & Q(**{f"{field.attname}__{lookup}": value})
+            equal &= Q(**{field.attname: value})
+        return condition
+
+    def _position(self, row, ordering):
+        return [
+            self._field(type(row), field_name).value_to_string(row)
+            for field_name in ordering
+        ]
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.view = view
+        self.queryset = queryset
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+
+        model = queryset.model
+        reverse = bool(self.cursor and self.cursor['r'])
+        ordering = self.ordering
+        if reverse:
+            ordering = tuple(
+                field[1:] if field.startswith('-') else f"-{field}" for field in ordering
+            )
+
+        queryset = queryset.order_by(*ordering)
+        if self.cursor:
+            try:
+                values = [
+                    self._field(model, field_name).to_python(value)
+                    for field_name, value in zip(ordering, self.cursor['v'])
+                ]
+            except (ValidationError, ValueError, TypeError):
+                # Cursor manipulado: valores que no encajan con el campo
+                raise NotFound(self.invalid_cursor_message)
+            queryset = queryset.filter(self._seek(model, ordering, values))
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+
+        if reverse:
+            rows.reverse()
+            self.has_previous, self.has_next = has_more, True
+        else:
+            self.has_previous, self.has_next = self.cursor is not None, has_more
+
+        self.page = rows
+        return rows
+
+    def encode_cursor(self, position, reverse=False):
+        payload = json.dumps({'o': list(self.ordering), 'v': position, 'r': int(reverse)})
+        encoded = b64encode(payload.encode('utf-8')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            cursor = json.loads(b64decode(encoded.encode('ascii')).decode('utf-8'))
+            valid = (
+                cursor['o'] == list(self.ordering)
+                and len(cursor['v']) == len(self.ordering)
+            )
+        except (TypeError, ValueError, KeyError):
+            valid = False
+        if not valid:
+            raise NotFound(self.invalid_cursor_message)
+        return cursor
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self._position(self.page[-1], self.ordering))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self._position(self.page[0], self.ordering), reverse=True)
+
+    def get_approximate_count(self):
+        # La clave sale de la consulta SQL ya filtrada: incluye el filtrado por
+        # usuario o permisos que aplique get_queryset, no sólo la URL
+        sql, params = self.queryset.order_by().query.sql_with_params()
+        fingerprint = hashlib.md5(
+            json.dumps([sql, [str(param) for param in params]]).encode('utf-8')
+        ).hexdigest()
+        key = f"keyset-count:{fingerprint}"
+
+        count = cache.get(key)
+        if count is None:
+            count = self.queryset.order_by().count()
+            cache.set(key, count, getattr(settings, 'KEYSET_COUNT_CACHE_TIMEOUT', 60))
+        return count
+
+    def get_paginated_response(self, data):
+        payload = {
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        }
+        if self.request.query_params.get(self.count_query_param) in ('1', 'true', 'True'):
+            payload['approximate_count'] = self.get_approximate_count()
+        return Response(payload)
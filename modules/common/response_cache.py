@@ -0,0 +1,199 @@
+import functools
+import hashlib
+import json
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.response import Response
+
+from modules.common.cache import get_versions, is_process_local, model_namespace
+
+
+STATS_KEY = 'response-cache:stats:{}:{}'
+LOCK_TIMEOUT = 10
+# Tiempo máximo que una petición espera a que otra rellene la misma entrada
+STAMPEDE_WAIT = 2.0
+STAMPEDE_POLL = 0.05
+
+
+class _PendingStats:
+    """
+    Contadores acumulados en el proceso y volcados a la caché compartida como
+    mucho cada RESPONSE_CACHE_STATS_INTERVAL segundos, con un incr por
+    contador: las peticiones no escriben en la caché para llevar la cuenta.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = Counter()
+        self._next_flush = 0.0
+
+    def add(self, name, outcome):
+        with self._lock:
+            self._counts[(name, outcome)] += 1
+            now = time.monotonic()
+            if now < self._next_flush:
+                return
+            self._next_flush = now + getattr(settings, 'RESPONSE_CACHE_STATS_INTERVAL', 10)
+        self.flush()
+
+    def flush(self):
+        with self._lock:
+            counts, self._counts = self._counts, Counter()
+        for (name, outcome), count in counts.items():
+            key = STATS_KEY.format(name, outcome)
+            cache.add(key, 0, timeout=None)
+            try:
+                cache.incr(key, count)
+            except ValueError:
+                cache.set(key, count, timeout=None)
+
+
+_pending_stats = _PendingStats()
+
+
+def record(name, outcome):
+    _pending_stats.add(name, outcome)
+
+
+def flush_stats():
+    _pending_stats.flush()
+
+
+def get_stats(name):
+    hits = cache.get(STATS_KEY.format(name, 'hit'), 0)
+    misses = cache.get(STATS_KEY.format(name, 'miss'), 0)
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': hits / total if total else 0.0,
+    }
+
+
+def reset_stats(name):
+    cache.delete_many([STATS_KEY.format(name, 'hit'), STATS_KEY.format(name, 'miss')])
+
+
+def _wait_for(key):
+    deadline = time.monotonic() + STAMPEDE_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(STAMPEDE_POLL)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry
+    return None
+
+
+def read_through(key, compute, name, timeout):
+    """
+    Devuelve la respuesta cacheada o la calcula. Sólo una petición calcula
+    cada clave (candado con cache.add); el resto espera a su resultado.
+    """
+    entry = cache.get(key)
+    lock_key = f"{key}:lock"
+    locked = False
+    if entry is None:
+        locked = cache.add(lock_key, 1, LOCK_TIMEOUT)
+        if not locked:
+            entry = _wait_for(key)
+
+    if entry is not None:
+        record(name, 'hit')
+        status_code, data = entry
+        return Response(data, status=status_code, headers={'X-Cache': 'HIT'})
+
+    try:
+        response = compute()
+        if response.status_code == 200:
+            cache.set(key, (response.status_code, response.data), timeout)
+    finally:
+        if locked:
+            cache.delete(lock_key)
+    record(name, 'miss')
+    response['X-Cache'] = 'MISS'
+    return response
+
+
+def cached_response(method):
+    """
+    Decorador para acciones GET de un viewset con CachedResponseMixin. Se
+    ejecuta dentro de la acción, es decir, ya autenticado y con los permisos
+    comprobados; las respuestas distintas de 200 no se guardan. Si una
+    subclase decora también su list() (para cachear lo que añade después de
+    super().list()), sólo cuenta el decorador más externo.
+    """
+    @functools.wraps(method)
+    def wrapper(self, request, *args, **kwargs):
+        if request.method != 'GET' or getattr(self, '_caching_response', False):
+            return method(self, request, *args, **kwargs)
+
+        def compute():
+            self._caching_response = True
+            try:
+                return method(self, request, *args, **kwargs)
+            finally:
+                self._caching_response = False
+
+        return read_through(
+            self.get_response_cache_key(request, kwargs),
+            compute,
+            self.response_cache_name(),
+            self.get_cache_timeout(),
+        )
+    return wrapper
+
+
+class CachedResponseMixin:
+    """
+    Cachea las respuestas GET de list y retrieve; otras acciones se cachean
+    con @cached_response. La clave combina la acción, sus argumentos, los
+    parámetros normalizados y la versión de cada modelo de `cache_models`;
+    las señales de guardado y borrado incrementan esas versiones, así que no
+    hace falta borrar claves.
+    """
+    cache_models = ()
+    cache_timeout = None
+
+    @classmethod
+    def response_cache_name(cls):
+        return cls.__name__
+
+    def get_cache_models(self):
+        return self.cache_models
+
+    def get_cache_timeout(self):
+        if self.cache_timeout is not None:
+            timeout = self.cache_timeout
+        else:
+            timeout = getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 60 * 60)
+        if is_process_local():
+            # Las versiones de otros procesos no llegan aquí: sólo el TTL acota
+            return min(timeout, getattr(settings, 'RESPONSE_CACHE_LOCAL_TIMEOUT', 30))
+        return timeout
+
+    def get_response_cache_key(self, request, kwargs):
+        versions = get_versions([model_namespace(model) for model in self.get_cache_models()])
+        params = sorted(
+            (key, sorted(values)) for key, values in request.query_params.lists()
+        )
+        raw = json.dumps([
+            request.get_host(),
+            self.action,
+            sorted((key, str(value)) for key, value in kwargs.items()),
+            params,
+            sorted(versions.items()),
+        ])
+        digest = hashlib.md5(raw.encode('utf-8')).hexdigest()
+        return f"response:{self.response_cache_name()}:{digest}"
+
+    @cached_response
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @cached_response
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
@@ -1,4 +1,98 @@
+from django.core.exceptions import FieldDoesNotExist
 from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.relations import ManyRelatedField, RelatedField
+
+
+def sparse_fieldset(request):
+    """
+    Campos pedidos con ?fields= (None si no se indica) y omitidos con ?omit=.
+    Sólo aplica a lecturas: en escrituras el serializer necesita todos sus campos.
+    """
+    if request is None or request.method not in SAFE_METHODS:
+        return None, set()
+
+    def names(param):
+        value = request.query_params.get(param, '')
+        return {name.strip() for name in value.split(',') if name.strip()}
+
+    return names('fields') or None, names('omit')
+
+
+def serializer_relations(fields, model=None):
+    """(select_related, prefetch_related) que necesitan los campos de un serializer."""
+    select = []
+    prefetch = []
+    for field in fields.values():
+        if field.source == '*':
+            continue
+        if '.' in field.source:
+            # source='cinema.name': basta con un JOIN si el primer tramo es una FK
+            name = field.source.split('.')[0]
+            try:
+                related = model._meta.get_field(name) if model else None
+            except FieldDoesNotExist:
+                related = None
+            if related is not None and related.concrete and (related.many_to_one or related.one_to_one):
+                if name not in select:
+                    select.append(name)
+            continue
+        if isinstance(field, ManyRelatedField) or isinstance(field, serializers.ListSerializer):
+            prefetch.append(field.source)
+        elif isinstance(field, (RelatedField, serializers.BaseSerializer)):
+            select.append(field.source)
+    return tuple(select), tuple(prefetch)
+
+
+def unused_columns(model, fields, keep=()):
+    """
+    Columnas del modelo que ningún campo del serializer lee, para defer().
+    Un campo con source='*' puede leer cualquier atributo: entonces no se
+    difiere nada.
+    """
+    sources = {field.source.split('.')[0] for field in fields.values()}
+    if '*' in sources:
+        return []
+    used = sources | set(keep)
+    return [
+        field.name for field in model._meta.concrete_fields
+        if not field.primary_key and not field.is_relation and field.name not in used
+    ]
+
+
+class EagerLoadingMixin:
+    """
+    Deduce select_related/prefetch_related a partir de las relaciones que
+    declara el serializer, para que la vista las aplique a su queryset.
+    Meta.select_related / Meta.prefetch_related permiten fijarlas a mano.
+    """
+
+    @classmethod
+    def get_eager_loading(cls, fields=None):
+        meta = getattr(cls, 'Meta', None)
+        if hasattr(meta, 'select_related') or hasattr(meta, 'prefetch_related'):
+            return (
+                tuple(getattr(meta, 'select_related', ())),
+                tuple(getattr(meta, 'prefetch_related', ())),
+            )
+        if fields is not None:
+            # Campos ya recortados con ?fields=/?omit=: sólo lo que se va a mostrar
+            return serializer_relations(fields, meta.model)
+
+        cached = cls.__dict__.get('_eager_loading')
+        if cached is None:
+            cached = serializer_relations(cls().fields, meta.model)
+            cls._eager_loading = cached
+        return cached
+
+    @classmethod
+    def setup_eager_loading(cls, queryset, fields=None):
+        select, prefetch = cls.get_eager_loading(fields)
+        if select:
+            queryset = queryset.select_related(*select)
+        if prefetch:
+            queryset = queryset.prefetch_related(*prefetch)
+        return queryset
 
 
 class AuditableSerializerMixin(serializers.ModelSerializer):
@@ -8,3 +102,20 @@ class AuditableSerializerMixin(serializers.ModelSerializer):
     updated_by = serializers.CharField(read_only=True)
     deleted_date = serializers.DateTimeField(read_only=True)
     deleted_by = serializers.CharField(read_only=True)
+
+    def get_fields(self):
+        fields = super().get_fields()
+
+        # Sólo el serializer raíz (o el hijo de una lista raíz) atiende ?fields=
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        if parent is not None:
+            return fields
+
+        requested, omitted = sparse_fieldset(self.context.get('request'))
+        if requested is not None:
+            fields = {name: field for name, field in fields.items() if name in requested}
+        for name in omitted:
+            fields.pop(name, None)
+        return fields
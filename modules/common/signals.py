@@ -0,0 +1,25 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from modules.common.models import AuditableMixins
+from modules.common.cache import bump_model_version
+
+
+def _is_auditable(model):
+    return isinstance(model, type) and issubclass(model, AuditableMixins)
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_saved_model(sender, **kwargs):
+    if _is_auditable(sender):
+        bump_model_version(sender)
+
+
+@receiver(m2m_changed)
+def invalidate_related_models(sender, instance, action, model, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    for related in {type(instance), model}:
+        if _is_auditable(related):
+            bump_model_version(related)
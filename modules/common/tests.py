@@ -1,3 +1,43 @@
+from unittest import mock
+
+from django.core.cache import cache
 from django.test import TestCase
 
-# Create your tests here.
+from modules.manager.models import User
+
+
+class EmailAdminLoginTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(email='admin@example.com', password='secret-pass')
+
+    def setUp(self):
+        cache.clear()
+
+    def login(self, password):
+        return self.client.post(
+            '/admin/login/?next=/admin/',
+            {'username': self.admin.email, 'password': password},
+        )
+
+    def test_admin_login_with_email(self):
+        response = self.login('secret-pass')
+
+        self.assertRedirects(response, '/admin/', fetch_redirect_response=False)
+        self.assertEqual(int(self.client.session['_auth_user_id']), self.admin.pk)
+
+    def test_admin_login_rejects_wrong_password(self):
+        response = self.login('wrong')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('_auth_user_id', self.client.session)
+
+    def test_blocked_account_is_refused_before_hashing(self):
+        with self.settings(AUTH_LOGIN_ACCOUNT_THRESHOLD=1):
+            self.login('wrong')
+            with mock.patch('modules.authentication.login.verify_password') as verify:
+                response = self.login('secret-pass')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('_auth_user_id', self.client.session)
+        verify.assert_not_called()
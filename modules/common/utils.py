@@ -1,5 +1,62 @@
+import threading
+
+from django.db import transaction
+
+
 def get_user_fullname(user):
     if not user or not user.is_authenticated:
         return None
     full_name = f"{user.first_name} {user.last_name}".strip()
     return full_name or user.username
+
+
+def delete_in_chunks(queryset, chunk_size=500):
+    """
+    Borra las filas del queryset con delete() sobre listas de pk acotadas:
+    mantiene cascadas y señales sin cargar todas las filas de una vez ni
+    superar el límite de parámetros de la base de datos.
+    """
+    pks = list(queryset.values_list('pk', flat=True))
+    manager = queryset.model._base_manager
+    deleted = 0
+    for start in range(0, len(pks), chunk_size):
+        count, _ = manager.filter(pk__in=pks[start:start + chunk_size]).delete()
+        deleted += count
+    return deleted
+
+
+class OnCommitBatch:
+    """
+    Acumula claves durante la transacción y las procesa juntas al confirmarla.
+    Cada add() registra su propio on_commit y así es Django quien decide qué
+    sobrevive al rollback de un savepoint: el primer callback que se ejecuta
+    procesa todo lo pendiente y los demás no hacen nada. Las claves de un
+    savepoint deshecho se procesan igualmente (sobra trabajo, nunca se pierde)
+    y fuera de una transacción se procesan en el acto.
+    """
+
+    def __init__(self, handler):
+        self.handler = handler
+        self._local = threading.local()
+
+    def _pending(self):
+        pending = getattr(self._local, 'pending', None)
+        if pending is None:
+            pending = self._local.pending = set()
+        return pending
+
+    def add(self, *keys):
+        if not keys:
+            return
+        pending = self._pending()
+        if not transaction.get_connection().in_atomic_block:
+            # Lo que quede es de una transacción deshecha: no hay nada que procesar
+            pending.clear()
+        pending.update(keys)
+        transaction.on_commit(self.flush)
+
+    def flush(self):
+        pending = self._pending()
+        if pending:
+            self._local.pending = set()
+            self.handler(pending)
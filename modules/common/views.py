@@ -4,6 +4,8 @@ from rest_framework import viewsets
 from rest_framework.response import Response
 from rest_framework import status
 
+from modules.common.serializer import sparse_fieldset, unused_columns
+
 
 def get_user_fullname(user):
     if not user or not user.is_authenticated:
@@ -12,7 +14,38 @@ def get_user_fullname(user):
     return full_name or user.username
 
 
-class BaseModelViewSet(viewsets.ModelViewSet):
+class EagerLoadingViewMixin:
+    """
+    Aplica al queryset las relaciones que declara el serializer de la acción.
+    Con ?fields=/?omit= sólo carga las relaciones y columnas que se muestran.
+    """
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        serializer_class = self.get_serializer_class()
+        eager = hasattr(serializer_class, 'setup_eager_loading')
+
+        requested, omitted = sparse_fieldset(self.request)
+        if requested is None and not omitted:
+            return serializer_class.setup_eager_loading(queryset) if eager else queryset
+
+        fields = serializer_class(context=self.get_serializer_context()).fields
+        if eager:
+            queryset = serializer_class.setup_eager_loading(queryset, fields)
+        return queryset.defer(
+            *unused_columns(queryset.model, fields, keep=self._ordering_sources())
+        )
+
+    def _ordering_sources(self):
+        # La paginación por keyset lee los campos de ordenación de cada fila
+        ordering = getattr(self, 'ordering', None) or ()
+        if isinstance(ordering, str):
+            ordering = [ordering]
+        names = list(ordering) + self.request.query_params.get('ordering', '').split(',')
+        return {name.strip().lstrip('-') for name in names if name.strip()}
+
+
+class BaseModelViewSet(EagerLoadingViewMixin, viewsets.ModelViewSet):
     def perform_create(self, serializer):
         request = self.request
         user = request.user
@@ -34,17 +67,8 @@ class BaseModelViewSet(viewsets.ModelViewSet):
             raise PermissionDenied("Usuario no autenticado")
 
     def perform_destroy(self, instance):
-        request = self.request
-        user = request.user
-
+        user = self.request.user
         if user.is_authenticated:
-            full_name = get_user_fullname(user)
-            instance.deleted_by = full_name
-            instance.deleted_date = timezone.now()
-            instance.is_active = False
-            instance.save()
+            instance.soft_delete(deleted_by=get_user_fullname(user))
         else:
-            instance.deleted_by = "Desconocido"
-            instance.deleted_date = timezone.now()
-            instance.is_active = False
-            instance.save()
+            instance.soft_delete(deleted_by="Desconocido")
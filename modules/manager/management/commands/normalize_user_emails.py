@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+from django.db.models.functions import Lower, Trim
+
+from modules.manager.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Pasa a minúsculas los emails guardados antes de normalizarlos. Los "
+        "que colisionan entre sí se listan y no se tocan: hay que fusionarlos "
+        "a mano antes de crear el índice único sobre LOWER(email)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        collisions = set(
+            User.objects.annotate(normalized=Lower(Trim('email')))
+            .values('normalized')
+            .annotate(total=Count('id'))
+            .filter(total__gt=1)
+            .values_list('normalized', flat=True)
+        )
+        for email in sorted(collisions):
+            accounts = User.objects.annotate(normalized=Lower(Trim('email'))).filter(
+                normalized=email
+            ).values_list('id', 'email')
+            self.stdout.write(self.style.WARNING(
+                f"Colisión {email}: " + ", ".join(f"#{pk} {value}" for pk, value in accounts)
+            ))
+
+        pending = User.objects.exclude(email=Lower(Trim('email'))).order_by('id')
+        updated = 0
+        last_id = 0
+        while True:
+            batch = [
+                (pk, email) for pk, email in
+                pending.filter(id__gt=last_id).values_list('id', 'email')[:options['batch_size']]
+            ]
+            if not batch:
+                break
+            last_id = batch[-1][0]
+            for pk, email in batch:
+                normalized = User.objects.normalize_email(email)
+                if normalized in collisions:
+                    continue
+                if not options['dry_run']:
+                    # update() no pasa por save(): no toca updated_date ni las señales
+                    User.objects.filter(pk=pk).update(email=normalized)
+                updated += 1
+
+        verb = "se normalizarían" if options['dry_run'] else "normalizados"
+        self.stdout.write(self.style.SUCCESS(
+            f"{updated} emails {verb}; {len(collisions)} colisiones pendientes."
+        ))
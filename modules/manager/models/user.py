@@ -1,6 +1,7 @@
 # apps/manager/models.py
 
 from django.db import models
+from django.db.models.functions import Lower
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.utils.translation import gettext_lazy as _
 from modules.common.models import AuditableMixins
@@ -9,6 +10,18 @@ from modules.common.models import AuditableMixins
 class UserManager(BaseUserManager):
     """Gestor personalizado para el modelo User usando email como USERNAME_FIELD"""
 
+    @classmethod
+    def normalize_email(cls, email):
+        # El email se guarda en minúsculas: la búsqueda sin distinguir
+        # mayúsculas es una igualdad sobre el índice único
+        return (email or "").strip().lower()
+
+    def get_by_natural_key(self, username):
+        return self.get(**{self.model.USERNAME_FIELD: self.normalize_email(username)})
+
+    def filter_by_email(self, email):
+        return self.filter(email=self.normalize_email(email))
+
     def create_user(self, email, password=None, **extra_fields):
         if not email:
             raise ValueError(
@@ -53,9 +66,17 @@ class User(AbstractUser, AuditableMixins):
 
     objects = UserManager()
 
-    class Meta:
+    class Meta(AuditableMixins.Meta):
         verbose_name = _("User")
         verbose_name_plural = _("Users")
+        constraints = [
+            # Impide en la base de datos duplicados que sólo difieran en mayúsculas
+            models.UniqueConstraint(Lower("email"), name="manager_user_email_lower_uniq"),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.email = UserManager.normalize_email(self.email)
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.get_full_name()} <{self.email}>"
@@ -42,6 +42,16 @@ class UserCreateSerializer(AuditableSerializerMixin, serializers.ModelSerializer
             "email": {"validators": [validate_email_address]},
         }
 
+    def validate_email(self, value):
+        email = User.objects.normalize_email(value)
+        duplicates = User.objects.filter_by_email(email)
+        if self.instance is not None:
+            duplicates = duplicates.exclude(pk=self.instance.pk)
+        if duplicates.exists():
+            raise serializers.ValidationError(
+                _(" A user with that email already exists."))
+        return email
+
     def validate(self, data):
         if "password" in data:
             validate_password_strength(
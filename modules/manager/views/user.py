@@ -23,6 +23,7 @@ class UserViewSet(BaseModelViewSet):
     queryset = User.objects.filter(is_active=True)
     serializer_class = UserListSerializer
     permission_classes = [IsAuthenticated]
+    ordering = ('id',)
 
     def get_serializer_class(self):
         if self.action in ["list", "retrieve"]:
@@ -247,8 +248,7 @@ class UserViewSet(BaseModelViewSet):
     )
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
-        instance.is_active = False
-        instance.save()
+        self.perform_destroy(instance)
         return Response(
             {"message": "User deleted successfully"}, status=status.HTTP_200_OK
         )
@@ -1,8 +1,9 @@
 from django.contrib import admin
+from modules.common.admin import SoftDeleteAdmin
 from modules.movies.models.movies import Movie, MovieCategory, Actor
 
 # Register your models here.
 
-admin.site.register(Movie)
-admin.site.register(MovieCategory)
-admin.site.register(Actor)
+admin.site.register(Movie, SoftDeleteAdmin)
+admin.site.register(MovieCategory, SoftDeleteAdmin)
+admin.site.register(Actor, SoftDeleteAdmin)
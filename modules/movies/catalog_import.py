@@ -0,0 +1,287 @@
+import csv
+import json
+import time
+from datetime import date
+
+from django.core.cache import cache
+from django.db import reset_queries, transaction
+
+from modules.common.cache import bump_model_version
+from modules.movies.models.movies import Actor, ActorNameSuffix, Movie, MovieCategory
+from modules.movies.recommendations import schedule_refresh
+from modules.movies.search.autocomplete import ACTOR, MOVIE, update_entry
+from modules.movies.search.text import normalize_name
+from modules.movies.search.engine import (
+    STATS_CACHE_KEY,
+    document_terms,
+    index_documents,
+    title_terms,
+)
+
+
+BATCH_SIZE = 1000
+MAX_ERRORS = 50
+# Separador de listas en las columnas categories/cast del CSV
+CSV_LIST_SEPARATOR = '|'
+TITLE_MAX_LENGTH = Movie._meta.get_field('title').max_length
+
+
+class ImportReport:
+    def __init__(self):
+        self.read = 0
+        self.created = 0
+        self.existing = 0
+        self.duplicated = 0
+        self.invalid = 0
+        self.errors = []
+        self.started = time.monotonic()
+        self.elapsed = 0.0
+
+    def error(self, line, message):
+        self.invalid += 1
+        if len(self.errors) < MAX_ERRORS:
+            self.errors.append({'line': line, 'error': message})
+
+    @property
+    def rate(self):
+        return self.read / self.elapsed if self.elapsed else 0.0
+
+    def as_dict(self):
+        return {
+            'read': self.read,
+            'created': self.created,
+            'existing': self.existing,
+            'duplicated': self.duplicated,
+            'invalid': self.invalid,
+            'errors': self.errors,
+            'elapsed_seconds': round(self.elapsed, 3),
+            'rows_per_second': round(self.rate, 1),
+        }
+
+
+def detect_format(filename):
+    if filename.lower().endswith('.csv'):
+        return 'csv'
+    if filename.lower().endswith(('.jsonl', '.ndjson')):
+        return 'jsonl'
+    return None
+
+
+def read_records(stream, fmt):
+    """Genera (línea, registro) de un flujo de texto JSONL o CSV sin cargarlo entero."""
+    if fmt == 'csv':
+        reader = csv.DictReader(stream)
+        for record in reader:
+            for field in ('categories', 'cast'):
+                record[field] = (record.get(field) or '').split(CSV_LIST_SEPARATOR)
+            yield reader.line_num, record
+    elif fmt == 'jsonl':
+        for line, text in enumerate(stream, 1):
+            if not text.strip():
+                continue
+            try:
+                record = json.loads(text)
+            except ValueError:
+                record = None
+            yield line, record
+    else:
+        raise ValueError(f"Formato no soportado: {fmt}")
+
+
+def _names(values):
+    if not isinstance(values, list):
+        raise ValueError("categories y cast deben ser listas de nombres")
+    names = []
+    for value in values:
+        name = str(value).strip()[:100]
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+def clean_record(record):
+    if not isinstance(record, dict):
+        raise ValueError("Registro inválido")
+    title = str(record.get('title') or '').strip()
+    if not title:
+        raise ValueError("El título es obligatorio")
+    if len(title) > TITLE_MAX_LENGTH:
+        raise ValueError(f"El título supera {TITLE_MAX_LENGTH} caracteres")
+    try:
+        release_date = date.fromisoformat(str(record.get('release_date') or '').strip())
+    except ValueError:
+        raise ValueError("Fecha de lanzamiento inválida")
+    return {
+        'title': title,
+        'description': str(record.get('description') or ''),
+        'release_date': release_date,
+        'categories': _names(record.get('categories') or []),
+        'cast': _names(record.get('cast') or []),
+    }
+
+
+def _new(model, name, created_by):
+    instance = model(name=name, created_by=created_by)
+    # bulk_create no pasa por save(): se rellena aquí el nombre normalizado
+    if hasattr(instance, 'search_name'):
+        instance.search_name = normalize_name(name)[:100]
+    return instance
+
+
+def _resolve(model, names, created_by):
+    """Devuelve {nombre: id}, creando en bloque los que faltan."""
+    if not names:
+        return {}
+    ids = {}
+    for pk, name in model.all_objects.filter(name__in=names).order_by('-id').values_list('id', 'name'):
+        ids[name] = pk
+    missing = [name for name in names if name not in ids]
+    if missing:
+        model.objects.bulk_create(
+            [_new(model, name, created_by) for name in missing],
+            batch_size=BATCH_SIZE,
+        )
+        created = model.all_objects.filter(name__in=missing).order_by('-id')
+        for pk, name in created.values_list('id', 'name'):
+            ids[name] = pk
+        if model is Actor:
+            ActorNameSuffix.rebuild(created.values_list('id', 'search_name'))
+    return ids
+
+
+class CatalogImporter:
+    """
+    Importa el catálogo por lotes: cada lote resuelve categorías y actores con
+    una consulta por tabla, inserta películas y filas M2M con bulk_create y se
+    indexa para la búsqueda. Como bulk_create no emite señales, cada lote
+    programa por su cuenta el autocompletado, las recomendaciones y la
+    invalidación de cachés. La memoria depende del tamaño del lote, no del
+    fichero.
+    """
+
+    def __init__(self, batch_size=BATCH_SIZE, created_by=None):
+        self.batch_size = batch_size
+        self.created_by = created_by
+        self.report = ImportReport()
+        # Las categorías son pocas: se recuerdan entre lotes
+        self.categories = {}
+
+    def run(self, records):
+        batch = {}
+        for line, record in records:
+            self.report.read += 1
+            try:
+                movie = clean_record(record)
+            except ValueError as exc:
+                self.report.error(line, str(exc))
+                continue
+
+            if movie['title'] in batch:
+                self.report.duplicated += 1
+                continue
+            batch[movie['title']] = movie
+            if len(batch) >= self.batch_size:
+                self.flush(batch)
+                batch = {}
+                # Con DEBUG activo Django guarda cada consulta; se vacía por lote
+                reset_queries()
+
+        self.flush(batch)
+        self.report.elapsed = time.monotonic() - self.report.started
+        return self.report
+
+    def flush(self, batch):
+        if not batch:
+            return
+
+        existing = set(
+            Movie.all_objects.filter(title__in=list(batch)).values_list('title', flat=True)
+        )
+        self.report.existing += len(existing)
+        movies = [movie for title, movie in batch.items() if title not in existing]
+        if not movies:
+            return
+
+        with transaction.atomic():
+            category_names = {name for movie in movies for name in movie['categories']}
+            unknown = [name for name in category_names if name not in self.categories]
+            self.categories.update(_resolve(MovieCategory, unknown, self.created_by))
+            actors = _resolve(
+                Actor,
+                list({name for movie in movies for name in movie['cast']}),
+                self.created_by,
+            )
+
+            Movie.objects.bulk_create(
+                [
+                    Movie(
+                        title=movie['title'],
+                        description=movie['description'],
+                        release_date=movie['release_date'],
+                        created_by=self.created_by,
+                    )
+                    for movie in movies
+                ],
+                batch_size=self.batch_size,
+            )
+            movie_ids = dict(
+                Movie.all_objects.filter(
+                    title__in=[movie['title'] for movie in movies]
+                ).values_list('title', 'id')
+            )
+
+            Movie.categories.through.objects.bulk_create(
+                [
+                    Movie.categories.through(
+                        movie_id=movie_ids[movie['title']],
+                        moviecategory_id=self.categories[name],
+                    )
+                    for movie in movies for name in movie['categories']
+                ],
+                batch_size=self.batch_size,
+            )
+            Movie.cast.through.objects.bulk_create(
+                [
+                    Movie.cast.through(
+                        movie_id=movie_ids[movie['title']], actor_id=actors[name]
+                    )
+                    for movie in movies for name in movie['cast']
+                ],
+                batch_size=self.batch_size,
+            )
+            # bulk_create no emite señales: se indexa el lote con los datos ya leídos
+            index_documents(
+                list(movie_ids.values()),
+                (
+                    (
+                        movie_ids[movie['title']],
+                        document_terms(
+                            movie['title'], movie['description'],
+                            movie['categories'], movie['cast'],
+                        ),
+                        title_terms(movie['title']),
+                    )
+                    for movie in movies
+                ),
+            )
+            # Lo que harían las señales por fila, una vez por lote
+            schedule_refresh(*movie_ids.values())
+            for title, movie_id in movie_ids.items():
+                update_entry(MOVIE, movie_id, title)
+            for name, actor_id in actors.items():
+                update_entry(ACTOR, actor_id, name)
+            transaction.on_commit(self.committed)
+
+        self.report.created += len(movies)
+
+    def committed(self):
+        # Cada lote confirmado invalida las respuestas cacheadas y las
+        # estadísticas de búsqueda, sin esperar al final de la importación
+        for model in (Movie, MovieCategory, Actor):
+            bump_model_version(model)
+        cache.delete(STATS_CACHE_KEY)
+
+
+def import_catalog(stream, fmt, batch_size=BATCH_SIZE, created_by=None):
+    importer = CatalogImporter(batch_size=batch_size, created_by=created_by)
+    return importer.run(read_records(stream, fmt))
@@ -0,0 +1,40 @@
+from django.db.models import Count
+from django.db.models.functions import ExtractYear
+
+from modules.movies.models.movies import Movie
+
+
+def movie_facets(queryset):
+    """
+    Conteos por categoría y por año de estreno para el conjunto filtrado.
+    Cada faceta es una única consulta agrupada sobre la subconsulta de ids.
+    """
+    movie_ids = queryset.order_by().values('id')
+
+    categories = Movie.categories.through.objects.filter(
+        movie_id__in=movie_ids,
+        moviecategory__is_active=True,
+    ).values(
+        'moviecategory_id', 'moviecategory__name'
+    ).annotate(
+        count=Count('movie_id')
+    ).order_by('-count', 'moviecategory__name')
+
+    years = queryset.order_by().annotate(
+        year=ExtractYear('release_date')
+    ).values('year').annotate(count=Count('id')).order_by('-year')
+
+    return {
+        'categories': [
+            {
+                'id': row['moviecategory_id'],
+                'name': row['moviecategory__name'],
+                'count': row['count'],
+            }
+            for row in categories
+        ],
+        'release_years': [
+            {'year': row['year'], 'count': row['count']}
+            for row in years
+        ],
+    }
@@ -1,7 +1,9 @@
 import django_filters
-from rest_framework.exceptions import APIException, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import APIException
 from rest_framework import status
-from movies.models import Actor
+from movies.models import Actor, ActorNameSuffix
+from modules.movies.search.text import normalize_name, prefix_range
 
 
 class CustomValidationAPIError(APIException):
@@ -15,54 +17,35 @@ class CustomValidationAPIError(APIException):
 
 
 class ActorFilter(django_filters.FilterSet):
-    name = django_filters.CharFilter(
-        field_name='name', lookup_expr='icontains'
-    )
+    """
+    Busca sobre el nombre normalizado (sin acentos ni mayúsculas) y compone
+    los filtros en una única consulta, sin comprobaciones de existencia.
+    """
+    name = django_filters.CharFilter(method='filter_name')
     birth_date = django_filters.DateFilter(
-        field_name='birth_date', lookup_expr='exact'
+        field_name='birth_date', lookup_expr='exact',
+        error_messages={'invalid': "Fecha inválida. Use el formato YYYY-MM-DD."}
     )
 
     class Meta:
         model = Actor
         fields = ['name', 'birth_date']
 
+    def filter_name(self, queryset, name, value):
+        # Prefijo del nombre completo o de cualquier otra palabra; las dos
+        # búsquedas son rangos sobre columnas indexadas
+        start, end = prefix_range(normalize_name(value))
+        suffixes = ActorNameSuffix.objects.filter(
+            suffix__gte=start, suffix__lt=end
+        ).values('actor_id')
+        return queryset.filter(
+            Q(search_name__gte=start, search_name__lt=end) | Q(id__in=suffixes)
+        )
+
     def filter_queryset(self, queryset):
-        # Obtener los valores de los filtros desde `data`
         name = self.data.get('name')
-        birth_date = self.data.get('birth_date')
-
-        # Validación para 'name'
-        if name is not None:
-            name = name.strip()
-            if not name:
-                raise CustomValidationAPIError({
-                    "name": ["El nombre no puede estar vacío si se proporciona."]
-                })
-
-            # Filtrar manualmente y validar resultados
-            queryset = queryset.filter(name__icontains=name)
-            if not queryset.exists():
-                raise CustomValidationAPIError({
-                    "name": [f"No se encontró ningún actor con el nombre '{name}'."]
-                })
-
-        # Validación para 'birth_date'
-        if birth_date:
-            try:
-                # Intentar parsear la fecha usando el formato correcto
-                from datetime import datetime
-                datetime.strptime(birth_date, '%Y-%m-%d')
-            except ValueError:
-                raise CustomValidationAPIError({
-                    "birth_date": ["Fecha inválida. Use el formato YYYY-MM-DD."]
-                })
-
-            # Aplicar filtro por fecha
-            queryset = queryset.filter(birth_date=birth_date)
-
-            if not queryset.exists():
-                raise CustomValidationAPIError({
-                    "birth_date": [f"No se encontró ningún actor nacido el {birth_date}."]
-                })
-
+        if name is not None and not normalize_name(name):
+            raise CustomValidationAPIError({
+                "name": ["El nombre no puede estar vacío si se proporciona."]
+            })
         return super().filter_queryset(queryset)
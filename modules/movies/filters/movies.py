@@ -1,7 +1,10 @@
 import django_filters
-from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.exceptions import APIException
 from rest_framework import status
-from movies.models import Movie, MovieCategory, Actor
+from movies.models import Movie, MovieSearchTerm
+from modules.common.filters import IdListFilter, filter_having_all
+from modules.movies.search.engine import MAX_TERM_LENGTH
+from modules.movies.search.text import prefix_range, tokenize
 
 
 class CustomValidationAPIError(APIException):
@@ -15,101 +18,57 @@ class CustomValidationAPIError(APIException):
 
 
 class MovieFilter(django_filters.FilterSet):
-    title = django_filters.CharFilter(
-        field_name='title', lookup_expr='icontains'
-    )
+    """
+    Los parámetros se validan sólo por formato (sin consultas de existencia)
+    y todos los filtros se componen en una única consulta.
+    """
+    title = django_filters.CharFilter(method='filter_title')
     release_date = django_filters.DateFilter(
-        field_name='release_date', lookup_expr='exact'
+        field_name='release_date', lookup_expr='exact',
+        error_messages={'invalid': "Fecha inválida. Use el formato YYYY-MM-DD."}
     )
-    categories = django_filters.ModelMultipleChoiceFilter(
-        field_name='categories',
-        queryset=MovieCategory.objects.all(),
-        conjoined=True
+    categories = IdListFilter(
+        method='filter_categories',
+        error_messages={'invalid': "Las categorías deben ser IDs válidos."}
     )
-    cast = django_filters.ModelMultipleChoiceFilter(
-        field_name='cast',
-        queryset=Actor.objects.all(),
-        conjoined=True
+    cast = IdListFilter(
+        method='filter_cast',
+        error_messages={'invalid': "Los actores deben ser IDs válidos."}
     )
 
     class Meta:
         model = Movie
         fields = ['title', 'release_date', 'categories', 'cast']
 
-    def filter_queryset(self, queryset):
-        data = self.data
-
-        # Validación del título
-        title = data.get('title')
-        if title is not None:
-            title = title.strip()
-            if not title:
-                raise CustomValidationAPIError({
-                    "title": ["El título no puede estar vacío si se proporciona."]
-                })
-
-            queryset = queryset.filter(title__icontains=title)
-            if not queryset.exists():
-                raise CustomValidationAPIError({
-                    "title": [f"No se encontró ninguna película con el título '{title}'."]
-                })
-
-        # Validación de la fecha
-        release_date = data.get('release_date')
-        if release_date:
-            try:
-                from datetime import datetime
-                datetime.strptime(release_date, '%Y-%m-%d')
-            except ValueError:
-                raise CustomValidationAPIError({
-                    "release_date": ["Fecha inválida. Use el formato YYYY-MM-DD."]
-                })
-
-            queryset = queryset.filter(release_date=release_date)
-            if not queryset.exists():
-                raise CustomValidationAPIError({
-                    "release_date": [f"No se encontró ninguna película lanzada el {release_date}."]
-                })
-
-        # Validación de categorías
-        category_ids = data.getlist('categories')
-        if category_ids:
-            try:
-                category_ids = [int(cid) for cid in category_ids]
-            except (ValueError, TypeError):
-                raise CustomValidationAPIError({
-                    "categories": ["Las categorías deben ser IDs válidos."]
-                })
-
-            existing_categories = list(MovieCategory.objects.filter(
-                id__in=category_ids).values_list('id', flat=True))
-            if len(existing_categories) != len(category_ids):
-                missing = set(category_ids) - set(existing_categories)
-                raise CustomValidationAPIError({
-                    "categories": [f"Las siguientes categorías no existen: {', '.join(map(str, missing))}."]
-                })
-
-            queryset = queryset.filter(
-                categories__id__in=category_ids).distinct()
-
-        # Validación del elenco (actores)
-        actor_ids = data.getlist('cast')
-        if actor_ids:
-            try:
-                actor_ids = [int(aid) for aid in actor_ids]
-            except (ValueError, TypeError):
-                raise CustomValidationAPIError({
-                    "cast": ["Los actores deben ser IDs válidos."]
-                })
-
-            existing_actors = list(Actor.objects.filter(
-                id__in=actor_ids).values_list('id', flat=True))
-            if len(existing_actors) != len(actor_ids):
-                missing = set(actor_ids) - set(existing_actors)
-                raise CustomValidationAPIError({
-                    "cast": [f"Los siguientes actores no existen: {', '.join(map(str, missing))}."]
-                })
-
-            queryset = queryset.filter(cast__id__in=actor_ids).distinct()
+    def filter_title(self, queryset, name, value):
+        # Cada palabra de la consulta debe ser prefijo de una palabra del
+        # título: rangos sobre los términos de título del índice de búsqueda
+        # en lugar de un icontains que recorre la tabla
+        tokens = tokenize(value)
+        if not tokens:
+            # Sólo palabras vacías, que no se indexan
+            return queryset.filter(title__icontains=value.strip())
+        for token in tokens:
+            start, end = prefix_range(token[:MAX_TERM_LENGTH])
+            queryset = queryset.filter(id__in=MovieSearchTerm.objects.filter(
+                in_title=True, term__gte=start, term__lt=end
+            ).values('movie_id'))
+        return queryset
+
+    def filter_categories(self, queryset, name, value):
+        return filter_having_all(
+            queryset, Movie.categories.through, 'movie_id', 'moviecategory_id', value
+        )
+
+    def filter_cast(self, queryset, name, value):
+        return filter_having_all(
+            queryset, Movie.cast.through, 'movie_id', 'actor_id', value
+        )
 
+    def filter_queryset(self, queryset):
+        title = self.data.get('title')
+        if title is not None and not title.strip():
+            raise CustomValidationAPIError({
+                "title": ["El título no puede estar vacío si se proporciona."]
+            })
         return super().filter_queryset(queryset)
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from modules.movies.models.movies import Actor, ActorNameSuffix
+from modules.movies.search.text import normalize_name
+
+
+class Command(BaseCommand):
+    help = "Rellena el nombre normalizado de búsqueda y sus sufijos para los actores existentes."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        updated = 0
+        batch = []
+        names = []
+        for actor in Actor.all_objects.only('id', 'name', 'search_name').iterator(chunk_size=batch_size):
+            search_name = normalize_name(actor.name)[:100]
+            if actor.search_name != search_name:
+                actor.search_name = search_name
+                batch.append(actor)
+            names.append((actor.pk, search_name))
+            if len(names) >= batch_size:
+                updated += Actor.all_objects.bulk_update(batch, ['search_name'])
+                ActorNameSuffix.rebuild(names)
+                batch, names = [], []
+        updated += Actor.all_objects.bulk_update(batch, ['search_name'])
+        ActorNameSuffix.rebuild(names)
+        self.stdout.write(self.style.SUCCESS(f"{updated} actores actualizados."))
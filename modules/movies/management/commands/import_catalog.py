@@ -0,0 +1,48 @@
+import io
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from modules.movies.catalog_import import BATCH_SIZE, detect_format, import_catalog
+
+
+class Command(BaseCommand):
+    help = "Importa un catálogo de películas desde un fichero JSONL o CSV (- para stdin)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=['jsonl', 'csv'])
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument('--created-by', default='import_catalog')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or detect_format(path)
+        if fmt is None:
+            raise CommandError("No se reconoce el formato; usa --format jsonl|csv")
+
+        if path == '-':
+            stream = io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8', newline='')
+            report = self._import(stream, fmt, options)
+        else:
+            try:
+                with open(path, encoding='utf-8', newline='') as stream:
+                    report = self._import(stream, fmt, options)
+            except OSError as exc:
+                raise CommandError(str(exc))
+
+        for error in report.errors:
+            self.stderr.write(f"Línea {error['line']}: {error['error']}")
+        self.stdout.write(self.style.SUCCESS(
+            f"{report.read} registros leídos, {report.created} películas creadas, "
+            f"{report.existing} ya existían, {report.duplicated} duplicadas, "
+            f"{report.invalid} inválidas en {report.elapsed:.1f}s "
+            f"({report.rate:.0f} registros/s)."
+        ))
+
+    def _import(self, stream, fmt, options):
+        return import_catalog(
+            stream, fmt,
+            batch_size=options['batch_size'],
+            created_by=options['created_by'],
+        )
@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from modules.movies.recommendations import process_refresh_queue
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula las recomendaciones de las películas encoladas por las señales. "
+        "Con --loop se queda en marcha como worker."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--loop', action='store_true',
+                            help="No termina: vuelve a mirar cada --interval segundos.")
+        parser.add_argument('--interval', type=float, default=5)
+
+    def handle(self, *args, **options):
+        while True:
+            processed = process_refresh_queue(batch_size=options['batch_size'])
+            if processed:
+                self.stdout.write(f"Recomendaciones recalculadas para {processed} películas.")
+            if not options['loop']:
+                break
+            if not processed:
+                time.sleep(options['interval'])
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from modules.movies.recommendations import NEIGHBOURS, rebuild_recommendations
+
+
+class Command(BaseCommand):
+    help = "Precalcula los vecinos más similares de cada película."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--neighbours', type=int, default=NEIGHBOURS)
+
+    def handle(self, *args, **options):
+        total = rebuild_recommendations(
+            batch_size=options['batch_size'], k=options['neighbours']
+        )
+        self.stdout.write(self.style.SUCCESS(f"Recomendaciones calculadas para {total} películas."))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from modules.movies.search.engine import rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Reconstruye el índice invertido de búsqueda de películas."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        total = rebuild_index(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"{total} películas indexadas."))
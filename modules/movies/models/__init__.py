@@ -1 +1,3 @@
-from modules.movies.models.movies import MovieCategory, Movie, Actor
+from modules.movies.models.movies import MovieCategory, Movie, Actor, ActorNameSuffix
+from modules.movies.models.search import MovieSearchDocument, MovieSearchTerm
+from modules.movies.models.recommendation import MovieRecommendation, RecommendationRefresh
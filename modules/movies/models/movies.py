@@ -1,6 +1,7 @@
 from django.db import models
+from django.db.models import Q
 from django.utils.translation import gettext_lazy as _
-from common.models import AuditableMixins
+from modules.common.models import AuditableMixins
 
 
 class MovieCategory(AuditableMixins):
@@ -8,7 +9,7 @@ class MovieCategory(AuditableMixins):
     description = models.TextField(blank=True, verbose_name=_('Description'))
     is_active = models.BooleanField(default=True, verbose_name=_('Is Active'))
 
-    class Meta:
+    class Meta(AuditableMixins.Meta):
         verbose_name = _('Movie Category')
         verbose_name_plural = _('Movie Categories')
 
@@ -18,18 +19,69 @@ class MovieCategory(AuditableMixins):
 
 class Actor(AuditableMixins):
     name = models.CharField(max_length=100, verbose_name=_('Full Name'))
+    # Nombre sin acentos ni mayúsculas; indexado para la búsqueda por prefijo
+    search_name = models.CharField(
+        max_length=100, blank=True, db_index=True, editable=False,
+        verbose_name=_('Search Name'))
     biography = models.TextField(blank=True, verbose_name=_('Biography'))
     birth_date = models.DateField(
         null=True, blank=True, verbose_name=_('Birth Date'))
     is_active = models.BooleanField(default=True)
 
-    class Meta:
+    class Meta(AuditableMixins.Meta):
         verbose_name = _('Actor')
         verbose_name_plural = _('Actors')
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        from modules.movies.search.text import normalize_name
+        self.search_name = normalize_name(self.name)[:100]
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'name' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'search_name'}
+        super().save(*args, **kwargs)
+        if update_fields is None or 'name' in update_fields:
+            ActorNameSuffix.rebuild([(self.pk, self.search_name)])
+
+
+class ActorNameSuffix(models.Model):
+    """
+    Restos del nombre normalizado a partir de cada palabra salvo la primera
+    ('penelope cruz sanchez' -> 'cruz sanchez', 'sanchez'). Buscar por
+    prefijo aquí equivale a buscar desde cualquier palabra del nombre y, a
+    diferencia de un contains, usa el índice.
+    """
+    actor = models.ForeignKey(
+        Actor,
+        on_delete=models.CASCADE,
+        related_name='name_suffixes'
+    )
+    suffix = models.CharField(_('Suffix'), max_length=100, db_index=True)
+
+    class Meta:
+        verbose_name = _('Actor Name Suffix')
+        verbose_name_plural = _('Actor Name Suffixes')
+
+    @classmethod
+    def rebuild(cls, actors):
+        """Sustituye los sufijos de los actores dados como pares (id, search_name)."""
+        actors = list(actors)
+        if not actors:
+            return
+        cls.objects.filter(actor_id__in=[pk for pk, _name in actors]).delete()
+        cls.objects.bulk_create([
+            cls(actor_id=pk, suffix=suffix)
+            for pk, search_name in actors
+            for suffix in name_suffixes(search_name)
+        ], batch_size=1000)
+
+
+def name_suffixes(search_name):
+    words = search_name.split(' ')
+    return [' '.join(words[i:]) for i in range(1, len(words))]
+
 
 class Movie(AuditableMixins):
     title = models.CharField(max_length=200, verbose_name=_('Title'))
@@ -47,10 +99,17 @@ class Movie(AuditableMixins):
     )
     is_active = models.BooleanField(default=True, verbose_name=_('Is Active'))
 
-    class Meta:
+    class Meta(AuditableMixins.Meta):
         verbose_name = _('Movie')
         verbose_name_plural = _('Movies')
         ordering = ['-release_date']
+        indexes = [
+            models.Index(
+                fields=['-release_date', '-id'],
+                condition=Q(is_active=True),
+                name='movie_active_release_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.title
@@ -0,0 +1,55 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+from modules.movies.models.movies import Movie
+
+
+class MovieRecommendation(models.Model):
+    """
+    Vecino precalculado de una película (top-k por similitud). Se sirve con
+    una sola consulta por (movie, rank).
+    """
+    movie = models.ForeignKey(
+        Movie,
+        on_delete=models.CASCADE,
+        related_name='recommendations'
+    )
+    similar = models.ForeignKey(
+        Movie,
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    rank = models.PositiveSmallIntegerField(_('Rank'))
+    score = models.FloatField(_('Score'))
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = _('Movie Recommendation')
+        verbose_name_plural = _('Movie Recommendations')
+        unique_together = ('movie', 'similar')
+        indexes = [
+            models.Index(fields=['movie', 'rank'], name='movie_rec_rank_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.movie_id} -> {self.similar_id} ({self.score:.3f})"
+
+
+class RecommendationRefresh(models.Model):
+    """
+    Cola de películas cuyos vecinos hay que recalcular. La escriben las
+    señales y la vacía el worker process_recommendation_queue.
+    """
+    movie = models.OneToOneField(
+        Movie,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='+'
+    )
+    requested_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = _('Recommendation Refresh')
+        verbose_name_plural = _('Recommendation Refreshes')
+        indexes = [
+            models.Index(fields=['requested_at'], name='movie_rec_refresh_idx'),
+        ]
@@ -0,0 +1,55 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+from modules.movies.models.movies import Movie
+
+
+class MovieSearchDocument(models.Model):
+    """
+    Documento indexado por película: guarda la longitud ponderada que usa
+    BM25 para normalizar por tamaño.
+    """
+    movie = models.OneToOneField(
+        Movie,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='search_document'
+    )
+    length = models.PositiveIntegerField(_('Length'), default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = _('Movie Search Document')
+        verbose_name_plural = _('Movie Search Documents')
+
+
+class MovieSearchTerm(models.Model):
+    """
+    Entrada del índice invertido: término -> película con su frecuencia
+    ponderada. La longitud del documento se copia para puntuar sin JOIN.
+    `impact` es la parte de BM25 que depende del documento, calculada al
+    indexar: ordena las entradas de cada término para leer sólo las mejores.
+    `in_title` marca los términos del título, que usa el filtro por título.
+    """
+    term = models.CharField(_('Term'), max_length=64)
+    movie = models.ForeignKey(
+        Movie,
+        on_delete=models.CASCADE,
+        related_name='search_terms'
+    )
+    frequency = models.PositiveIntegerField(_('Frequency'), default=0)
+    document_length = models.PositiveIntegerField(_('Document Length'), default=0)
+    impact = models.FloatField(_('Impact'), default=0)
+    in_title = models.BooleanField(_('In Title'), default=False)
+
+    class Meta:
+        verbose_name = _('Movie Search Term')
+        verbose_name_plural = _('Movie Search Terms')
+        unique_together = ('term', 'movie')
+        indexes = [
+            models.Index(fields=['term', '-impact'], name='search_term_impact_idx'),
+            models.Index(
+                fields=['term', 'movie'],
+                condition=models.Q(in_title=True),
+                name='search_term_title_idx',
+            ),
+        ]
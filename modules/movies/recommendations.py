@@ -0,0 +1,340 @@
+import heapq
+import math
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from modules.movies.models.movies import Movie
+from modules.movies.models.recommendation import MovieRecommendation, RecommendationRefresh
+
+
+# Tipo de rasgo -> (tabla intermedia, columna del rasgo, peso)
+FEATURES = {
+    'category': (Movie.categories.through, 'moviecategory_id', 1.0),
+    'cast': (Movie.cast.through, 'actor_id', 1.5),
+}
+
+CONTENT_WEIGHT = 0.6
+BEHAVIOUR_WEIGHT = 0.4
+NEIGHBOURS = 20
+HISTORY_SIZE = 10
+# Candidatos que aporta como mucho un rasgo muy común (p. ej. la categoría Drama)
+MAX_FEATURE_CANDIDATES = 200
+# Máximo de ids por cláusula IN (SQLite admite 999 parámetros por consulta)
+CHUNK_SIZE = 500
+
+
+def _chunks(ids, size=CHUNK_SIZE):
+    ids = sorted(ids)
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+class ViewingSource:
+    """
+    Historial de visionado para la parte de comportamiento. Las reservas
+    viven en la app services, que depende de movies: es ella la que registra
+    su implementación (register_viewing_source) en lugar de importarla aquí.
+    Sin fuente registrada sólo se usa la similitud de contenido.
+    """
+
+    def viewings(self, movie_ids=None, user_ids=None):
+        """Pares distintos (user_id, movie_id)."""
+        return []
+
+    def watched(self, user):
+        """ids de las películas vistas por el usuario, de la más reciente a la más antigua."""
+        return []
+
+
+_viewing_source = ViewingSource()
+
+
+def register_viewing_source(source):
+    global _viewing_source
+    _viewing_source = source
+
+
+def _feature_rows(movie_ids=None, features=None):
+    """
+    Pares (movie_id, rasgo) de películas activas, donde cada rasgo es
+    ('category', id) o ('cast', id): las filas de la matriz dispersa.
+    Las listas de ids se consultan por tramos de CHUNK_SIZE.
+    """
+    for kind, (through, column, _weight) in FEATURES.items():
+        rows = through.objects.filter(movie__is_active=True)
+        if movie_ids is not None:
+            filters = [{'movie_id__in': chunk} for chunk in _chunks(movie_ids)]
+        elif features is not None:
+            pks = [pk for k, pk in features if k == kind]
+            filters = [{f"{column}__in": chunk} for chunk in _chunks(pks)]
+        else:
+            filters = [{}]
+        for lookup in filters:
+            for movie_id, pk in rows.filter(**lookup).values_list('movie_id', column).iterator():
+                yield movie_id, (kind, pk)
+
+
+def _document_frequency(features):
+    frequency = {}
+    for kind, (through, column, _weight) in FEATURES.items():
+        pks = [pk for k, pk in features if k == kind]
+        for chunk in _chunks(pks):
+            rows = through.objects.filter(
+                movie__is_active=True, **{f"{column}__in": chunk}
+            ).values(column).annotate(movies=Count('movie_id'))
+            frequency.update({(kind, row[column]): row['movies'] for row in rows})
+    return frequency
+
+
+def _postings(features):
+    """
+    {rasgo: [movie_id]} para generar candidatos. Un rasgo muy común aportaría
+    casi todo el catálogo y el lote sería O(n²): de los que superan
+    MAX_FEATURE_CANDIDATES películas sólo se toman las más recientes. Aporta
+    poco, además: su idf es bajo.
+    """
+    frequency = _document_frequency(features)
+    common = {feature for feature in features if frequency.get(feature, 0) > MAX_FEATURE_CANDIDATES}
+
+    postings = defaultdict(list)
+    for movie_id, feature in _feature_rows(features=features - common):
+        postings[feature].append(movie_id)
+    for kind, pk in common:
+        through, column, _weight = FEATURES[kind]
+        postings[(kind, pk)] = list(
+            through.objects.filter(movie__is_active=True, **{column: pk})
+            .order_by('-movie_id').values_list('movie_id', flat=True)[:MAX_FEATURE_CANDIDATES]
+        )
+    return postings
+
+
+def content_similarities(movie_ids):
+    """
+    {movie_id: {candidato: coseno}} sobre vectores TF-IDF de categorías y
+    reparto. Sólo se visitan las películas que comparten algún rasgo, como
+    en el producto disperso A·Aᵀ restringido a las filas pedidas, con un
+    máximo de candidatos por rasgo (_postings). El coseno de cada candidato
+    es exacto: se calcula con todos sus rasgos.
+    """
+    target_features = defaultdict(set)
+    for movie_id, feature in _feature_rows(movie_ids=movie_ids):
+        target_features[movie_id].add(feature)
+    if not target_features:
+        return {}
+
+    postings = _postings(set().union(*target_features.values()))
+
+    features_of = defaultdict(set, {movie_id: set(f) for movie_id, f in target_features.items()})
+    candidates = {movie_id for movies in postings.values() for movie_id in movies}
+    for movie_id, feature in _feature_rows(movie_ids=candidates - set(target_features)):
+        features_of[movie_id].add(feature)
+
+    total = Movie.objects.count()
+    frequency = _document_frequency(set().union(*features_of.values()))
+    weights = {
+        feature: FEATURES[feature[0]][2] * math.log(1 + total / frequency.get(feature, 1))
+        for feature in frequency
+    }
+    norms = {
+        movie_id: math.sqrt(sum(weights.get(feature, 0) ** 2 for feature in features))
+        for movie_id, features in features_of.items()
+    }
+
+    similarities = {}
+    for target, features in target_features.items():
+        found = {movie_id for feature in features for movie_id in postings[feature]}
+        found.discard(target)
+        scores = {}
+        for movie_id in found:
+            if not (norms[target] and norms[movie_id]):
+                continue
+            dot = sum(weights.get(feature, 0) ** 2 for feature in features & features_of[movie_id])
+            scores[movie_id] = dot / (norms[target] * norms[movie_id])
+        similarities[target] = scores
+    return similarities
+
+
+def _viewings(movie_ids=None, user_ids=None):
+    if movie_ids is not None:
+        for chunk in _chunks(movie_ids):
+            yield from _viewing_source.viewings(movie_ids=chunk)
+    else:
+        for chunk in _chunks(user_ids):
+            yield from _viewing_source.viewings(user_ids=chunk)
+
+
+def behaviour_similarities(movie_ids):
+    """
+    {movie_id: {candidato: coseno}} sobre la matriz binaria usuario x película:
+    co-reservas / sqrt(público de cada película).
+    """
+    watchers = defaultdict(set)
+    for user_id, movie_id in _viewings(movie_ids=movie_ids):
+        watchers[movie_id].add(user_id)
+    if not watchers:
+        return {}
+
+    history = defaultdict(set)
+    for user_id, movie_id in _viewings(user_ids=set().union(*watchers.values())):
+        history[user_id].add(movie_id)
+
+    candidates = set().union(*history.values())
+    audience = Counter(movie_id for _user_id, movie_id in _viewings(movie_ids=candidates))
+
+    similarities = {}
+    for target, users in watchers.items():
+        together = Counter()
+        for user_id in users:
+            together.update(history[user_id])
+        together.pop(target, None)
+        similarities[target] = {
+            movie_id: count / math.sqrt(audience[target] * audience[movie_id])
+            for movie_id, count in together.items()
+        }
+    return similarities
+
+
+def compute_neighbours(movie_ids, k=NEIGHBOURS):
+    """{movie_id: [(vecino, score)]} con los k vecinos más similares."""
+    content = content_similarities(movie_ids)
+    behaviour = behaviour_similarities(movie_ids)
+
+    behaviour_candidates = {movie_id for scores in behaviour.values() for movie_id in scores}
+    active = set()
+    for chunk in _chunks(behaviour_candidates):
+        active.update(Movie.objects.filter(id__in=chunk).values_list('id', flat=True))
+
+    neighbours = {}
+    for target in movie_ids:
+        scores = defaultdict(float)
+        for movie_id, value in content.get(target, {}).items():
+            scores[movie_id] += CONTENT_WEIGHT * value
+        for movie_id, value in behaviour.get(target, {}).items():
+            if movie_id in active:
+                scores[movie_id] += BEHAVIOUR_WEIGHT * value
+        neighbours[target] = heapq.nlargest(
+            k, scores.items(), key=lambda item: (item[1], -item[0])
+        )
+    return neighbours
+
+
+def refresh_recommendations(movie_ids, k=NEIGHBOURS):
+    """Recalcula y guarda los vecinos de un lote de películas."""
+    movie_ids = list(set(movie_ids))
+    if not movie_ids:
+        return {}
+
+    active = list(Movie.objects.filter(id__in=movie_ids).values_list('id', flat=True))
+    neighbours = compute_neighbours(active, k=k)
+    rows = [
+        MovieRecommendation(
+            movie_id=movie_id, similar_id=similar_id, rank=rank, score=round(score, 6)
+        )
+        for movie_id, items in neighbours.items()
+        for rank, (similar_id, score) in enumerate(items, 1)
+    ]
+
+    with transaction.atomic():
+        MovieRecommendation.objects.filter(movie_id__in=movie_ids).delete()
+        MovieRecommendation.objects.bulk_create(rows, batch_size=1000)
+    return neighbours
+
+
+def rebuild_recommendations(batch_size=500, k=NEIGHBOURS):
+    """Trabajo por lotes: recalcula los vecinos de todo el catálogo activo."""
+    MovieRecommendation.objects.filter(movie__is_active=False).delete()
+
+    ids = Movie.objects.order_by('id').values_list('id', flat=True)
+    total = 0
+    batch = []
+    for movie_id in ids.iterator(chunk_size=batch_size):
+        batch.append(movie_id)
+        if len(batch) >= batch_size:
+            total += len(refresh_recommendations(batch, k=k))
+            batch = []
+    total += len(refresh_recommendations(batch, k=k))
+    return total
+
+
+def refresh_movies(movie_ids):
+    """
+    Refresco incremental de unos títulos: sus vecinos y, además, las listas
+    de esos vecinos, para que un estreno aparezca en ellas sin esperar al lote.
+    """
+    neighbours = refresh_recommendations(movie_ids)
+    refresh_recommendations({
+        similar_id
+        for items in neighbours.values()
+        for similar_id, _score in items
+    } - set(movie_ids))
+
+
+def schedule_refresh(*movie_ids):
+    """
+    Encola las películas para el worker (process_recommendation_queue). Las
+    filas se escriben en la misma transacción que el cambio y no se calcula
+    nada durante la petición; varias peticiones de la misma película se funden.
+    """
+    now = timezone.now()
+    RecommendationRefresh.objects.bulk_create(
+        [RecommendationRefresh(movie_id=movie_id, requested_at=now) for movie_id in movie_ids],
+        batch_size=CHUNK_SIZE,
+        update_conflicts=True, unique_fields=['movie'], update_fields=['requested_at'],
+    )
+
+
+def process_refresh_queue(batch_size=100):
+    """
+    Recalcula las películas encoladas, de las más antiguas a las más nuevas.
+    Una fila se borra sólo si no se volvió a pedir mientras se calculaba.
+    Devuelve el número de películas procesadas.
+    """
+    processed = 0
+    while True:
+        pending = list(
+            RecommendationRefresh.objects.order_by('requested_at')
+            .values_list('movie_id', 'requested_at')[:batch_size]
+        )
+        if not pending:
+            return processed
+        refresh_movies([movie_id for movie_id, _requested_at in pending])
+        for movie_id, requested_at in pending:
+            RecommendationRefresh.objects.filter(
+                movie_id=movie_id, requested_at__lte=requested_at
+            ).delete()
+        processed += len(pending)
+
+
+def similar_movies(movie_id, limit=NEIGHBOURS):
+    """[(movie_id, score)] precalculados, en orden."""
+    return list(
+        MovieRecommendation.objects.filter(
+            movie_id=movie_id, similar__is_active=True
+        ).order_by('rank').values_list('similar_id', 'score')[:limit]
+    )
+
+
+def recommended_movies(user, limit=NEIGHBOURS):
+    """
+    "Porque viste...": suma los vecinos de las últimas películas reservadas por
+    el usuario y descarta las ya vistas. Devuelve [(movie_id, score, because_id)].
+    """
+    watched = _viewing_source.watched(user)
+    seen = set(watched)
+
+    scores = defaultdict(float)
+    because = {}
+    for movie_id, similar_id, score in MovieRecommendation.objects.filter(
+        movie_id__in=watched[:HISTORY_SIZE], similar__is_active=True
+    ).values_list('movie_id', 'similar_id', 'score'):
+        if similar_id in seen:
+            continue
+        scores[similar_id] += score
+        if score > because.get(similar_id, (0, None))[0]:
+            because[similar_id] = (score, movie_id)
+
+    ranked = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], -item[0]))
+    return [(movie_id, score, because[movie_id][1]) for movie_id, score in ranked]
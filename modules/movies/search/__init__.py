@@ -0,0 +1,4 @@
+from modules.movies.search.text import fold, tokenize
+from modules.movies.search.engine import (
+    index_movies, schedule_index, rebuild_index, search_movies
+)
@@ -0,0 +1,274 @@
+import heapq
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import transaction
+
+from modules.movies.search.text import tokenize
+
+
+MOVIE = 'movie'
+ACTOR = 'actor'
+
+
+FUZZY_CANDIDATES = 200
+# Por debajo de esta longitud un token no recorre el índice: sólo filtra los
+# candidatos que ya encontraron los demás ("star w")
+MIN_PREFIX_LENGTH = 2
+
+
+def trigrams(word):
+    # Sólo relleno inicial: los trigramas de un prefijo son los del inicio de la palabra
+    padded = f'  {word}'
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def prefix_distance(token, word, limit):
+    """
+    Menor distancia de edición (con transposiciones) entre token y algún
+    prefijo de word, cortando en cuanto supera el límite (devuelve limit + 1).
+    """
+    word = word[:len(token) + limit]
+    before = None
+    previous = list(range(len(word) + 1))
+    for i, char_a in enumerate(token, 1):
+        current = [i]
+        for j, char_b in enumerate(word, 1):
+            cost = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b),
+            )
+            if before and i > 1 and j > 1 and char_a == word[j - 2] and token[i - 2] == char_b:
+                cost = min(cost, before[j - 2] + 1)
+            current.append(cost)
+        if min(current) > limit:
+            return limit + 1
+        before, previous = previous, current
+    return min(previous[max(len(token) - limit, 0):])
+
+
+def max_edits(token):
+    if len(token) < 3:
+        return 0
+    return 1 if len(token) < 8 else 2
+
+
+class AutocompleteIndex:
+    """
+    Índice en memoria de títulos y nombres de actores. Cada palabra se guarda
+    en una lista ordenada (búsqueda por prefijo con bisect) y en un índice de
+    trigramas que acota los candidatos para la coincidencia aproximada.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._labels = {}
+        self._entry_words = {}
+        self._words = []
+        self._postings = defaultdict(set)
+        self._trigrams = defaultdict(set)
+        self.loaded_at = None
+
+    def __len__(self):
+        return len(self._labels)
+
+    def add(self, kind, pk, label):
+        with self._lock:
+            key = (kind, pk)
+            self.remove(kind, pk)
+            words = set(tokenize(label, keep_stopwords=True))
+            self._labels[key] = label
+            self._entry_words[key] = words
+            for word in words:
+                if word not in self._postings:
+                    insort(self._words, word)
+                    for gram in trigrams(word):
+                        self._trigrams[gram].add(word)
+                self._postings[word].add(key)
+
+    def remove(self, kind, pk):
+        with self._lock:
+            key = (kind, pk)
+            if key not in self._labels:
+                return
+            del self._labels[key]
+            for word in self._entry_words.pop(key):
+                entries = self._postings[word]
+                entries.discard(key)
+                if not entries:
+                    del self._postings[word]
+                    del self._words[bisect_left(self._words, word)]
+                    for gram in trigrams(word):
+                        self._trigrams[gram].discard(word)
+
+    def _prefix_words(self, prefix):
+        position = bisect_left(self._words, prefix)
+        while position < len(self._words) and self._words[position].startswith(prefix):
+            yield self._words[position]
+            position += 1
+
+    def _fuzzy_words(self, token):
+        limit = max_edits(token)
+        if not limit:
+            return {}
+        grams = trigrams(token)
+        # Cada edición altera como mucho tres trigramas
+        needed = max(len(grams) - 3 * limit, 1)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self._trigrams.get(gram, ()))
+
+        matches = {}
+        for word, count in shared.most_common(FUZZY_CANDIDATES):
+            if count < needed:
+                break
+            # Se compara contra el prefijo de la palabra para tolerar erratas al escribir
+            distance = prefix_distance(token, word, limit)
+            if distance <= limit:
+                matches[word] = distance
+        return matches
+
+    def _match_token(self, token):
+        """Devuelve {entrada: coste}; 0 para prefijo exacto, n para n ediciones."""
+        matches = {}
+        for word in self._prefix_words(token):
+            for key in self._postings[word]:
+                matches[key] = 0
+        if matches:
+            return matches
+        for word, distance in self._fuzzy_words(token).items():
+            for key in self._postings[word]:
+                if distance < matches.get(key, distance + 1):
+                    matches[key] = distance
+        return matches
+
+    def _filter_prefix(self, scores, token):
+        return {
+            key: cost for key, cost in scores.items()
+            if any(word.startswith(token) for word in self._entry_words[key])
+        }
+
+    def search(self, query, limit=10, kind=None):
+        tokens = tokenize(query, keep_stopwords=True)
+        # Los tokens largos primero: son los que más acotan
+        tokens.sort(key=len, reverse=True)
+        if not tokens or len(tokens[0]) < MIN_PREFIX_LENGTH:
+            return []
+
+        with self._lock:
+            scores = None
+            for token in tokens:
+                if len(token) < MIN_PREFIX_LENGTH:
+                    scores = self._filter_prefix(scores, token)
+                else:
+                    matches = self._match_token(token)
+                    if scores is None:
+                        scores = matches
+                    else:
+                        scores = {
+                            key: cost + matches[key]
+                            for key, cost in scores.items() if key in matches
+                        }
+                if not scores:
+                    return []
+
+            ranked = heapq.nsmallest(limit, (
+                (cost, len(self._labels[key]), self._labels[key], key)
+                for key, cost in scores.items()
+                if kind is None or key[0] == kind
+            ))
+
+        return [
+            {'type': key[0], 'id': key[1], 'label': label}
+            for _cost, _length, label, key in ranked
+        ]
+
+
+_index = AutocompleteIndex()
+_load_lock = threading.Lock()
+# Cambios llegados mientras se construye un índice nuevo en segundo plano;
+# se aplican sobre él antes de publicarlo para no perderlos
+_replay = None
+
+
+def _load(index):
+    from modules.movies.models.movies import Actor, Movie
+
+    for pk, title in Movie.objects.values_list('id', 'title').iterator():
+        index.add(MOVIE, pk, title)
+    for pk, name in Actor.objects.values_list('id', 'name').iterator():
+        index.add(ACTOR, pk, name)
+    index.loaded_at = time.monotonic()
+
+
+def _apply(index, kind, pk, label, active):
+    if active:
+        index.add(kind, pk, label)
+    else:
+        index.remove(kind, pk)
+
+
+def _rebuild():
+    global _index, _replay
+    from django.db import close_old_connections
+
+    try:
+        fresh = AutocompleteIndex()
+        _load(fresh)
+        with _load_lock:
+            for update in _replay:
+                _apply(fresh, *update)
+            # Intercambio atómico de la referencia: las peticiones en curso
+            # terminan con el índice anterior
+            _index = fresh
+    finally:
+        with _load_lock:
+            _replay = None
+        close_old_connections()
+
+
+def refresh_in_background():
+    """Construye un índice nuevo en un hilo y lo publica al terminar."""
+    global _replay
+    with _load_lock:
+        if _replay is not None:
+            return
+        _replay = []
+    threading.Thread(target=_rebuild, name='autocomplete-refresh', daemon=True).start()
+
+
+def get_index():
+    """
+    Índice del proceso. La primera carga es síncrona; después, pasado
+    AUTOCOMPLETE_TTL segundos, se reconstruye en segundo plano para recoger
+    cambios de otros procesos mientras se sigue sirviendo el actual.
+    """
+    global _index
+    if _index.loaded_at is None:
+        with _load_lock:
+            if _index.loaded_at is None:
+                fresh = AutocompleteIndex()
+                _load(fresh)
+                _index = fresh
+    elif time.monotonic() - _index.loaded_at > getattr(settings, 'AUTOCOMPLETE_TTL', 300):
+        refresh_in_background()
+    return _index
+
+
+def update_entry(kind, pk, label, active=True):
+    """
+    Mantiene el índice del proceso al día desde las señales de guardado,
+    una vez confirmada la transacción.
+    """
+    def run():
+        with _load_lock:
+            if _replay is not None:
+                _replay.append((kind, pk, label, active))
+        if _index.loaded_at is not None:
+            _apply(_index, kind, pk, label, active)
+
+    transaction.on_commit(run)
@@ -0,0 +1,243 @@
+import heapq
+import math
+from collections import Counter, defaultdict
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Avg, Count
+
+from modules.common.utils import OnCommitBatch
+from modules.movies.models.movies import Movie
+from modules.movies.models.search import MovieSearchDocument, MovieSearchTerm
+from modules.movies.search.text import tokenize
+
+
+# Peso de cada campo en la frecuencia de término
+FIELD_WEIGHTS = {
+    'title': 3,
+    'categories': 2,
+    'cast': 2,
+    'description': 1,
+}
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+MAX_TERM_LENGTH = 64
+STATS_CACHE_KEY = 'movie-search:stats'
+STATS_CACHE_TIMEOUT = 60 * 5
+INDEX_CHUNK_SIZE = 500
+# Entradas que se leen como mucho por término, de mayor a menor impacto
+MAX_POSTINGS_PER_TERM = 1000
+DF_CACHE_KEY = 'movie-search:df:{}'
+
+
+def movie_terms(movie):
+    """
+    Frecuencias ponderadas de los términos de una película. Usa las relaciones
+    precargadas si existen (prefetch_related de categories y cast).
+    """
+    return document_terms(
+        title=movie.title,
+        description=movie.description,
+        categories=[category.name for category in movie.categories.all()],
+        cast=[actor.name for actor in movie.cast.all()],
+    )
+
+
+def document_terms(title, description, categories, cast):
+    fields = {
+        'title': [title],
+        'description': [description],
+        'categories': categories,
+        'cast': cast,
+    }
+
+    terms = Counter()
+    for field, values in fields.items():
+        weight = FIELD_WEIGHTS[field]
+        for value in values:
+            for token in tokenize(value):
+                terms[token[:MAX_TERM_LENGTH]] += weight
+    return terms
+
+
+def title_terms(title):
+    return {token[:MAX_TERM_LENGTH] for token in tokenize(title)}
+
+
+def term_impact(frequency, length, average_length):
+    """Parte de la puntuación BM25 de un término que depende del documento."""
+    norm = 1 - BM25_B + BM25_B * (length / average_length if average_length else 1)
+    return frequency * (BM25_K1 + 1) / (frequency + BM25_K1 * norm)
+
+
+def index_movies(movie_ids):
+    """
+    Reindexa un lote de películas: borra sus entradas y las vuelve a insertar
+    con bulk_create. Las películas inactivas quedan fuera del índice.
+    """
+    movie_ids = list(movie_ids)
+    if not movie_ids:
+        return 0
+
+    movies = Movie.all_objects.filter(
+        id__in=movie_ids, is_active=True
+    ).prefetch_related('categories', 'cast')
+
+    return index_documents(
+        movie_ids,
+        ((movie.id, movie_terms(movie), title_terms(movie.title)) for movie in movies),
+    )
+
+
+def index_documents(movie_ids, entries):
+    """
+    Sustituye las entradas del índice de movie_ids por las de entries,
+    tríos (movie_id, frecuencias, términos del título) ya calculados. El
+    impacto se calcula con la longitud media del momento; sólo ordena las
+    entradas, la puntuación final usa la media vigente.
+    """
+    _documents, average_length = collection_stats()
+    documents = []
+    postings = []
+    for movie_id, terms, title in entries:
+        length = sum(terms.values())
+        documents.append(MovieSearchDocument(movie_id=movie_id, length=length))
+        postings.extend(
+            MovieSearchTerm(
+                term=term, movie_id=movie_id, frequency=frequency, document_length=length,
+                impact=term_impact(frequency, length, average_length or length),
+                in_title=term in title,
+            )
+            for term, frequency in terms.items()
+        )
+
+    with transaction.atomic():
+        MovieSearchTerm.objects.filter(movie_id__in=movie_ids).delete()
+        MovieSearchDocument.objects.filter(movie_id__in=movie_ids).delete()
+        MovieSearchDocument.objects.bulk_create(documents)
+        MovieSearchTerm.objects.bulk_create(postings, batch_size=1000)
+
+    return len(documents)
+
+
+def _index_pending(movie_ids):
+    ids = sorted(movie_ids)
+    for start in range(0, len(ids), INDEX_CHUNK_SIZE):
+        index_movies(ids[start:start + INDEX_CHUNK_SIZE])
+
+
+_pending_index = OnCommitBatch(_index_pending)
+
+
+def schedule_index(*movie_ids):
+    """
+    Reindexa las películas al confirmar la transacción. Todo lo que se
+    programa dentro de la misma transacción (la película, sus relaciones M2M,
+    el renombrado de una categoría...) se acumula en un único reindexado por
+    lotes de INDEX_CHUNK_SIZE.
+    """
+    _pending_index.add(*movie_ids)
+
+
+def rebuild_index(batch_size=1000):
+    """
+    Reconstruye el índice sin vaciarlo antes: cada lote sustituye las entradas
+    de sus películas en su propia transacción, así que las búsquedas siguen
+    respondiendo durante la reconstrucción. Al final se quitan las películas
+    que ya no están activas.
+    """
+    ids = Movie.objects.order_by('id').values_list('id', flat=True)
+
+    total = 0
+    batch = []
+    for movie_id in ids.iterator(chunk_size=batch_size):
+        batch.append(movie_id)
+        if len(batch) >= batch_size:
+            total += index_movies(batch)
+            batch = []
+    total += index_movies(batch)
+
+    inactive = Movie.all_objects.filter(is_active=False).values('id')
+    with transaction.atomic():
+        MovieSearchTerm.objects.filter(movie_id__in=inactive).delete()
+        MovieSearchDocument.objects.filter(movie_id__in=inactive).delete()
+    cache.delete(STATS_CACHE_KEY)
+    return total
+
+
+def collection_stats():
+    """Número de documentos y longitud media; se cachean unos minutos."""
+    stats = cache.get(STATS_CACHE_KEY)
+    if stats is None:
+        aggregate = MovieSearchDocument.objects.aggregate(
+            documents=Count('movie_id'), average=Avg('length')
+        )
+        stats = (aggregate['documents'], aggregate['average'] or 0)
+        cache.set(STATS_CACHE_KEY, stats, STATS_CACHE_TIMEOUT)
+    return stats
+
+
+def document_frequencies(terms):
+    """{término: películas que lo contienen}; se cachean como las estadísticas."""
+    keys = {DF_CACHE_KEY.format(term): term for term in terms}
+    cached = cache.get_many(list(keys))
+    frequencies = {keys[key]: value for key, value in cached.items()}
+
+    missing = [term for term in terms if term not in frequencies]
+    if missing:
+        counted = dict(
+            MovieSearchTerm.objects.filter(term__in=missing)
+            .values('term').annotate(movies=Count('movie_id'))
+            .values_list('term', 'movies')
+        )
+        fresh = {term: counted.get(term, 0) for term in missing}
+        cache.set_many(
+            {DF_CACHE_KEY.format(term): value for term, value in fresh.items()},
+            STATS_CACHE_TIMEOUT,
+        )
+        frequencies.update(fresh)
+    return frequencies
+
+
+def search_movies(query, limit=20):
+    """
+    Devuelve [(movie_id, score)] ordenado por relevancia BM25.
+
+    Cada término aporta como candidatas sus MAX_POSTINGS_PER_TERM entradas
+    de mayor impacto (lectura por el índice term, -impact), así que un
+    término común no recorre medio catálogo. Las candidatas se puntúan
+    después con exactitud. Sólo puede quedar fuera una película que no esté
+    entre las mejores de ninguno de los términos; con menos entradas que el
+    límite el resultado es exacto.
+    """
+    terms = list(dict.fromkeys(term[:MAX_TERM_LENGTH] for term in tokenize(query)))
+    if not terms:
+        return []
+
+    documents, average_length = collection_stats()
+    if not documents:
+        return []
+
+    frequencies = document_frequencies(terms)
+    terms = [term for term in terms if frequencies.get(term)]
+
+    candidates = set()
+    for term in terms:
+        candidates.update(
+            MovieSearchTerm.objects.filter(term=term).order_by('-impact')
+            .values_list('movie_id', flat=True)[:MAX_POSTINGS_PER_TERM]
+        )
+
+    scores = defaultdict(float)
+    ids = sorted(candidates)
+    for start in range(0, len(ids), INDEX_CHUNK_SIZE):
+        for term, movie_id, frequency, length in MovieSearchTerm.objects.filter(
+            term__in=terms, movie_id__in=ids[start:start + INDEX_CHUNK_SIZE]
+        ).values_list('term', 'movie_id', 'frequency', 'document_length'):
+            df = frequencies[term]
+            idf = math.log(1 + (documents - df + 0.5) / (df + 0.5))
+            scores[movie_id] += idf * term_impact(frequency, length, average_length)
+
+    return heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], -item[0]))
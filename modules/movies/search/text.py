@@ -0,0 +1,38 @@
+import re
+import unicodedata
+
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+STOPWORDS = frozenset({
+    'a', 'al', 'an', 'and', 'con', 'de', 'del', 'el', 'en', 'for', 'in', 'is',
+    'la', 'las', 'lo', 'los', 'of', 'on', 'or', 'para', 'por', 'que', 'the',
+    'to', 'un', 'una', 'with', 'y',
+})
+
+
+def fold(text):
+    """Minúsculas y sin acentos: 'Acción' -> 'accion'."""
+    normalized = unicodedata.normalize('NFKD', text or '')
+    return ''.join(c for c in normalized if not unicodedata.combining(c)).lower()
+
+
+def tokenize(text, keep_stopwords=False):
+    tokens = TOKEN_RE.findall(fold(text))
+    if keep_stopwords:
+        return tokens
+    return [token for token in tokens if token not in STOPWORDS]
+
+
+def normalize_name(text):
+    """Forma de búsqueda de un nombre: 'José  Ñúñez' -> 'jose nunez'."""
+    return ' '.join(TOKEN_RE.findall(fold(text)))
+
+
+def prefix_range(prefix):
+    """
+    Límites [desde, hasta) de las cadenas que empiezan por prefix. Con
+    __gte/__lt la búsqueda por prefijo usa el índice; __startswith se compila
+    a LIKE ... ESCAPE y SQLite recorre la tabla entera.
+    """
+    return prefix, prefix + '\uffff'
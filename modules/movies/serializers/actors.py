@@ -2,7 +2,7 @@
 
 from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
-from movies.models import Actor
+from movies.models import Actor, Movie
 from modules.common.serializer import AuditableSerializerMixin
 
 
@@ -17,6 +17,14 @@ class ActorListSerializer(AuditableSerializerMixin, serializers.ModelSerializer)
         ]
 
 
+class FilmographySerializer(serializers.ModelSerializer):
+    upcoming_showtimes = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Movie
+        fields = ['id', 'title', 'release_date', 'upcoming_showtimes']
+
+
 class ActorCreateSerializer(serializers.ModelSerializer):
     name = serializers.CharField(
         max_length=100,
@@ -45,7 +53,7 @@ class ActorCreateSerializer(serializers.ModelSerializer):
         fields = ['name', 'biography', 'birth_date']
 
     def validate_name(self, value):
-        if Actor.objects.filter(name=value).exists():
+        if Actor.all_objects.filter(name=value).exists():
             raise serializers.ValidationError(
                 _('Ya existe un actor con ese nombre.'))
         return value
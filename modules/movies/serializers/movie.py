@@ -1,12 +1,13 @@
 # movies/serializers/movie.py
 
 from django.utils.translation import gettext_lazy as _
+from django.db import transaction
 from rest_framework import serializers
-from modules.common.serializer import AuditableSerializerMixin
+from modules.common.serializer import AuditableSerializerMixin, EagerLoadingMixin
 from modules.movies.models import Movie, Actor, MovieCategory
 
 
-class MovieListSerializer(AuditableSerializerMixin, serializers.ModelSerializer):
+class MovieListSerializer(EagerLoadingMixin, AuditableSerializerMixin, serializers.ModelSerializer):
     categories = serializers.StringRelatedField(many=True)
     cast = serializers.StringRelatedField(many=True)
 
@@ -65,7 +66,7 @@ class MovieCreateSerializer(serializers.ModelSerializer):
         ]
 
     def validate_title(self, value):
-        if Movie.objects.filter(title=value).exists():
+        if Movie.all_objects.filter(title=value).exists():
             raise serializers.ValidationError(
                 _('Ya existe una película con ese título.'))
         return value
@@ -96,9 +97,10 @@ class MovieCreateSerializer(serializers.ModelSerializer):
         categories = validated_data.pop('categories')
         cast = validated_data.pop('cast')
 
-        movie = Movie.objects.create(**validated_data)
-        movie.categories.set(categories)
-        movie.cast.set(cast)
+        with transaction.atomic():
+            movie = Movie.objects.create(**validated_data)
+            movie.categories.set(categories)
+            movie.cast.set(cast)
         return movie
 
 
@@ -152,7 +154,7 @@ class MovieUpdateSerializer(AuditableSerializerMixin, serializers.ModelSerialize
     def validate_title(self, value):
         if value:
             movie_id = self.instance.id if self.instance else None
-            if Movie.objects.filter(title=value).exclude(id=movie_id).exists():
+            if Movie.all_objects.filter(title=value).exclude(id=movie_id).exists():
                 raise serializers.ValidationError(
                     _('Ya existe una película con ese título.'))
         return value
@@ -188,10 +190,10 @@ class MovieUpdateSerializer(AuditableSerializerMixin, serializers.ModelSerialize
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
 
-        if categories is not None:
-            instance.categories.set(categories)
-        if cast is not None:
-            instance.cast.set(cast)
-
-        instance.save()
+        with transaction.atomic():
+            if categories is not None:
+                instance.categories.set(categories)
+            if cast is not None:
+                instance.cast.set(cast)
+            instance.save()
         return instance
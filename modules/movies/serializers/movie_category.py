@@ -40,7 +40,7 @@ class MovieCategoryCreateSerializer(serializers.ModelSerializer):
         fields = ['name', 'description', 'is_active']
 
     def validate_name(self, value):
-        if MovieCategory.objects.filter(name=value).exists():
+        if MovieCategory.all_objects.filter(name=value).exists():
             raise serializers.ValidationError(
                 _('Ya existe una categoría con ese nombre.'))
         return value
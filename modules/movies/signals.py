@@ -0,0 +1,120 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from modules.common.models import bulk_active_changed
+from modules.movies.models.movies import Actor, Movie, MovieCategory
+from modules.movies.recommendations import schedule_refresh
+from modules.movies.search.autocomplete import ACTOR, MOVIE, update_entry
+from modules.movies.search.engine import schedule_index
+
+
+# Campos de categorías y actores que forman parte del documento de búsqueda
+INDEXED_FIELDS = ('name', 'is_active')
+
+
+@receiver(post_save, sender=Movie)
+def index_saved_movie(sender, instance, **kwargs):
+    schedule_index(instance.pk)
+
+
+def _related_movie_ids(through, model, pks):
+    field = next(field for field in through._meta.fields if field.related_model is model)
+    return list(
+        through.objects.filter(**{f"{field.attname}__in": pks})
+        .values_list('movie_id', flat=True).distinct()
+    )
+
+
+@receiver(m2m_changed, sender=Movie.categories.through)
+@receiver(m2m_changed, sender=Movie.cast.through)
+def movie_relations_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_clear' and reverse:
+        # post_clear llega con pk_set=None: las películas se leen antes de borrar
+        instance._cleared_movie_ids = _related_movie_ids(sender, type(instance), [instance.pk])
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if not reverse:
+        movie_ids = [instance.pk]
+    elif action == 'post_clear':
+        movie_ids = instance.__dict__.pop('_cleared_movie_ids', [])
+    else:
+        movie_ids = pk_set or []
+
+    schedule_index(*movie_ids)
+    schedule_refresh(*movie_ids)
+
+
+@receiver(pre_save, sender=MovieCategory)
+@receiver(pre_save, sender=Actor)
+def remember_indexed_fields(sender, instance, update_fields, **kwargs):
+    instance._previous_indexed = None
+    if not instance.pk:
+        return
+    if update_fields is not None and not set(update_fields) & set(INDEXED_FIELDS):
+        return
+    instance._previous_indexed = sender.all_objects.filter(pk=instance.pk).values_list(
+        *INDEXED_FIELDS
+    ).first()
+
+
+def _indexed_fields_changed(instance):
+    previous = getattr(instance, '_previous_indexed', None)
+    current = tuple(getattr(instance, name) for name in INDEXED_FIELDS)
+    return previous is not None and previous != current
+
+
+@receiver(post_save, sender=MovieCategory)
+def index_category_movies(sender, instance, created, **kwargs):
+    # Sólo un renombrado o un (des)activado cambia los documentos de sus películas
+    if not created and _indexed_fields_changed(instance):
+        schedule_index(*_related_movie_ids(Movie.categories.through, MovieCategory, [instance.pk]))
+
+
+@receiver(post_save, sender=Actor)
+def index_actor_movies(sender, instance, created, **kwargs):
+    if not created and _indexed_fields_changed(instance):
+        schedule_index(*_related_movie_ids(Movie.cast.through, Actor, [instance.pk]))
+
+
+@receiver(bulk_active_changed, sender=Movie)
+def index_bulk_movies(sender, pks, **kwargs):
+    schedule_index(*pks)
+
+
+@receiver(bulk_active_changed, sender=MovieCategory)
+def index_bulk_category_movies(sender, pks, **kwargs):
+    schedule_index(*_related_movie_ids(Movie.categories.through, MovieCategory, pks))
+
+
+@receiver(bulk_active_changed, sender=Actor)
+def index_bulk_actor_movies(sender, pks, **kwargs):
+    schedule_index(*_related_movie_ids(Movie.cast.through, Actor, pks))
+
+
+@receiver(post_save, sender=Movie)
+def autocomplete_saved_movie(sender, instance, **kwargs):
+    update_entry(MOVIE, instance.pk, instance.title, active=instance.is_active)
+
+
+@receiver(post_save, sender=Actor)
+def autocomplete_saved_actor(sender, instance, **kwargs):
+    update_entry(ACTOR, instance.pk, instance.name, active=instance.is_active)
+
+
+@receiver(post_delete, sender=Movie)
+def autocomplete_deleted_movie(sender, instance, **kwargs):
+    update_entry(MOVIE, instance.pk, instance.title, active=False)
+
+
+@receiver(post_delete, sender=Actor)
+def autocomplete_deleted_actor(sender, instance, **kwargs):
+    update_entry(ACTOR, instance.pk, instance.name, active=False)
+
+
+@receiver(post_save, sender=Movie)
+def recommend_saved_movie(sender, instance, created, update_fields, **kwargs):
+    # Los cambios de comportamiento (reservas) los recoge el trabajo por lotes
+    if created or (update_fields and 'is_active' in update_fields):
+        schedule_refresh(instance.pk)
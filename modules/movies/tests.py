@@ -1,3 +1,215 @@
+from unittest import mock, skipUnless
+
+from django.core.cache import cache
+from django.db import connection
+from django.http import QueryDict
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from modules.manager.models import User
+from modules.movies.filters.actors import ActorFilter
+from modules.movies.filters.movies import MovieFilter
+from modules.movies.models import Actor, Movie, MovieCategory, MovieSearchTerm
+from modules.movies.recommendations import content_similarities
+from modules.movies.search.engine import search_movies
+
+
+class MovieFilterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.drama = MovieCategory.objects.create(name='Drama')
+        cls.comedy = MovieCategory.objects.create(name='Comedy')
+        cls.actor = Actor.objects.create(name='Actor One')
+        cls.other_actor = Actor.objects.create(name='Actor Two')
+
+        # El filtro por título lee el índice de búsqueda, que se llena al confirmar
+        with cls.captureOnCommitCallbacks(execute=True):
+            cls.both = Movie.objects.create(title='Both Genres', release_date='2020-01-01')
+            cls.both.categories.set([cls.drama, cls.comedy])
+            cls.both.cast.set([cls.actor, cls.other_actor])
+
+            cls.drama_only = Movie.objects.create(title='Only Drama', release_date='2020-01-01')
+            cls.drama_only.categories.set([cls.drama])
+            cls.drama_only.cast.set([cls.actor])
+
+    def filter(self, query):
+        return MovieFilter(QueryDict(query), queryset=Movie.objects.all())
+
+    def test_conjoined_filters_run_in_a_single_query(self):
+        query = (
+            f'title=genres&release_date=2020-01-01'
+            f'&categories={self.drama.id}&categories={self.comedy.id}'
+            f'&cast={self.actor.id}&cast={self.other_actor.id}'
+        )
+        with self.assertNumQueries(1):
+            movies = list(self.filter(query).qs)
+        self.assertEqual(movies, [self.both])
+
+    def test_categories_require_all_ids(self):
+        movies = self.filter(f'categories={self.drama.id}').qs
+        self.assertCountEqual(movies, [self.both, self.drama_only])
+
+        movies = self.filter(f'categories={self.drama.id}&categories={self.comedy.id}').qs
+        self.assertCountEqual(movies, [self.both])
+
+    def test_title_matches_word_prefixes_through_the_index(self):
+        self.assertCountEqual(self.filter('title=gen').qs, [self.both])
+        self.assertCountEqual(self.filter('title=DRAMA').qs, [self.drama_only])
+        # Una categoría o un actor no cuentan como título
+        self.assertCountEqual(self.filter('title=comedy').qs, [])
+        self.assertNotIn('LIKE', str(self.filter('title=gen').qs.query).upper())
+
+    def test_invalid_ids_are_rejected_without_queries(self):
+        with self.assertNumQueries(0):
+            movie_filter = self.filter('categories=abc')
+            self.assertFalse(movie_filter.is_valid())
+        self.assertIn('categories', movie_filter.errors)
+
+
+class ActorFilterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.penelope = Actor.objects.create(name='Penélope Cruz Sánchez')
+        cls.tom = Actor.objects.create(name='Tom Cruise')
+        Actor.objects.create(name='Javier Bardem')
+
+    def filter(self, name):
+        return ActorFilter(QueryDict(f'name={name}'), queryset=Actor.objects.all()).qs
+
+    def test_matches_prefix_of_any_word(self):
+        self.assertCountEqual(self.filter('PENE'), [self.penelope])
+        self.assertCountEqual(self.filter('cruz'), [self.penelope])
+        self.assertCountEqual(self.filter('cru'), [self.penelope, self.tom])
+        self.assertCountEqual(self.filter('sanchez'), [self.penelope])
+        self.assertCountEqual(self.filter('ruz'), [])
+
+    def test_prefix_search_uses_ranges_not_like(self):
+        sql = str(self.filter('cruz').query)
+        self.assertNotIn('LIKE', sql.upper())
+
+    @skipUnless(connection.vendor == 'sqlite', "plan de consulta de SQLite")
+    def test_prefix_search_is_served_from_indexes(self):
+        sql, params = self.filter('cruz').query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            plan = [row[-1] for row in cursor.fetchall()]
+
+        self.assertFalse([step for step in plan if step.startswith('SCAN')], plan)
+        self.assertTrue(any('search_name>? AND search_name<?' in step for step in plan), plan)
+        self.assertTrue(any('suffix>? AND suffix<?' in step for step in plan), plan)
+
+
+class MovieListQueryCountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        categories = [MovieCategory.objects.create(name=f'Category {i}') for i in range(3)]
+        actors = [Actor.objects.create(name=f'Actor {i}') for i in range(3)]
+        for i in range(30):
+            movie = Movie.objects.create(title=f'Movie {i}', release_date='2020-01-01')
+            movie.categories.set(categories)
+            movie.cast.set(actors)
+        cls.user = User.objects.create_user(
+            email='reader@example.com', password='secret-password',
+            first_name='Reader', last_name='User',
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_list_query_count_does_not_grow_with_page_size(self):
+        for page_size in (1, 10, 30):
+            # Página, categorías precargadas y reparto precargado
+            with self.assertNumQueries(3):
+                response = self.client.get('/api/movies/', {'page_size': page_size})
+            self.assertEqual(response.status_code, 200)
+            results = response.data['results']
+            self.assertEqual(len(results), page_size)
+            self.assertEqual(len(results[0]['categories']), 3)
+            self.assertEqual(len(results[0]['cast']), 3)
+
+    def test_sparse_fieldset_skips_unused_prefetches(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/movies/', {'fields': 'id,title'})
+        self.assertEqual(set(response.data['results'][0]), {'id', 'title'})
+
+        response = self.client.get('/api/movies/', {'omit': 'description,cast'})
+        self.assertNotIn('cast', response.data['results'][0])
+        self.assertIn('categories', response.data['results'][0])
+
+
+class ContentSimilarityTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        drama = MovieCategory.objects.create(name='Drama')
+        actor = Actor.objects.create(name='Shared Actor')
+        cls.movies = [
+            Movie.objects.create(title=f'Drama {i}', release_date='2020-01-01') for i in range(6)
+        ]
+        for movie in cls.movies:
+            movie.categories.set([drama])
+        cls.first, cls.partner = cls.movies[0], cls.movies[1]
+        cls.first.cast.set([actor])
+        cls.partner.cast.set([actor])
+
+    def test_common_feature_contributes_capped_candidates(self):
+        uncapped = content_similarities([self.first.id])[self.first.id]
+
+        with mock.patch('modules.movies.recommendations.MAX_FEATURE_CANDIDATES', 2):
+            capped = content_similarities([self.first.id, self.movies[3].id])
+
+        # El actor compartido es un rasgo raro: su pareja sigue apareciendo,
+        # con el mismo coseno que sin límite
+        self.assertAlmostEqual(capped[self.first.id][self.partner.id], uncapped[self.partner.id])
+        # Por Drama sólo entran las dos películas más recientes
+        newest = {movie.id for movie in self.movies[-2:]}
+        self.assertEqual(set(capped[self.movies[3].id]), newest - {self.movies[3].id})
+        self.assertLessEqual(set(capped[self.first.id]), newest | {self.partner.id})
+
+
+class SearchEngineTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        drama = MovieCategory.objects.create(name='Drama')
+        with cls.captureOnCommitCallbacks(execute=True):
+            cls.titled = Movie.objects.create(
+                title='Drama Queen', description='A story', release_date='2020-01-01'
+            )
+            cls.titled.categories.set([drama])
+            cls.others = []
+            for i in range(5):
+                movie = Movie.objects.create(
+                    title=f'Film {i}', description='Another story', release_date='2020-01-01'
+                )
+                movie.categories.set([drama])
+                cls.others.append(movie)
+
+    def setUp(self):
+        # Estadísticas y frecuencias cacheadas de otros tests
+        cache.clear()
+
+    def test_ranks_title_matches_first(self):
+        ranked = search_movies('drama')
+
+        self.assertEqual(ranked[0][0], self.titled.id)
+        self.assertEqual(len(ranked), 6)
+
+    def test_common_term_reads_only_top_postings(self):
+        with mock.patch('modules.movies.search.engine.MAX_POSTINGS_PER_TERM', 2):
+            ranked = search_movies('drama')
+
+        self.assertEqual(len(ranked), 2)
+        self.assertEqual(ranked[0][0], self.titled.id)
+
+    @skipUnless(connection.vendor == 'sqlite', "plan de consulta de SQLite")
+    def test_postings_are_read_in_impact_order_from_the_index(self):
+        queryset = MovieSearchTerm.objects.filter(term='drama').order_by('-impact').values_list(
+            'movie_id', flat=True
+        )[:10]
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            plan = ' '.join(row[-1] for row in cursor.fetchall())
 
-# Create your tests here.
+        self.assertIn('search_term_impact_idx', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
@@ -1,18 +1,25 @@
+from django.apps import apps
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _ 
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated,IsAdminUser
 from rest_framework.exceptions import PermissionDenied
+from django.db.models import Count, Q
+from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
 
-from modules.movies.models.movies import Actor
+from modules.movies.models.movies import Actor, Movie
 from modules.movies.serializers.actors import (
     ActorListSerializer,
     ActorCreateSerializer,
-    ActorUpdateSerializer
+    ActorUpdateSerializer,
+    FilmographySerializer
 )
 from modules.movies.filters.actors import ActorFilter
+from modules.common.pagination import KeysetPagination
+from modules.common.response_cache import CachedResponseMixin, cached_response
+from modules.common.views import EagerLoadingViewMixin
 
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi as oa
@@ -25,14 +32,19 @@ def get_user_fullname(user):
     full_name = f"{user.first_name} {user.last_name}".strip()
     return full_name or user.username
 
-class ActorViewSet(ModelViewSet):
+FILMOGRAPHY_CACHE_TIMEOUT = 60 * 5
+
+
+class ActorViewSet(CachedResponseMixin, EagerLoadingViewMixin, ModelViewSet):
     """
     Actor ViewSet
     """
-    queryset = Actor.objects.filter(is_active=True)
+    queryset = Actor.objects.all()
+    cache_models = (Actor,)
     serializer_class = ActorListSerializer
     permission_classes = [IsAuthenticated]
     filterset_class = ActorFilter
+    pagination_class = KeysetPagination
 
     def get_serializer_class(self):
         if self.action in ['create']:
@@ -41,6 +53,19 @@ class ActorViewSet(ModelViewSet):
             return ActorUpdateSerializer
         return self.serializer_class
     
+    def get_cache_models(self):
+        if self.action == 'filmography':
+            # Showtime es de services, que depende de movies: se resuelve por
+            # el registro de apps para no importarla desde aquí
+            return (Actor, Movie, apps.get_model('services', 'Showtime'))
+        return super().get_cache_models()
+
+    def get_cache_timeout(self):
+        # Las funciones pasan a ser pasadas con el tiempo, sin señal que lo avise
+        if self.action == 'filmography':
+            return FILMOGRAPHY_CACHE_TIMEOUT
+        return super().get_cache_timeout()
+
     def get_permissions(self):
         if self.action in ['create', 'update', 'partial_update', 'destroy']:
             self.permission_classes = [IsAdminUser]
@@ -67,20 +92,11 @@ class ActorViewSet(ModelViewSet):
             raise PermissionDenied("Usuario no autenticado")
 
     def perform_destroy(self, instance):
-        request = self.request
-        user = request.user
-
+        user = self.request.user
         if user.is_authenticated:
-            full_name = get_user_fullname(user)
-            instance.deleted_by = full_name
-            instance.deleted_date = timezone.now()
-            instance.is_active = False
-            instance.save()
+            instance.soft_delete(deleted_by=get_user_fullname(user))
         else:
-            instance.deleted_by = "Desconocido"
-            instance.deleted_date = timezone.now()
-            instance.is_active = False
-            instance.save()
+            instance.soft_delete(deleted_by="Desconocido")
     
     @swagger_auto_schema()
     def list(self, request, *args, **kwargs):
@@ -121,10 +137,27 @@ class ActorViewSet(ModelViewSet):
     def destroy(self, request, *args, **kwargs):
         try:
             instance = self.get_object()
-            instance.is_active = False
-            instance.save()
+            self.perform_destroy(instance)
             return Response(
                 {"message": "User deleted successfully"}, status=status.HTTP_200_OK
             )
         except Exception:
-            return Response({"message":"Actor not finded"},status=status.HTTP_404_NOT_FOUND)
\ No newline at end of file
+            return Response({"message":"Actor not finded"},status=status.HTTP_404_NOT_FOUND)
+
+    @swagger_auto_schema(operation_summary=_("Actor filmography with upcoming showtimes"))
+    @action(detail=True, methods=['get'], url_path='filmography')
+    @cached_response
+    def filmography(self, request, *args, **kwargs):
+        actor = self.get_object()
+        movies = actor.acted_in.annotate(
+            upcoming_showtimes=Count(
+                'showtime',
+                filter=Q(showtime__is_active=True, showtime__show_date__gte=timezone.now()),
+            )
+        ).order_by('-release_date', '-id')
+
+        data = FilmographySerializer(movies, many=True).data
+        return Response(
+            {"actor": {"id": actor.id, "name": actor.name}, "count": len(data), "results": data},
+            status=status.HTTP_200_OK,
+        )
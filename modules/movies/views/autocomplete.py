@@ -0,0 +1,49 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from modules.movies.search.autocomplete import ACTOR, MOVIE, get_index
+
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi as oa
+
+
+AUTOCOMPLETE_MAX_LIMIT = 20
+
+
+class AutocompleteView(APIView):
+    """
+    Sugerencias de títulos y actores mientras se escribe, servidas desde un
+    índice en memoria y tolerantes a erratas.
+    """
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary=_("Autocomplete movie titles and actor names"),
+        manual_parameters=[
+            oa.Parameter('q', oa.IN_QUERY, description="Texto escrito", type=oa.TYPE_STRING, required=True),
+            oa.Parameter('type', oa.IN_QUERY, description="movie | actor", type=oa.TYPE_STRING),
+            oa.Parameter('limit', oa.IN_QUERY, description="Máximo de sugerencias (20)", type=oa.TYPE_INTEGER),
+        ]
+    )
+    def get(self, request):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({"message": "El parámetro q es obligatorio"},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        kind = request.query_params.get('type') or None
+        if kind not in (None, MOVIE, ACTOR):
+            return Response({"message": "type debe ser 'movie' o 'actor'"},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            limit = min(int(request.query_params.get('limit', 10)), AUTOCOMPLETE_MAX_LIMIT)
+        except ValueError:
+            return Response({"message": "limit debe ser un número entero"},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        results = get_index().search(query, limit=max(limit, 1), kind=kind)
+        return Response({"results": results}, status=status.HTTP_200_OK)
@@ -1,18 +1,29 @@
+import io
+from django.conf import settings
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _ 
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated,IsAdminUser
 from rest_framework.exceptions import PermissionDenied
+from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
 
-from modules.movies.models.movies import Movie
+from modules.movies.models.movies import Actor, Movie, MovieCategory
 from modules.movies.serializers.movie import (
     MovieListSerializer,
     MovieCreateSerializer,
     MovieUpdateSerializer
 )
 from modules.movies.filters.movies import MovieFilter
+from modules.movies.search.engine import search_movies
+from modules.movies.facets import movie_facets
+from modules.movies.catalog_import import detect_format, import_catalog
+from modules.movies.recommendations import recommended_movies, similar_movies
+from modules.common.views import EagerLoadingViewMixin
+from modules.common.pagination import KeysetPagination
+from modules.common.response_cache import CachedResponseMixin, cached_response
 
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi as oa
@@ -24,16 +35,23 @@ def get_user_fullname(user):
     full_name = f"{user.first_name} {user.last_name}".strip()
     return full_name or user.username
 
-class MovieViewSet(ModelViewSet):
+
+SEARCH_MAX_LIMIT = 50
+RECOMMENDATION_MAX_LIMIT = 20
+
+class MovieViewSet(CachedResponseMixin, EagerLoadingViewMixin, ModelViewSet):
     """
     API endpoint that allows movies to be viewed or edited.
     """
     
-    queryset = Movie.objects.filter(is_active = True)
+    queryset = Movie.objects.all()
+    cache_models = (Movie, MovieCategory, Actor)
     serializer_class = MovieListSerializer
     permission_classes = [IsAuthenticated]
     filterset_class = MovieFilter
-    ordering_fields = ['id', 'title', 'release_date', 'genre', 'director']
+    pagination_class = KeysetPagination
+    ordering = ('-release_date', '-id')
+    ordering_fields = ['id', 'title', 'release_date']
     lookup_field = 'id'
 
     def get_serializer_class(self):
@@ -46,7 +64,7 @@ class MovieViewSet(ModelViewSet):
         return self.serializer_class
     
     def get_permissions(self):
-        if self.action in ['create', 'update', 'partial_update', 'destroy']:
+        if self.action in ['create', 'update', 'partial_update', 'destroy', 'catalog_import']:
             self.permission_classes = [IsAdminUser]
         return super().get_permissions()
     
@@ -71,24 +89,24 @@ class MovieViewSet(ModelViewSet):
             raise PermissionDenied("Usuario no autenticado")
 
     def perform_destroy(self, instance):
-        request = self.request
-        user = request.user
-
+        user = self.request.user
         if user.is_authenticated:
-            full_name = get_user_fullname(user)
-            instance.deleted_by = full_name
-            instance.deleted_date = timezone.now()
-            instance.is_active = False
-            instance.save()
+            instance.soft_delete(deleted_by=get_user_fullname(user))
         else:
-            instance.deleted_by = "Desconocido"
-            instance.deleted_date = timezone.now()
-            instance.is_active = False
-            instance.save()
+            instance.soft_delete(deleted_by="Desconocido")
 
-    @swagger_auto_schema()
+    @swagger_auto_schema(
+        manual_parameters=[
+            oa.Parameter('facets', oa.IN_QUERY, description="Incluir conteos por categoría y año",
+                         type=oa.TYPE_BOOLEAN),
+        ]
+    )
+    @cached_response
     def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
+        response = super().list(request, *args, **kwargs)
+        if request.query_params.get('facets') in ('1', 'true', 'True') and isinstance(response.data, dict):
+            response.data['facets'] = movie_facets(self.filter_queryset(self.get_queryset()))
+        return response
     
     @swagger_auto_schema()
     def retrieve(self, request, *args, **kwargs):
@@ -126,4 +144,127 @@ class MovieViewSet(ModelViewSet):
                             status=status.HTTP_204_NO_CONTENT)
         except Exception as e:
             return Response({"message": "Movie could not be deleted","errors":str(e)},
-                            status=status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
+                            status=status.HTTP_400_BAD_REQUEST)
+
+    @swagger_auto_schema(
+        operation_summary=_("Full-text movie search"),
+        manual_parameters=[
+            oa.Parameter('q', oa.IN_QUERY, description="Texto a buscar", type=oa.TYPE_STRING, required=True),
+            oa.Parameter('limit', oa.IN_QUERY, description="Máximo de resultados (50)", type=oa.TYPE_INTEGER),
+        ]
+    )
+    @action(detail=False, methods=['get'], url_path='search')
+    def search(self, request, *args, **kwargs):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({"message": "El parámetro q es obligatorio"},
+                            status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = min(int(request.query_params.get('limit', 20)), SEARCH_MAX_LIMIT)
+        except ValueError:
+            return Response({"message": "limit debe ser un número entero"},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        ranked = search_movies(query, limit=max(limit, 1))
+        movies = self.get_queryset().in_bulk(
+            [movie_id for movie_id, _score in ranked]
+        )
+
+        results = []
+        for movie_id, score in ranked:
+            if movie_id in movies:
+                data = self.get_serializer(movies[movie_id]).data
+                data['score'] = round(score, 4)
+                results.append(data)
+
+        return Response({"count": len(results), "results": results},
+                        status=status.HTTP_200_OK)
+
+    def _limit(self, request, default, maximum):
+        try:
+            return max(min(int(request.query_params.get('limit', default)), maximum), 1)
+        except ValueError:
+            return None
+
+    def _ranked_response(self, ranked, extra):
+        movies = self.get_queryset().in_bulk([row[0] for row in ranked])
+        results = []
+        for row in ranked:
+            if row[0] in movies:
+                data = self.get_serializer(movies[row[0]]).data
+                data.update(extra(row))
+                results.append(data)
+        return Response({"count": len(results), "results": results},
+                        status=status.HTTP_200_OK)
+
+    @swagger_auto_schema(
+        operation_summary=_("Similar movies"),
+        manual_parameters=[
+            oa.Parameter('limit', oa.IN_QUERY, description="Máximo de resultados (20)", type=oa.TYPE_INTEGER),
+        ]
+    )
+    @action(detail=True, methods=['get'], url_path='similar')
+    def similar(self, request, *args, **kwargs):
+        movie = self.get_object()
+        limit = self._limit(request, 10, RECOMMENDATION_MAX_LIMIT)
+        if limit is None:
+            return Response({"message": "limit debe ser un número entero"},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        ranked = similar_movies(movie.id, limit=limit)
+        return self._ranked_response(ranked, lambda row: {'score': round(row[1], 4)})
+
+    @swagger_auto_schema(
+        operation_summary=_("Because you watched"),
+        manual_parameters=[
+            oa.Parameter('limit', oa.IN_QUERY, description="Máximo de resultados (20)", type=oa.TYPE_INTEGER),
+        ]
+    )
+    @action(detail=False, methods=['get'], url_path='recommended')
+    def recommended(self, request, *args, **kwargs):
+        limit = self._limit(request, 10, RECOMMENDATION_MAX_LIMIT)
+        if limit is None:
+            return Response({"message": "limit debe ser un número entero"},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        ranked = recommended_movies(request.user, limit=limit)
+        return self._ranked_response(
+            ranked, lambda row: {'score': round(row[1], 4), 'because': row[2]}
+        )
+
+    @swagger_auto_schema(
+        operation_summary=_("Bulk catalog import"),
+        manual_parameters=[
+            oa.Parameter('file', oa.IN_FORM, description="Catálogo JSONL o CSV", type=oa.TYPE_FILE, required=True),
+            oa.Parameter('format', oa.IN_FORM, description="jsonl | csv (por defecto, según la extensión)",
+                         type=oa.TYPE_STRING),
+        ]
+    )
+    @action(detail=False, methods=['post'], url_path='import', parser_classes=[MultiPartParser])
+    def catalog_import(self, request, *args, **kwargs):
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({"message": "El fichero es obligatorio"},
+                            status=status.HTTP_400_BAD_REQUEST)
+        max_size = getattr(settings, 'CATALOG_IMPORT_MAX_UPLOAD_SIZE', 5 * 1024 * 1024)
+        if upload.size > max_size:
+            # Los catálogos grandes no se importan dentro de una petición
+            return Response(
+                {"message": "Fichero demasiado grande para importarlo por la API; "
+                            "usa el comando import_catalog"},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            )
+        fmt = request.data.get('format') or detect_format(upload.name)
+        if fmt not in ('jsonl', 'csv'):
+            return Response({"message": "Formato no soportado; usa jsonl o csv"},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        # El fichero subido se lee por líneas, sin cargarlo en memoria
+        stream = io.TextIOWrapper(upload.file, encoding='utf-8', newline='')
+        try:
+            report = import_catalog(stream, fmt, created_by=get_user_fullname(request.user))
+        except UnicodeDecodeError:
+            return Response({"message": "El fichero debe estar codificado en UTF-8"},
+                            status=status.HTTP_400_BAD_REQUEST)
+        return Response({"message": "Catalog imported", "data": report.as_dict()},
+                        status=status.HTTP_200_OK)
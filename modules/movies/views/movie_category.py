@@ -13,6 +13,9 @@ from modules.movies.serializers.movie_category import (
     MovieCategoryUpdateSerializer
 )
 from modules.movies.filters.movie_category import MovieCategoryFilter
+from modules.common.pagination import KeysetPagination
+from modules.common.response_cache import CachedResponseMixin
+from modules.common.views import EagerLoadingViewMixin
 
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi as oa
@@ -23,14 +26,16 @@ def get_user_fullname(user):
     full_name = f"{user.first_name} {user.last_name}".strip()
     return full_name or user.username
 
-class MovieCategoryViewSet(ModelViewSet):
+class MovieCategoryViewSet(CachedResponseMixin, EagerLoadingViewMixin, ModelViewSet):
     """
     API endpoint that allows MovieCategory to be viewed or edited.
     """
-    queryset = MovieCategory.objects.filter(is_active=True)
+    queryset = MovieCategory.objects.all()
+    cache_models = (MovieCategory,)
     permission_classes = [IsAuthenticated]
     serializer_class = MovieCategoryListSerializer
     filterset_class = MovieCategoryFilter
+    pagination_class = KeysetPagination
 
     def get_serializer_class(self):
         if self.action in ['list', 'retrieve']:
@@ -66,20 +71,11 @@ class MovieCategoryViewSet(ModelViewSet):
             raise PermissionDenied("Usuario no autenticado")
 
     def perform_destroy(self, instance):
-        request = self.request
-        user = request.user
-
+        user = self.request.user
         if user.is_authenticated:
-            full_name = get_user_fullname(user)
-            instance.deleted_by = full_name
-            instance.deleted_date = timezone.now()
-            instance.is_active = False
-            instance.save()
+            instance.soft_delete(deleted_by=get_user_fullname(user))
         else:
-            instance.deleted_by = "Desconocido"
-            instance.deleted_date = timezone.now()
-            instance.is_active = False
-            instance.save()
+            instance.soft_delete(deleted_by="Desconocido")
 
     @swagger_auto_schema()
     def list(self, request, *args, **kwargs):
@@ -1,10 +1,16 @@
 from django.contrib import admin
+from modules.common.admin import SoftDeleteAdmin
 from modules.services.models.reservation import Reservation,Seat,ReservationGroup 
 from modules.services.models.showtime import Showtime
+from modules.services.models.now_playing import NowPlaying
+from modules.services.models.archive import ShowtimeOccupancy, ArchivedReservation
 
 # Register your models here.
 
 admin.site.register(Reservation)
-admin.site.register(Showtime)  
+admin.site.register(Showtime, SoftDeleteAdmin)
 admin.site.register(Seat)
 admin.site.register(ReservationGroup)
+admin.site.register(NowPlaying)
+admin.site.register(ShowtimeOccupancy)
+admin.site.register(ArchivedReservation)
@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class ServicesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'modules.services'
+
+    def ready(self):
+        from modules.services import signals  # noqa: F401
+        from modules.movies.recommendations import register_viewing_source
+        from modules.services.viewings import ReservationViewings
+
+        register_viewing_source(ReservationViewings())
@@ -0,0 +1,120 @@
+import time
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from modules.common.utils import delete_in_chunks
+from modules.services.models.archive import ArchivedReservation, ShowtimeOccupancy
+from modules.services.models.reservation import Reservation, ReservationGroup, Seat
+from modules.services.models.showtime import Showtime
+
+
+def pending_showtimes(cutoff):
+    return Showtime.all_objects.filter(
+        show_date__lt=cutoff, occupancy__isnull=True
+    ).order_by('id')
+
+
+def archive_showtimes(showtime_ids):
+    """
+    Archiva un lote de funciones: copia sus reservas a ArchivedReservation,
+    resume sus asientos en ShowtimeOccupancy y borra las filas activas.
+    Debe llamarse dentro de la transacción que bloqueó esas funciones.
+    """
+    seats = {
+        row['showtime_id']: row
+        for row in Seat.objects.filter(showtime_id__in=showtime_ids).values(
+            'showtime_id'
+        ).annotate(
+            total=Count('id'),
+            reserved=Count('id', filter=Q(is_reserved=True)),
+        )
+    }
+
+    reservations = Reservation.objects.filter(
+        seat__showtime_id__in=showtime_ids
+    ).values(
+        'user_id', 'group_id', 'seat__showtime_id',
+        'seat__row', 'seat__number', 'reserved_at'
+    )
+    archived = [
+        ArchivedReservation(
+            user_id=row['user_id'],
+            showtime_id=row['seat__showtime_id'],
+            group_id=row['group_id'],
+            row=row['seat__row'],
+            number=row['seat__number'],
+            reserved_at=row['reserved_at'],
+        )
+        for row in reservations
+    ]
+
+    per_showtime = {}
+    for entry in archived:
+        per_showtime[entry.showtime_id] = per_showtime.get(entry.showtime_id, 0) + 1
+
+    summaries = [
+        ShowtimeOccupancy(
+            showtime_id=showtime_id,
+            total_seats=seats.get(showtime_id, {}).get('total', 0),
+            reserved_seats=max(
+                seats.get(showtime_id, {}).get('reserved', 0),
+                per_showtime.get(showtime_id, 0),
+            ),
+            reservations=per_showtime.get(showtime_id, 0),
+        )
+        for showtime_id in showtime_ids
+    ]
+
+    ArchivedReservation.objects.bulk_create(archived)
+    ShowtimeOccupancy.objects.bulk_create(summaries)
+    for queryset in (
+        Reservation.objects.filter(seat__showtime_id__in=showtime_ids),
+        ReservationGroup.objects.filter(showtime_id__in=showtime_ids),
+        Seat.objects.filter(showtime_id__in=showtime_ids),
+    ):
+        delete_in_chunks(queryset)
+
+    return len(archived)
+
+
+def archive_batch(cutoff, batch_size=200):
+    """
+    Archiva un lote en una sola transacción. Los candidatos se leen y se
+    bloquean dentro de ella, y el corte se vuelve a aplicar en esa lectura:
+    una función reprogramada a una fecha posterior entre tanto queda fuera.
+    Devuelve (funciones, reservas).
+    """
+    with transaction.atomic():
+        ids = list(
+            pending_showtimes(cutoff)
+            .select_for_update(skip_locked=True, of=('self',))
+            .values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            return 0, 0
+        return len(ids), archive_showtimes(ids)
+
+
+def archive_finished_showtimes(older_than=timedelta(days=90), batch_size=200,
+                               max_batches=None, pause=0):
+    """
+    Archiva por lotes acotados las funciones terminadas antes del corte.
+    Cada lote es una transacción corta para no bloquear las tablas activas.
+    """
+    cutoff = timezone.now() - older_than
+    batches = showtimes = reservations = 0
+
+    while max_batches is None or batches < max_batches:
+        archived, archived_reservations = archive_batch(cutoff, batch_size)
+        if not archived:
+            break
+        reservations += archived_reservations
+        showtimes += archived
+        batches += 1
+        if pause:
+            time.sleep(pause)
+
+    return {'batches': batches, 'showtimes': showtimes, 'reservations': reservations}
@@ -0,0 +1,71 @@
+from collections import OrderedDict
+from datetime import date, datetime, time
+
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from modules.common.cache import get_version
+from modules.services.models.showtime import Showtime
+
+
+def month_bounds(month):
+    first = date(month.year, month.month, 1)
+    if month.month == 12:
+        following = date(month.year + 1, 1, 1)
+    else:
+        following = date(month.year, month.month + 1, 1)
+    start = timezone.make_aware(datetime.combine(first, time.min))
+    end = timezone.make_aware(datetime.combine(following, time.min))
+    return start, end
+
+
+def calendar_version_namespaces(movie_id=None, cinema_id=None):
+    namespaces = []
+    if movie_id is not None:
+        namespaces.append(f'showtimes:movie:{movie_id}')
+    if cinema_id is not None:
+        namespaces.append(f'showtimes:cinema:{cinema_id}')
+    return namespaces
+
+
+def calendar_cache_key(month, movie_id=None, cinema_id=None):
+    versions = '.'.join(
+        str(get_version(namespace))
+        for namespace in calendar_version_namespaces(movie_id, cinema_id)
+    )
+    return f'calendar:{month:%Y-%m}:{movie_id}:{cinema_id}:{versions}'
+
+
+def availability_calendar(month, movie_id=None, cinema_id=None):
+    """
+    Disponibilidad de un mes (días x cines) con una sola consulta agrupada.
+    """
+    start, end = month_bounds(month)
+    showtimes = Showtime.objects.filter(
+        is_active=True, show_date__gte=start, show_date__lt=end
+    )
+    if movie_id is not None:
+        showtimes = showtimes.filter(movie_id=movie_id)
+    if cinema_id is not None:
+        showtimes = showtimes.filter(screening_room__cinema_id=cinema_id)
+
+    rows = showtimes.annotate(
+        day=TruncDate('show_date')
+    ).values(
+        'day', 'screening_room__cinema_id', 'screening_room__cinema__name'
+    ).annotate(
+        showtimes=Count('id', distinct=True),
+        free_seats=Count('seats', filter=Q(seats__is_reserved=False)),
+    ).order_by('day', 'screening_room__cinema_id')
+
+    days = OrderedDict()
+    for row in rows:
+        days.setdefault(row['day'], []).append({
+            'id': row['screening_room__cinema_id'],
+            'name': row['screening_room__cinema__name'],
+            'showtimes': row['showtimes'],
+            'free_seats': row['free_seats'],
+        })
+
+    return [{'day': day, 'cinemas': cinemas} for day, cinemas in days.items()]
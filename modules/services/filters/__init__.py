@@ -0,0 +1 @@
+from modules.services.filters.showtime import ShowtimeFilter
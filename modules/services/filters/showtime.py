@@ -0,0 +1,44 @@
+import django_filters
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from modules.services.models.showtime import Showtime
+from modules.services.models.reservation import Seat
+from modules.movies.models.movies import Movie
+
+
+class ShowtimeFilter(django_filters.FilterSet):
+    date_from = django_filters.IsoDateTimeFilter(
+        field_name='show_date', lookup_expr='gte'
+    )
+    date_to = django_filters.IsoDateTimeFilter(
+        field_name='show_date', lookup_expr='lte'
+    )
+    movie = django_filters.NumberFilter(field_name='movie_id')
+    cinema = django_filters.NumberFilter(field_name='screening_room__cinema_id')
+    screening_room = django_filters.NumberFilter(field_name='screening_room_id')
+    category = django_filters.NumberFilter(method='filter_category')
+    free_seats = django_filters.NumberFilter(method='filter_free_seats')
+
+    class Meta:
+        model = Showtime
+        fields = [
+            'date_from', 'date_to', 'movie', 'cinema',
+            'screening_room', 'category', 'free_seats'
+        ]
+
+    def filter_category(self, queryset, name, value):
+        # Subconsulta sobre la tabla intermedia: evita el JOIN + DISTINCT
+        movie_ids = Movie.categories.through.objects.filter(
+            moviecategory_id=value
+        ).values('movie_id')
+        return queryset.filter(movie_id__in=movie_ids)
+
+    def filter_free_seats(self, queryset, name, value):
+        free = Seat.objects.filter(
+            showtime=OuterRef('pk'), is_reserved=False
+        ).values('showtime').annotate(total=Count('id')).values('total')
+        # Las archivadas no tienen asientos: se usa su resumen de ocupación
+        archived = F('occupancy__total_seats') - F('occupancy__reserved_seats')
+        return queryset.annotate(
+            free_seats=Coalesce(Subquery(free), archived, Value(0))
+        ).filter(free_seats__gte=value)
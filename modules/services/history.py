@@ -0,0 +1,65 @@
+from django.db.models import BooleanField, Count, Q, Value
+
+from modules.services.models.archive import ArchivedReservation, ShowtimeOccupancy
+from modules.services.models.reservation import Reservation, Seat
+
+
+def history_entry(row):
+    showtime_id, movie, show_date, seat_row, number, reserved_at, archived = row
+    return {
+        'showtime': showtime_id,
+        'movie': movie,
+        'show_date': show_date,
+        'seat': f"{seat_row}{number}",
+        'reserved_at': reserved_at,
+        'archived': archived,
+    }
+
+
+def reservation_history(user):
+    """
+    Historial de reservas del usuario, uniendo las tablas activas y el archivo
+    en una sola consulta (UNION ALL) ordenada por fecha de la función, de modo
+    que se pagina en la base de datos. Cada fila se formatea con history_entry.
+    """
+    live = Reservation.objects.filter(user=user).values_list(
+        'seat__showtime_id', 'seat__showtime__movie__title',
+        'seat__showtime__show_date', 'seat__row', 'seat__number', 'reserved_at',
+        Value(False, output_field=BooleanField()),
+    )
+    archived = ArchivedReservation.objects.filter(user=user).values_list(
+        'showtime_id', 'showtime__movie__title',
+        'showtime__show_date', 'row', 'number', 'reserved_at',
+        Value(True, output_field=BooleanField()),
+    )
+    return live.union(archived, all=True).order_by(
+        '-seat__showtime__show_date', '-reserved_at'
+    )
+
+
+def showtime_occupancy(showtime):
+    """
+    Ocupación de una función, desde el resumen si está archivada o
+    calculada sobre los asientos activos si no.
+    """
+    summary = ShowtimeOccupancy.objects.filter(showtime=showtime).first()
+    if summary:
+        return {
+            'showtime': showtime.id,
+            'total_seats': summary.total_seats,
+            'reserved_seats': summary.reserved_seats,
+            'free_seats': summary.free_seats,
+            'archived': True,
+        }
+
+    counts = Seat.objects.filter(showtime=showtime).aggregate(
+        total=Count('id'),
+        reserved=Count('id', filter=Q(is_reserved=True)),
+    )
+    return {
+        'showtime': showtime.id,
+        'total_seats': counts['total'],
+        'reserved_seats': counts['reserved'],
+        'free_seats': counts['total'] - counts['reserved'],
+        'archived': False,
+    }
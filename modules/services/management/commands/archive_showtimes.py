@@ -0,0 +1,29 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from modules.services.archive import archive_finished_showtimes
+
+
+class Command(BaseCommand):
+    help = "Archiva las funciones terminadas y compacta sus asientos y reservas."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=90,
+                            help="Antigüedad mínima de la función en días.")
+        parser.add_argument('--batch-size', type=int, default=200)
+        parser.add_argument('--max-batches', type=int, default=None)
+        parser.add_argument('--pause', type=float, default=0,
+                            help="Segundos de espera entre lotes.")
+
+    def handle(self, *args, **options):
+        result = archive_finished_showtimes(
+            older_than=timedelta(days=options['days']),
+            batch_size=options['batch_size'],
+            max_batches=options['max_batches'],
+            pause=options['pause'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"{result['showtimes']} funciones archivadas en {result['batches']} lotes "
+            f"({result['reservations']} reservas)."
+        ))
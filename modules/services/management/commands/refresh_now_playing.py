@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from modules.services.now_playing import roll_now_playing
+
+
+class Command(BaseCommand):
+    help = (
+        "Avanza la proyección de cartelera (now playing): borra los días pasados "
+        "y recalcula los próximos. Pensado para ejecutarse cada día tras la "
+        "medianoche (cron), p. ej. `5 0 * * * manage.py refresh_now_playing`."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=7)
+
+    def handle(self, *args, **options):
+        pruned, total = roll_now_playing(days=options['days'])
+        self.stdout.write(self.style.SUCCESS(
+            f"{pruned} entradas pasadas borradas, {total} entradas de cartelera recalculadas."
+        ))
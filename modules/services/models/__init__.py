@@ -1,2 +1,4 @@
 from modules.services.models.reservation import Reservation
-from modules.services.models.showtime import Showtime
\ No newline at end of file
+from modules.services.models.showtime import Showtime
+from modules.services.models.now_playing import NowPlaying
+from modules.services.models.archive import ShowtimeOccupancy, ArchivedReservation
@@ -0,0 +1,54 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+from modules.manager.models import User
+from modules.services.models.showtime import Showtime
+
+
+class ShowtimeOccupancy(models.Model):
+    """
+    Resumen de ocupación de una función archivada. Sustituye a sus filas de
+    Seat, que se eliminan de la tabla activa al compactar.
+    """
+    showtime = models.OneToOneField(
+        Showtime,
+        on_delete=models.CASCADE,
+        related_name='occupancy'
+    )
+    total_seats = models.PositiveIntegerField(_('Total Seats'), default=0)
+    reserved_seats = models.PositiveIntegerField(_('Reserved Seats'), default=0)
+    reservations = models.PositiveIntegerField(_('Reservations'), default=0)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = _('Showtime Occupancy')
+        verbose_name_plural = _('Showtime Occupancies')
+
+    @property
+    def free_seats(self):
+        return max(self.total_seats - self.reserved_seats, 0)
+
+    def __str__(self):
+        return f"{self.showtime_id}: {self.reserved_seats}/{self.total_seats}"
+
+
+class ArchivedReservation(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    showtime = models.ForeignKey(
+        Showtime,
+        on_delete=models.CASCADE,
+        related_name='archived_reservations'
+    )
+    group_id = models.PositiveBigIntegerField(null=True, blank=True)
+    row = models.CharField(_('Row'), max_length=5)
+    number = models.PositiveIntegerField(_('Number'))
+    reserved_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name = _('Archived Reservation')
+        verbose_name_plural = _('Archived Reservations')
+        indexes = [
+            models.Index(fields=['user', 'reserved_at'], name='archived_res_user_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} - {self.row}{self.number} - {self.showtime_id}"
@@ -0,0 +1,37 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+from modules.cinema.models.cinema import Cinema
+from modules.movies.models.movies import Movie
+
+
+class NowPlaying(models.Model):
+    """
+    Proyección precalculada de la cartelera: una fila por (cine, día, película).
+    Se mantiene desde las señales de funciones y reservas.
+    """
+    cinema = models.ForeignKey(
+        Cinema,
+        on_delete=models.CASCADE,
+        related_name='now_playing'
+    )
+    day = models.DateField(_('Day'))
+    movie = models.ForeignKey(
+        Movie,
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    first_show = models.DateTimeField(_('First Show'))
+    showtimes = models.PositiveIntegerField(_('Showtimes'), default=0)
+    free_seats = models.PositiveIntegerField(_('Free Seats'), default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = _('Now Playing')
+        verbose_name_plural = _('Now Playing')
+        unique_together = ('cinema', 'day', 'movie')
+        indexes = [
+            models.Index(fields=['day', 'cinema'], name='nowplaying_day_cinema_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.cinema_id} - {self.day} - {self.movie_id}"
@@ -16,6 +16,9 @@ class Seat(models.Model):
 
     class Meta:
         unique_together = ('showtime', 'row', 'number')
+        indexes = [
+            models.Index(fields=['showtime', 'is_reserved'], name='seat_showtime_reserved_idx'),
+        ]
 
     def __str__(self):
         return f"{self.row}{self.number} - {self.showtime}"
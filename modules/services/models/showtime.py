@@ -1,4 +1,5 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Q
 from django.utils.translation import gettext_lazy as _
 from modules.cinema.models.screening_room import ScreeningRoom
 from modules.movies.models.movies import Movie
@@ -15,10 +16,29 @@ class Showtime(AuditableMixins):
     show_date = models.DateTimeField(_("Show Date and Time"))
     is_active = models.BooleanField(default=True)
 
+    class Meta(AuditableMixins.Meta):
+        indexes = [
+            # Búsqueda típica: película X cerca de la fecha Y
+            models.Index(fields=['movie', 'show_date'], name='showtime_movie_date_idx'),
+            # Filtro por cine/sala ordenado por fecha
+            models.Index(fields=['screening_room', 'show_date'], name='showtime_room_date_idx'),
+            # Índice parcial: sólo funciones activas, que es lo que se lista
+            models.Index(
+                fields=['show_date'],
+                condition=Q(is_active=True),
+                name='showtime_active_date_idx',
+            ),
+        ]
 
     @property
     def available_seats(self):
+        from modules.services.models.archive import ShowtimeOccupancy
         from modules.services.models.reservation import Reservation
+        # Una función archivada ya no tiene asientos ni reservas: su resumen manda
+        try:
+            return self.occupancy.free_seats
+        except ShowtimeOccupancy.DoesNotExist:
+            pass
         reserved = Reservation.objects.filter(seat__showtime=self).count()
         return self.screening_room.capacity - reserved
 
@@ -31,9 +51,10 @@ class Showtime(AuditableMixins):
 
     def save(self, *args, **kwargs):
         creating = not self.pk
-        super().save(*args, **kwargs)
-        if creating:
-            self._create_seats()
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if creating:
+                self._create_seats()
 
     def _create_seats(self):
         from modules.services.models.reservation import Seat
@@ -41,10 +62,8 @@ class Showtime(AuditableMixins):
         capacity = self.screening_room.capacity
         per_row = capacity // len(rows)
 
-        for row in rows:
-            for number in range(1, per_row + 1):
-                Seat.objects.create(
-                    showtime=self,
-                    row=row,
-                    number=number
-                )
\ No newline at end of file
+        Seat.objects.bulk_create([
+            Seat(showtime=self, row=row, number=number)
+            for row in rows
+            for number in range(1, per_row + 1)
+        ])
\ No newline at end of file
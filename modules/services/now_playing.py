@@ -0,0 +1,91 @@
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Count, Min, Q
+from django.utils import timezone
+
+from modules.common.utils import OnCommitBatch
+from modules.services.models.now_playing import NowPlaying
+from modules.services.models.showtime import Showtime
+
+
+def day_bounds(day):
+    start = timezone.make_aware(datetime.combine(day, time.min))
+    return start, start + timedelta(days=1)
+
+
+def showtime_day(show_date):
+    return timezone.localtime(show_date).date()
+
+
+def refresh_now_playing(day, cinema_id=None):
+    """
+    Recalcula la cartelera de un día (y opcionalmente de un solo cine)
+    con una única consulta agrupada y reemplaza las filas de la proyección.
+    """
+    start, end = day_bounds(day)
+    showtimes = Showtime.objects.filter(
+        is_active=True, show_date__gte=start, show_date__lt=end
+    )
+    if cinema_id is not None:
+        showtimes = showtimes.filter(screening_room__cinema_id=cinema_id)
+
+    rows = showtimes.values('screening_room__cinema_id', 'movie_id').annotate(
+        first_show=Min('show_date'),
+        total=Count('id', distinct=True),
+        free=Count('seats', filter=Q(seats__is_reserved=False)),
+    )
+    entries = [
+        NowPlaying(
+            cinema_id=row['screening_room__cinema_id'],
+            day=day,
+            movie_id=row['movie_id'],
+            first_show=row['first_show'],
+            showtimes=row['total'],
+            free_seats=row['free'],
+        )
+        for row in rows
+    ]
+
+    stale = NowPlaying.objects.filter(day=day)
+    if cinema_id is not None:
+        stale = stale.filter(cinema_id=cinema_id)
+
+    with transaction.atomic():
+        stale.delete()
+        NowPlaying.objects.bulk_create(entries)
+    return len(entries)
+
+
+def rebuild_now_playing(days=7, start=None):
+    start = start or timezone.localdate()
+    total = 0
+    for offset in range(days):
+        total += refresh_now_playing(start + timedelta(days=offset))
+    return total
+
+
+def roll_now_playing(days=7):
+    """
+    Avance diario de la proyección: borra los días pasados y recalcula la
+    ventana que empieza hoy, incluido el día que acaba de entrar en ella.
+    """
+    today = timezone.localdate()
+    pruned, _ = NowPlaying.objects.filter(day__lt=today).delete()
+    return pruned, rebuild_now_playing(days=days, start=today)
+
+
+def _refresh_slots(slots):
+    for day, cinema_id in sorted(slots):
+        refresh_now_playing(day, cinema_id)
+
+
+_pending_refreshes = OnCommitBatch(_refresh_slots)
+
+
+def schedule_refresh(day, cinema_id):
+    """
+    Programa el recálculo de un (día, cine) al confirmar la transacción.
+    Varias modificaciones dentro de la misma transacción se agrupan en uno.
+    """
+    _pending_refreshes.add((day, cinema_id))
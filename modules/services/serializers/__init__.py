@@ -4,4 +4,5 @@ from modules.services.serializers.showtime import (
     ShowtimeUpdateSerializer
 )
 from modules.services.serializers.seat import *
-from modules.services.serializers.reservation import *
\ No newline at end of file
+from modules.services.serializers.reservation import *
+from modules.services.serializers.now_playing import NowPlayingSerializer
@@ -0,0 +1,11 @@
+from rest_framework import serializers
+from modules.services.models.now_playing import NowPlaying
+
+
+class NowPlayingSerializer(serializers.ModelSerializer):
+    id = serializers.IntegerField(source='movie_id')
+    title = serializers.CharField(source='movie.title')
+
+    class Meta:
+        model = NowPlaying
+        fields = ['id', 'title', 'first_show', 'showtimes', 'free_seats']
@@ -1,3 +1,4 @@
+from django.db import transaction
 from rest_framework import serializers
 from django.utils.translation import gettext_lazy as _
 from modules.services.models.showtime import Showtime
@@ -67,15 +68,18 @@ class ReservationCreateSerializer(serializers.ModelSerializer):
         available_seats = validated_data.pop('available_seats')
         user = self.context['request'].user
 
-        # Crear o obtener el grupo de reservas
-        group, created = ReservationGroup.objects.get_or_create(
-            user=user,
-            showtime=validated_data['seat__showtime']
-        )
+        # Una sola transacción: la cartelera y las versiones de caché se
+        # recalculan una vez al confirmar, no por cada asiento
+        with transaction.atomic():
+            # Crear o obtener el grupo de reservas
+            group, created = ReservationGroup.objects.get_or_create(
+                user=user,
+                showtime=validated_data['seat__showtime']
+            )
 
-        # Crear las reservas individuales
-        for seat in available_seats:
-            Reservation.objects.create(group=group, seat=seat)
+            # Crear las reservas individuales
+            for seat in available_seats:
+                Reservation.objects.create(group=group, seat=seat)
 
         return group
     
@@ -121,7 +125,8 @@ class ReservationUpdateSerializer(serializers.ModelSerializer):
         available_seats = validated_data['available_seats']
         showtime = validated_data['showtime']
 
-        for seat in available_seats:
-            Reservation.objects.create(group=instance, seat=seat)
+        with transaction.atomic():
+            for seat in available_seats:
+                Reservation.objects.create(group=instance, seat=seat)
 
         return instance
\ No newline at end of file
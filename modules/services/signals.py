@@ -0,0 +1,88 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from modules.common.cache import bump_version
+from modules.common.models import bulk_active_changed
+from modules.common.utils import OnCommitBatch
+from modules.services.calendar import calendar_version_namespaces
+from modules.services.models.reservation import Reservation, Seat
+from modules.services.models.showtime import Showtime
+from modules.services.now_playing import schedule_refresh, showtime_day
+
+
+def _bump_versions(namespaces):
+    for namespace in sorted(namespaces):
+        bump_version(namespace)
+
+
+# Tras el commit, para que nadie cachee bajo la versión nueva datos aún sin confirmar
+_pending_bumps = OnCommitBatch(_bump_versions)
+
+
+def _slot_changed(show_date, cinema_id, movie_id):
+    schedule_refresh(showtime_day(show_date), cinema_id)
+    _pending_bumps.add(*calendar_version_namespaces(movie_id, cinema_id))
+
+
+def _showtime_changed(showtime):
+    _slot_changed(
+        showtime.show_date,
+        showtime.screening_room.cinema_id,
+        showtime.movie_id,
+    )
+
+
+@receiver(pre_save, sender=Showtime)
+def remember_previous_slot(sender, instance, **kwargs):
+    instance._previous_slot = None
+    if instance.pk:
+        previous = Showtime.all_objects.filter(pk=instance.pk).values(
+            'show_date', 'screening_room__cinema_id', 'movie_id'
+        ).first()
+        if previous:
+            instance._previous_slot = (
+                previous['show_date'],
+                previous['screening_room__cinema_id'],
+                previous['movie_id'],
+            )
+
+
+@receiver(post_save, sender=Showtime)
+def refresh_showtime_slot(sender, instance, **kwargs):
+    previous = getattr(instance, '_previous_slot', None)
+    if previous:
+        _slot_changed(*previous)
+    _showtime_changed(instance)
+
+
+@receiver(post_delete, sender=Showtime)
+def refresh_deleted_showtime_slot(sender, instance, **kwargs):
+    _showtime_changed(instance)
+
+
+@receiver(bulk_active_changed, sender=Showtime)
+def refresh_bulk_showtime_slots(sender, pks, **kwargs):
+    # soft_delete()/restore() del queryset usan update(): sin esto la
+    # cartelera seguiría mostrando (u ocultando) esas funciones
+    slots = Showtime.all_objects.filter(pk__in=pks).values_list(
+        'show_date', 'screening_room__cinema_id', 'movie_id'
+    ).distinct()
+    for slot in slots:
+        _slot_changed(*slot)
+
+
+@receiver(post_save, sender=Seat)
+def refresh_seat_slot(sender, instance, created, **kwargs):
+    # Los asientos nuevos se crean junto con la función, que ya programa el recálculo
+    if not created:
+        _showtime_changed(instance.showtime)
+
+
+@receiver(post_save, sender=Reservation)
+@receiver(post_delete, sender=Reservation)
+def refresh_reservation_slot(sender, instance, **kwargs):
+    try:
+        showtime = instance.seat.showtime
+    except (Seat.DoesNotExist, Showtime.DoesNotExist):
+        return
+    _showtime_changed(showtime)
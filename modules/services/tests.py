@@ -1,3 +1,90 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.db import transaction
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from modules.cinema.models import Cinema, ScreeningRoom
+from modules.manager.models import User
+from modules.movies.models import Movie
+from modules.services.archive import archive_showtimes
+from modules.services.models import NowPlaying, Reservation, Showtime
+from modules.services.models.reservation import ReservationGroup, Seat
+
+
+class ServicesTestData:
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='user@example.com', password='secret-pass')
+        cinema = Cinema.objects.create(name='Centro', address='Calle 1', total_seats=30)
+        cls.room = ScreeningRoom.objects.create(cinema=cinema, room_number=1, capacity=30)
+        cls.movie = Movie.objects.create(title='Movie', release_date='2020-01-01')
+        cls.showtime = Showtime.objects.create(
+            movie=cls.movie, screening_room=cls.room,
+            show_date=timezone.now() + timedelta(days=1),
+        )
+
+    def reserve(self, quantity):
+        group = ReservationGroup.objects.create(user=self.user, showtime=self.showtime)
+        for seat in Seat.objects.filter(showtime=self.showtime, is_reserved=False)[:quantity]:
+            seat.is_reserved = True
+            seat.save(update_fields=['is_reserved'])
+            Reservation.objects.create(group=group, user=self.user, seat=seat)
+        return group
+
+
+class NowPlayingRefreshTests(ServicesTestData, TestCase):
+    def test_reservation_in_a_transaction_refreshes_once(self):
+        with mock.patch(
+            'modules.services.now_playing.refresh_now_playing'
+        ) as refresh, self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                self.reserve(3)
+
+        refresh.assert_called_once_with(
+            timezone.localtime(self.showtime.show_date).date(), self.room.cinema_id
+        )
+
+    def test_refresh_survives_rolled_back_savepoint(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                try:
+                    with transaction.atomic():
+                        self.reserve(2)
+                        raise ValueError
+                except ValueError:
+                    pass
+                self.reserve(1)
+
+        entry = NowPlaying.objects.get(movie=self.movie)
+        self.assertEqual(entry.free_seats, 29)
+
+
+class ArchivedShowtimeTests(ServicesTestData, TestCase):
+    def archive(self):
+        with transaction.atomic():
+            archive_showtimes([self.showtime.pk])
+
+    def test_archived_showtime_reports_archived_occupancy(self):
+        self.reserve(3)
+        self.archive()
+
+        showtime = Showtime.objects.select_related('occupancy').get(pk=self.showtime.pk)
+        self.assertFalse(Seat.objects.filter(showtime=showtime).exists())
+        self.assertEqual(showtime.available_seats, 27)
+        self.assertFalse(showtime.is_full)
+
+    def test_archived_showtime_in_list_and_free_seats_filter(self):
+        self.reserve(3)
+        self.archive()
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        response = client.get('/api/showtimes/', {'free_seats': 27})
 
-# Create your tests here.
+        self.assertEqual(response.status_code, 200)
+        [entry] = response.data['results']
+        self.assertEqual(entry['available_seats'], 27)
+        self.assertFalse(client.get('/api/showtimes/', {'free_seats': 28}).data['results'])
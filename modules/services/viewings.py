@@ -0,0 +1,28 @@
+from modules.movies.recommendations import ViewingSource
+from modules.services.models.archive import ArchivedReservation
+from modules.services.models.reservation import ReservationGroup
+
+
+class ReservationViewings(ViewingSource):
+    """Historial de visionado a partir de las reservas activas y archivadas."""
+
+    def viewings(self, movie_ids=None, user_ids=None):
+        sources = []
+        for queryset in (ReservationGroup.objects.all(), ArchivedReservation.objects.all()):
+            if movie_ids is not None:
+                queryset = queryset.filter(showtime__movie_id__in=movie_ids)
+            if user_ids is not None:
+                queryset = queryset.filter(user_id__in=user_ids)
+            sources.append(queryset.values_list('user_id', 'showtime__movie_id'))
+        return sources[0].union(sources[1])
+
+    def watched(self, user):
+        live = ReservationGroup.objects.filter(user=user).values_list(
+            'showtime__movie_id', 'created_at'
+        )
+        archived = ArchivedReservation.objects.filter(user=user).values_list(
+            'showtime__movie_id', 'reserved_at'
+        )
+        return list(dict.fromkeys(
+            movie_id for movie_id, _date in live.union(archived, all=True).order_by('-created_at')
+        ))
@@ -1,3 +1,4 @@
 from modules.services.views.showtime import ShowtimeViewSet
 from modules.services.views.reservation import ReservationViewSet
-from modules.services.views.map import SeatMapView
\ No newline at end of file
+from modules.services.views.map import SeatMapView
+from modules.services.views.now_playing import NowPlayingView
@@ -0,0 +1,74 @@
+from collections import OrderedDict
+from datetime import timedelta
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
+
+from modules.services.models.now_playing import NowPlaying
+from modules.services.serializers.now_playing import NowPlayingSerializer
+
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi as oa
+
+
+MAX_DAYS = 14
+
+
+@swagger_auto_schema(tags=["Showtimes"])
+class NowPlayingView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary=_("Cartelera por cine y día"),
+        manual_parameters=[
+            oa.Parameter('cinema', oa.IN_QUERY, description="ID del cine", type=oa.TYPE_INTEGER),
+            oa.Parameter('date', oa.IN_QUERY, description="Primer día (YYYY-MM-DD)", type=oa.TYPE_STRING),
+            oa.Parameter('days', oa.IN_QUERY, description="Número de días (máx. 14)", type=oa.TYPE_INTEGER),
+        ]
+    )
+    def get(self, request):
+        params = request.query_params
+
+        start = timezone.localdate()
+        if params.get('date'):
+            start = parse_date(params['date'])
+            if start is None:
+                return Response({'error': _('Fecha inválida. Use el formato YYYY-MM-DD.')}, status=400)
+
+        try:
+            days = int(params.get('days', 7))
+        except ValueError:
+            return Response({'error': _('days debe ser un número entero')}, status=400)
+        if not 1 <= days <= MAX_DAYS:
+            return Response({'error': _('days debe estar entre 1 y %(max)d') % {'max': MAX_DAYS}}, status=400)
+
+        entries = NowPlaying.objects.filter(
+            day__gte=start, day__lt=start + timedelta(days=days)
+        )
+        if params.get('cinema'):
+            try:
+                entries = entries.filter(cinema_id=int(params['cinema']))
+            except ValueError:
+                return Response({'error': _('cinema debe ser un ID válido')}, status=400)
+
+        entries = entries.select_related('movie', 'cinema').order_by(
+            'cinema_id', 'day', 'first_show'
+        )
+
+        grouped = OrderedDict()
+        for entry in entries:
+            key = (entry.cinema_id, entry.day)
+            if key not in grouped:
+                grouped[key] = {
+                    'cinema': {'id': entry.cinema_id, 'name': entry.cinema.name},
+                    'day': entry.day,
+                    'movies': [],
+                }
+            grouped[key]['movies'].append(NowPlayingSerializer(entry).data)
+
+        return Response(list(grouped.values()), status=200)
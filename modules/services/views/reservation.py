@@ -1,7 +1,10 @@
+from django.db import transaction
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.exceptions import PermissionDenied, ValidationError
@@ -13,6 +16,7 @@ from modules.services.serializers.reservation import  (
     ReservationCreateSerializer,
     ReservationUpdateSerializer
 )
+from modules.services.history import history_entry, reservation_history
 
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi as oa
@@ -65,6 +69,13 @@ class ReservationViewSet(viewsets.ModelViewSet):
     def retrieve(self, request, *args, **kwargs):
         return super().retrieve(request, *args, **kwargs)
 
+    @swagger_auto_schema(operation_summary=_("Historial de mis reservas (incluye archivadas)"))
+    @action(detail=False, methods=['get'], url_path='history')
+    def history(self, request, *args, **kwargs):
+        paginator = PageNumberPagination()
+        page = paginator.paginate_queryset(reservation_history(request.user), request, view=self)
+        return paginator.get_paginated_response([history_entry(row) for row in page])
+
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         if serializer.is_valid(raise_exception=True):
@@ -100,14 +111,15 @@ class ReservationViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        # Liberar todos los asientos
-        for reservation in reservations:
-            seat = reservation.seat
-            seat.is_reserved = False
-            seat.save(update_fields=['is_reserved'])
-            reservation.delete()
+        # Liberar todos los asientos en una transacción: un único recálculo
+        with transaction.atomic():
+            for reservation in reservations:
+                seat = reservation.seat
+                seat.is_reserved = False
+                seat.save(update_fields=['is_reserved'])
+                reservation.delete()
 
-        group.delete()
+            group.delete()
 
         return Response(
             {"message": "Reserva cancelada exitosamente"},
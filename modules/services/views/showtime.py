@@ -1,6 +1,8 @@
+from django.core.cache import cache
 from django.utils.translation import gettext_lazy as _
 
 from rest_framework import viewsets, status
+from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.exceptions import PermissionDenied
@@ -10,9 +12,17 @@ from modules.services.serializers.showtime import (
     ShowtimeCreateSerializer,
     ShowtimeUpdateSerializer
 )
+from modules.services.filters.showtime import ShowtimeFilter
+from modules.common.pagination import KeysetPagination
+from modules.services.calendar import availability_calendar, calendar_cache_key
+from modules.services.history import showtime_occupancy
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi as oa
 from django.utils import timezone
+from datetime import datetime
+
+
+CALENDAR_CACHE_TIMEOUT = 60 * 15
 
 
 def get_user_fullname(user):
@@ -27,9 +37,15 @@ class ShowtimeViewSet(viewsets.ModelViewSet):
     """
     API endpoint that allows showtimes to be viewed or edited.
     """
-    queryset = Showtime.objects.filter( is_active = True)
+    queryset = Showtime.objects.select_related(
+        'movie', 'screening_room__cinema', 'occupancy'
+    )
     serializer_class = ShowtimeListSerializer
     permission_classes = [IsAuthenticated]
+    filterset_class = ShowtimeFilter
+    pagination_class = KeysetPagination
+    ordering = ('show_date', 'id')
+    ordering_fields = ['show_date', 'id']
     lookup_field = 'id'
 
     def get_serializer_class(self):
@@ -40,7 +56,7 @@ class ShowtimeViewSet(viewsets.ModelViewSet):
         return self.serializer_class
 
     def get_permissions(self):
-        if self.action in ['create', 'update', 'partial_update', 'destroy']:
+        if self.action in ['create', 'update', 'partial_update', 'destroy', 'occupancy']:
             self.permission_classes = [IsAdminUser]
         return super().get_permissions()
 
@@ -71,20 +87,11 @@ class ShowtimeViewSet(viewsets.ModelViewSet):
             raise PermissionDenied(_("Usuario no autenticado"))
 
     def perform_destroy(self, instance):
-        request = self.request
-        user = request.user
-
+        user = self.request.user
         if user.is_authenticated:
-            full_name = get_user_fullname(user)
-            instance.deleted_by = full_name
-            instance.deleted_date = timezone.now()
-            instance.is_active = False
-            instance.save()
+            instance.soft_delete(deleted_by=get_user_fullname(user))
         else:
-            instance.deleted_by = "Desconocido"
-            instance.deleted_date = timezone.now()
-            instance.is_active = False
-            instance.save()
+            instance.soft_delete(deleted_by="Desconocido")
 
     @swagger_auto_schema(operation_summary=_("List all showtimes"))
     def list(self, request, *args, **kwargs):
@@ -139,4 +146,58 @@ class ShowtimeViewSet(viewsets.ModelViewSet):
             return Response(
                 {"message": _("Error al eliminar la función"), "errors": str(e)},
                 status=status.HTTP_400_BAD_REQUEST
-            )
\ No newline at end of file
+            )
+
+    @swagger_auto_schema(
+        operation_summary=_("Monthly availability calendar"),
+        manual_parameters=[
+            oa.Parameter('month', oa.IN_QUERY, description="Mes (YYYY-MM)", type=oa.TYPE_STRING, required=True),
+            oa.Parameter('movie', oa.IN_QUERY, description="ID de la película", type=oa.TYPE_INTEGER),
+            oa.Parameter('cinema', oa.IN_QUERY, description="ID del cine", type=oa.TYPE_INTEGER),
+        ]
+    )
+    @action(detail=False, methods=['get'], url_path='calendar')
+    def calendar(self, request, *args, **kwargs):
+        params = request.query_params
+        try:
+            month = datetime.strptime(params.get('month', ''), '%Y-%m').date()
+        except ValueError:
+            return Response(
+                {"error": _("Mes inválido. Use el formato YYYY-MM.")},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            movie_id = int(params['movie']) if params.get('movie') else None
+            cinema_id = int(params['cinema']) if params.get('cinema') else None
+        except ValueError:
+            return Response(
+                {"error": _("movie y cinema deben ser IDs válidos.")},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if movie_id is None and cinema_id is None:
+            return Response(
+                {"error": _("Debe indicar movie o cinema.")},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        key = calendar_cache_key(month, movie_id, cinema_id)
+        days = cache.get(key)
+        if days is None:
+            days = availability_calendar(month, movie_id, cinema_id)
+            cache.set(key, days, CALENDAR_CACHE_TIMEOUT)
+
+        return Response(
+            {
+                "month": month.strftime('%Y-%m'),
+                "movie": movie_id,
+                "cinema": cinema_id,
+                "days": days,
+            },
+            status=status.HTTP_200_OK
+        )
+
+    @swagger_auto_schema(operation_summary=_("Showtime occupancy report"))
+    @action(detail=True, methods=['get'], url_path='occupancy')
+    def occupancy(self, request, *args, **kwargs):
+        return Response(showtime_occupancy(self.get_object()), status=status.HTTP_200_OK)
@@ -142,9 +142,10 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 AUTH_USER_MODEL = "manager.user"
 
+# EmailAdminAuthBackend hereda de ModelBackend (permisos); no se añade este
+# último para no calcular dos veces el hash cuando falla la contraseña.
 AUTHENTICATION_BACKENDS = [
     'common.backends.EmailAdminAuthBackend',  # Para login con email en el admin
-    'django.contrib.auth.backends.ModelBackend',  # El backend por defecto
 ]
 
 REST_FRAMEWORK = {
@@ -158,3 +159,90 @@ REST_FRAMEWORK = {
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,  # Número de resultados por página
 }
+
+# Caché en memoria local por defecto, sólo válida con un único proceso: en
+# producción usa CACHE_BACKEND=redis (o file) para compartir versiones,
+# respuestas, candados y contadores entre workers (check --deploy lo avisa).
+CACHE_BACKEND = os.environ.get("CACHE_BACKEND")
+if CACHE_BACKEND == "redis":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ.get("CACHE_LOCATION", "redis://127.0.0.1:6379/1"),
+        }
+    }
+elif CACHE_BACKEND == "file":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": os.environ.get("CACHE_LOCATION", os.path.join(BASE_DIR, ".cache")),
+            "OPTIONS": {"MAX_ENTRIES": 10000},
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "movie-reservation",
+            "OPTIONS": {"MAX_ENTRIES": 10000},
+        }
+    }
+
+RESPONSE_CACHE_TIMEOUT = 60 * 60  # Las versiones por modelo invalidan antes de expirar
+# Con caché local las invalidaciones de otro proceso no llegan: se acorta la vida
+RESPONSE_CACHE_LOCAL_TIMEOUT = 30
+RESPONSE_CACHE_STATS_INTERVAL = 10  # Segundos entre volcados de los contadores
+
+# Tamaño máximo de un catálogo subido por la API; los mayores, con import_catalog
+CATALOG_IMPORT_MAX_UPLOAD_SIZE = 5 * 1024 * 1024
+
+# Autenticación JWT sin consultas: caché de usuarios por proceso y plazo máximo
+# (segundos) en el que una revocación hecha en otro proceso se aplica en este.
+AUTH_PRINCIPAL_CACHE_SIZE = 10000
+AUTH_PRINCIPAL_CACHE_TTL = 300
+AUTH_SYNC_INTERVAL = 5
+# Cada cuánto se comparan los usuarios cacheados con la base de datos
+AUTH_PRINCIPAL_CHECK_INTERVAL = 30
+# Margen que se vuelve a leer en cada carga incremental de revocaciones
+AUTH_REVOCATION_OVERLAP = 60
+
+# Sesiones abiertas a la vez por usuario (una por dispositivo)
+AUTH_MAX_SESSIONS = 5
+
+# Correo: los mensajes se encolan en EmailOutbox y los envía el worker
+# `python manage.py send_outbox_emails --loop`, con reintentos exponenciales.
+EMAIL_BACKEND = os.environ.get(
+    "EMAIL_BACKEND", "django.core.mail.backends.console.EmailBackend")
+DEFAULT_FROM_EMAIL = os.environ.get("DEFAULT_FROM_EMAIL", "no-reply@movie-reservation.local")
+FRONTEND_URL = os.environ.get("FRONTEND_URL", "http://localhost:3000")
+EMAIL_OUTBOX_MAX_ATTEMPTS = 8
+EMAIL_OUTBOX_RETRY_DELAY = 30  # segundos; se dobla en cada intento
+EMAIL_OUTBOX_RETENTION = 30 * 24 * 60 * 60  # segundos que se guardan los enviados/fallidos
+
+# Login: espera exponencial por cuenta/IP antes de calcular el hash y pool
+# acotado de hashing (AUTH_HASHER_WORKERS=None usa un hilo por CPU).
+AUTH_LOGIN_ACCOUNT_THRESHOLD = 5
+AUTH_LOGIN_IP_THRESHOLD = 20
+AUTH_LOGIN_BACKOFF = 1  # segundos; se dobla en cada fallo por encima del umbral
+AUTH_LOGIN_MAX_BACKOFF = 15 * 60
+# IPs o redes (CIDR) de los proxies inversos: sólo si la conexión llega de uno
+# de ellos se usa X-Forwarded-For para el bloqueo por IP
+AUTH_TRUSTED_PROXIES = [
+    proxy.strip() for proxy in os.environ.get("AUTH_TRUSTED_PROXIES", "").split(",")
+    if proxy.strip()
+]
+AUTH_HASHER_WORKERS = None
+AUTH_HASHER_QUEUE_SIZE = 64
+
+# Firma de los JWT. HS256 usa SECRET_KEY. RS256/EdDSA (con `cryptography`, que
+# instala PyJWT[crypto]) leen claves PEM de KEYS_DIR: <kid>.pem privada,
+# <kid>.pub.pem sólo pública. Se firma con la clave del fichero KEYS_DIR/active
+# (o ACTIVE_KID si no existe) y se verifica con todas; las públicas se publican
+# en /api/auth/jwks.json. Para rotar sin reiniciar: generar la clave nueva
+# (generate_jwt_key), activarla pasado el max-age del JWKS (--activate <kid>) y
+# retirar la anterior cuando hayan caducado sus tokens (--retire <kid>).
+JWT_SIGNING = {
+    "ALGORITHM": os.environ.get("JWT_ALGORITHM", "HS256"),
+    "KEYS_DIR": os.environ.get("JWT_KEYS_DIR", os.path.join(BASE_DIR, "keys")),
+    "ACTIVE_KID": os.environ.get("JWT_ACTIVE_KID", ""),
+}